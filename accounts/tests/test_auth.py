@@ -56,6 +56,25 @@ class TestAuth(APITestCase):
         self.assertIn("access", response.data)
         self.assertIn("refresh", response.data)
 
+    def test_login_sets_access_cookie(self):
+        """Test that login also stores the access token in an HttpOnly cookie"""
+        data = {"username": "testuser", "password": "testpass123"}
+        response = self.client.post(self.url_login, data)
+
+        cookie = response.cookies["access_token"]
+        self.assertEqual(cookie.value, response.data["access"])
+        self.assertTrue(cookie["httponly"])
+        self.assertEqual(cookie["samesite"], "Lax")
+
+    def test_logout_page_clears_access_cookie(self):
+        """Test that the logout page expires the access token cookie"""
+        self.client.cookies["access_token"] = "token"
+        response = self.client.get("/logout/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.cookies["access_token"].value, "")
+        self.assertEqual(response.cookies["access_token"]["max-age"], 0)
+
     def test_login_invalid_credentials(self):
         """Test login with incorrect password"""
         data = {"username": "testuser", "password": "wrongpass"}
@@ -2,7 +2,9 @@
 import logging
 
 # Django imports
+from django.conf import settings
 from django.contrib.auth import authenticate
+from django.views.generic import TemplateView
 
 # External imports
 from rest_framework import permissions, status
@@ -10,9 +12,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 
 # App imports
+from todolist import metrics
 from .serializers import UserSerializer
 
 
@@ -20,6 +24,11 @@ from .serializers import UserSerializer
 logger = logging.getLogger(__name__)
 
 
+def access_cookie_name():
+    """Name of the cookie that lets server-rendered pages identify the user"""
+    return getattr(settings, "ACCESS_TOKEN_COOKIE_NAME", "access_token")
+
+
 class UserLoginView(APIView):
     """User login endpoint to obtain JWT token"""
 
@@ -39,11 +48,22 @@ class UserLoginView(APIView):
         if user:
             # Generate JWT token
             refresh = RefreshToken.for_user(user)
+            access = str(refresh.access_token)
             # Return token pair
-            return Response(
-                {"access": str(refresh.access_token), "refresh": str(refresh)}
+            response = Response({"access": access, "refresh": str(refresh)})
+            # HttpOnly copy of the access token for server-rendered pages and
+            # the event stream; it only authorizes those GETs, never the API
+            response.set_cookie(
+                access_cookie_name(),
+                access,
+                max_age=int(jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+                secure=request.is_secure(),
+                httponly=True,
+                samesite="Lax",
             )
+            return response
 
+        metrics.inc("todolist_login_failures_total")
         return Response(
             {
                 "error": "Invalid credentials",
@@ -154,3 +174,14 @@ class UserLogoutView(APIView):
                 {"error": "Server error during logout"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class LogoutPageView(TemplateView):
+    """Login page shown after logging out; drops the access token cookie"""
+
+    template_name = "login.html"
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        response.delete_cookie(access_cookie_name(), samesite="Lax")
+        return response
@@ -0,0 +1,16 @@
+# External imports
+import pytest
+
+# Django imports
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Start every test with an empty cache. SQLite reuses primary keys after a
+    test rolls back, so throttle counters would otherwise carry over to the
+    next test's users.
+    """
+    cache.clear()
+    yield
@@ -0,0 +1,11 @@
+from .production import *
+
+# Load testing settings: the production stack with every throttle rate far
+# above what the load generator sends, so its report measures the API rather
+# than the throttles. Never serve real users with these settings.
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {
+        scope: "1000000/minute" for scope in REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+    },
+}
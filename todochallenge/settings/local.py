@@ -55,11 +55,14 @@ INSTALLED_APPS = [
 SHELL_PLUS = "ipython"
 
 MIDDLEWARE = [
+    "todolist.middleware.HealthCheckMiddleware",  # Probes skip everything else
+    "todolist.middleware.MetricsMiddleware",  # Early, to time the whole stack
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "todolist.middleware.TaskActivityMiddleware",  # One INSERT of task history
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -70,8 +73,18 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
-        "APP_DIRS": True,
+        "APP_DIRS": False,
         "OPTIONS": {
+            # Compiled templates are kept in memory, also when DEBUG is on
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                )
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -92,8 +105,18 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+    },
+    # Task data shards, used once listed in TODOLIST_SHARDS
+    "shard_1": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_shard_1.sqlite3",
+    },
+    "shard_2": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_shard_2.sqlite3",
+    },
 }
+DATABASE_ROUTERS = ["todolist.sharding.ShardRouter"]
 
 
 # Password validation
@@ -132,6 +155,8 @@ USE_TZ = True
 
 STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
+# collectstatic output, served by nginx in production
+STATIC_ROOT = BASE_DIR.parent / "static"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -152,7 +177,11 @@ REST_FRAMEWORK = {
         "rest_framework.throttling.AnonRateThrottle",
         "rest_framework.throttling.UserRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/minute", "user": "100/minute"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "10/minute",
+        "user": "100/minute",
+        "suggest": "600/minute",  # Typeahead, one request per keystroke
+    },
 }
 
 # Logging configuration
@@ -177,3 +206,70 @@ LOGGING = {
 # Security settings
 CSRF_COOKIE_HTTPONLY = True
 SESSION_COOKIE_HTTPONLY = True
+
+# Task reminders
+TODOLIST_NOTIFICATION_BACKEND = "todolist.notifications.LoggingNotificationBackend"
+REMINDER_INTERVAL_SECONDS = 60
+REMINDER_BATCH_SIZE = 500
+REMINDER_DAYS_AHEAD = 1
+REMINDER_LOOKBACK_DAYS = 7
+
+# Manual task ordering: renumber a user's tasks once a key exceeds this length
+TASK_POSITION_REBALANCE_LENGTH = 32
+
+# Category deletion: tasks detached per UPDATE by the background purge
+CATEGORY_PURGE_BATCH_SIZE = 1000
+
+# Task change events (server-sent events, served under ASGI)
+TODOLIST_EVENT_BROKER = "todolist.events.LocalEventBroker"
+TASK_EVENTS_HEARTBEAT_SECONDS = 15
+TASK_EVENTS_QUEUE_SIZE = 100
+TASK_EVENTS_MAX_SECONDS = 300
+
+# Batch endpoint: sub-requests per batch and threads for parallel reads
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+# Server-rendered pages: HttpOnly cookie holding the access token set at login
+ACCESS_TOKEN_COOKIE_NAME = "access_token"
+
+# Idempotency-Key header: seconds a key and its stored response are kept, and
+# seconds a request still running holds its key (keep above the request timeout)
+IDEMPOTENCY_KEY_TTL_SECONDS = 24 * 60 * 60
+IDEMPOTENCY_KEY_LEASE_SECONDS = 60
+
+# Per-user cached results (e.g. task facets), retired on every write of the user
+TODOLIST_USER_CACHE_SECONDS = 300
+
+# Task suggestions (typeahead): result cache lifetime, the most results per
+# kind a client may ask for, and the latency above which a request is logged
+TASK_SUGGEST_CACHE_SECONDS = 30
+TASK_SUGGEST_MAX_LIMIT = 20
+TASK_SUGGEST_BUDGET_MS = 20
+
+# Task history: entries written per INSERT when a request's activity is flushed,
+# days kept by prune_task_activity, and rows it deletes per DELETE
+TASK_ACTIVITY_BATCH_SIZE = 500
+TASK_ACTIVITY_RETENTION_DAYS = 365
+TASK_ACTIVITY_PRUNE_BATCH_SIZE = 1000
+
+# Sharding: DATABASES aliases holding task data, each user's data on one of them.
+# Just "default" turns sharding off; e.g. ["shard_1", "shard_2"] turns it on
+TODOLIST_SHARDS = ["default"]
+
+# Request profiling (staff only, X-Profile header or ?profile=1): where the stats
+# are written, and how many and how old profiles may get before they are deleted
+TODOLIST_PROFILE_DIR = BASE_DIR / "profiles"
+TODOLIST_PROFILE_MAX_FILES = 200
+TODOLIST_PROFILE_MAX_AGE_DAYS = 7
+
+# Metrics (/metrics): bearer token of the Prometheus scraper (staff sessions may
+# read them too), the directory every worker writes its values to, and how often
+TODOLIST_METRICS_TOKEN = env("TODOLIST_METRICS_TOKEN", default="")
+TODOLIST_METRICS_DIR = env("TODOLIST_METRICS_DIR", default="/tmp/todolist-metrics")
+TODOLIST_METRICS_FLUSH_SECONDS = 1
+
+# Probes: /healthz does no I/O; /readyz checks the databases, their migrations
+# and the cache, each within the timeout, and reuses its result for a few seconds
+TODOLIST_READYZ_TIMEOUT_SECONDS = 2
+TODOLIST_READYZ_CACHE_SECONDS = 5
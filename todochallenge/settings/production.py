@@ -11,3 +11,23 @@ DATABASES = {
         "PORT": "5432",
     }
 }
+
+DEBUG = env.bool("DEBUG", default=False)
+
+# One cache for every worker: a per-process LocMemCache keeps serving results
+# (facets, suggestions) that a write handled by another worker retired.
+# Create the table with "python manage.py createcachetable".
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "todolist_cache",
+    }
+}
+
+# Fingerprinted static files with precompressed siblings, built by collectstatic
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "todolist.storage.CompressedManifestStaticFilesStorage"
+    },
+}
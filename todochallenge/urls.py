@@ -9,9 +9,21 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
+# App imports
+from accounts.views import LogoutPageView
+from todolist.profiling import profile_report
+from todolist.views import TaskListPageView, metrics
+
 urlpatterns = [
     # Django Admin
+    path(
+        "admin/profiles/",
+        admin.site.admin_view(profile_report),
+        name="admin-profiles",
+    ),
     path("admin/", admin.site.urls),
+    # Prometheus metrics
+    path("metrics", metrics, name="metrics"),
     # API URLs
     path("api/", include("todolist.urls")),
     # JWT Auth URLs
@@ -26,14 +38,8 @@ urlpatterns += [
         name="register-page",
     ),
     path("login/", TemplateView.as_view(template_name="login.html"), name="login-page"),
-    path(
-        "logout/", TemplateView.as_view(template_name="login.html"), name="logout-page"
-    ),
-    path(
-        "tasks/",
-        TemplateView.as_view(template_name="tasks/list.html"),
-        name="task-list",
-    ),
+    path("logout/", LogoutPageView.as_view(), name="logout-page"),
+    path("tasks/", TaskListPageView.as_view(), name="task-list-page"),
     path(
         "tasks/create/",
         TemplateView.as_view(template_name="tasks/create.html"),
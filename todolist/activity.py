@@ -0,0 +1,195 @@
+# Standard imports
+import logging
+from contextlib import contextmanager
+
+# Django imports
+from asgiref.local import Local
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+# App imports
+from .sharding import current_db
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Fields whose changes are kept in a task's history
+TRACKED_FIELDS = [
+    "title",
+    "description",
+    "completed",
+    "due_date",
+    "priority",
+    "category",
+    "parent",
+]
+
+# Activity waiting to be written at the end of the current request
+_buffer = Local()
+
+
+def record(task_id, user_id, action, changes):
+    """
+    Queue one activity entry once the current transaction commits, so
+    rolled-back changes leave no history. Inside ``buffered_activity`` the
+    entry is held until the block ends; elsewhere it is written right away.
+    """
+    # Imported here: the models module imports this one
+    from .models import TaskActivity
+
+    entry = TaskActivity(
+        task_id=task_id,
+        user_id=user_id,
+        action=action,
+        changes=changes,
+        timestamp=timezone.now(),
+    )
+    alias = current_db()
+
+    def enqueue():
+        entries = getattr(_buffer, "entries", None)
+        if entries is None:
+            TaskActivity.objects.using(alias).bulk_create([entry])
+        else:
+            entries.append((alias, entry))
+
+    transaction.on_commit(enqueue, using=alias)
+
+
+def open_buffer():
+    """
+    Start holding recorded activity; False when a buffer is open already
+    (nested blocks share the outermost one).
+    """
+    if getattr(_buffer, "entries", None) is not None:
+        return False
+    _buffer.entries = []
+    return True
+
+
+def close_buffer():
+    """Stop holding activity and return the entries held so far"""
+    entries = _buffer.entries
+    del _buffer.entries
+    return entries
+
+
+@contextmanager
+def buffered_activity(actor=None):
+    """
+    Collect the activity recorded inside the block and write it with one
+    ``bulk_create`` when the block ends. Entries get ``actor`` (a user, or
+    a callable returning one, read at the end) as the user who made them.
+    """
+    if not open_buffer():
+        yield
+        return
+    try:
+        yield
+    finally:
+        entries = close_buffer()
+        if entries:
+            flush(entries, actor() if callable(actor) else actor)
+
+
+def flush(entries, actor=None):
+    """
+    Write buffered ``(alias, entry)`` pairs, one INSERT per shard. The
+    changes they describe are committed already, so a failed write is
+    logged instead of failing the request.
+    """
+    from .models import TaskActivity
+
+    actor_id = actor.id if actor is not None and actor.is_authenticated else None
+    by_alias = {}
+    for alias, entry in entries:
+        entry.actor_id = actor_id
+        by_alias.setdefault(alias, []).append(entry)
+    batch_size = getattr(settings, "TASK_ACTIVITY_BATCH_SIZE", 500)
+    for alias, shard_entries in by_alias.items():
+        try:
+            TaskActivity.objects.using(alias).bulk_create(
+                shard_entries, batch_size=batch_size
+            )
+        except Exception:
+            logger.exception(f"TASK ACTIVITY LOST: {len(shard_entries)} entries")
+
+
+def field_value(task, field_name, loaded=None):
+    """A tracked field's value, as stored in the history"""
+    attname = task._meta.get_field(field_name).attname
+    if loaded is not None:
+        return loaded.get(attname)
+    return getattr(task, attname)
+
+
+def record_saved(sender, instance, created, raw=False, **kwargs):
+    """Record the tracked fields set on a new task or changed on an update"""
+    if raw:
+        return
+    if created:
+        changes = {
+            name: [None, field_value(instance, name)]
+            for name in TRACKED_FIELDS
+            if field_value(instance, name) not in (None, "", False)
+        }
+        action = "created"
+    else:
+        loaded = getattr(instance, "_loaded_values", {})
+        changes = {
+            name: [field_value(instance, name, loaded), field_value(instance, name)]
+            for name in TRACKED_FIELDS
+            if instance.has_changed(instance._meta.get_field(name).attname)
+        }
+        if not changes:
+            return
+        action = "toggled" if set(changes) == {"completed"} else "updated"
+    record(instance.pk, instance.user_id, action, changes)
+
+
+def record_deleted(sender, instance, **kwargs):
+    """Record a deletion, keeping the title of the task that went away"""
+    record(instance.pk, instance.user_id, "deleted", {"title": [instance.title, None]})
+
+
+def record_toggled(task_id, user_id, completed):
+    """Record a toggle written with a plain UPDATE, which sends no signals"""
+    record(task_id, user_id, "toggled", {"completed": [not completed, completed]})
+
+
+def bulk_changed(queryset, field_name, value):
+    """
+    Record the change of ``field_name`` to ``value`` (a column value, e.g.
+    a category id) for every task of ``queryset`` that it alters. Call in
+    the transaction of the bulk UPDATE, before it runs: it sends no signals.
+    """
+    action = "toggled" if field_name == "completed" else "updated"
+    attname = queryset.model._meta.get_field(field_name).attname
+    rows = (
+        queryset.exclude(**{attname: value})
+        .order_by()
+        .values_list("pk", "user_id", attname)
+    )
+    for task_id, user_id, old in rows.iterator():
+        record(task_id, user_id, action, {field_name: [old, value]})
+
+
+def prune_activity(before, batch_size=1000):
+    """
+    Delete the activity recorded before ``before``, oldest first, one short
+    DELETE per batch of ``batch_size`` rows. Returns the number deleted.
+    """
+    from .models import TaskActivity
+
+    expired = TaskActivity.objects.filter(timestamp__lt=before).order_by("timestamp")
+    deleted = 0
+    while True:
+        pks = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+        # Nothing refers to activity rows, so this is a single fast DELETE
+        deleted += TaskActivity.objects.filter(pk__in=pks).delete()[0]
+    logger.info(f"TASK ACTIVITY PRUNED: Before={before.isoformat()} | Rows={deleted}")
+    return deleted
@@ -1,8 +1,32 @@
 # Django imports
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db import transaction
+from django.utils import timezone
 
 # App imports
-from .models import Task
+from .activity import bulk_changed
+from .caching import bump_data_version
+from .events import task_toggled, task_updated
+from .models import Task, TaskCategory, PRIORITY_CHOICES, recount_ancestors
+
+
+# Number of rows removed per DELETE statement by the chunked delete action
+DELETE_CHUNK_SIZE = 500
+
+
+class TaskActionForm(ActionForm):
+    """
+    Action form with the extra inputs needed by the bulk task actions.
+    """
+
+    priority = forms.ChoiceField(
+        choices=[("", "---------")] + PRIORITY_CHOICES, required=False
+    )
+    category = forms.ModelChoiceField(
+        queryset=TaskCategory.objects.filter(deleted_at__isnull=True), required=False
+    )
 
 
 @admin.register(Task)
@@ -11,13 +35,51 @@ class TaskAdmin(admin.ModelAdmin):
     Admin configuration for Task model.
     """
 
-    list_display = ["id", "title", "description", "completed", "created_at", "user"]
-    list_filter = ["completed", "created_at"]
+    list_display = [
+        "id",
+        "title",
+        "description",
+        "completed",
+        "priority",
+        "category",
+        "created_at",
+        "user",
+    ]
+    list_filter = ["completed", "priority", "created_at"]
+    list_select_related = ["user", "category"]
     search_fields = ["title", "description"]
     list_per_page = 10
     list_display_links = ["id", "title"]
-    list_editable = ["completed"]
     readonly_fields = ["created_at"]
+    action_form = TaskActionForm
+    actions = [
+        "mark_completed",
+        "mark_pending",
+        "set_priority",
+        "set_category",
+        "delete_in_chunks",
+    ]
+
+    @staticmethod
+    def subtask_paths(queryset):
+        """Paths of the selected subtasks, whose ancestors' counters need a recount"""
+        return list(
+            queryset.filter(parent__isnull=False)
+            .order_by()
+            .values_list("path", flat=True)
+        )
+
+    @staticmethod
+    def task_rows(queryset):
+        """(task id, owner id) of the selected tasks, to announce their changes"""
+        return list(queryset.order_by().values_list("pk", "user_id"))
+
+    @staticmethod
+    def retire_cached_results(queryset):
+        """Bulk UPDATEs send no signals, so bump the owners' data versions"""
+        bump_data_version(
+            *queryset.order_by().values_list("user_id", flat=True).distinct()
+        )
 
     def get_readonly_fields(self, request, obj=None):
         """
@@ -44,6 +106,16 @@ class TaskAdmin(admin.ModelAdmin):
             return qs
         return qs.filter(user=request.user)
 
+    def delete_queryset(self, request, queryset):
+        """
+        Delete the selection of the stock delete action, then recount the
+        subtasks of the ancestors it leaves behind.
+        """
+        with transaction.atomic():
+            paths = self.subtask_paths(queryset)
+            super().delete_queryset(request, queryset)
+            recount_ancestors(paths, using=queryset.db)
+
     def has_change_permission(self, request, obj=None):
         """
         Check if user has permission to change object.
@@ -59,3 +131,121 @@ class TaskAdmin(admin.ModelAdmin):
         if obj and not obj.user == request.user:
             return False
         return super().has_delete_permission(request, obj)
+
+    @admin.action(
+        description="Mark selected tasks as completed", permissions=["change"]
+    )
+    def mark_completed(self, request, queryset):
+        """
+        Complete the selected pending tasks with a single UPDATE.
+        """
+        self.retire_cached_results(queryset)
+        now = timezone.now()
+        with transaction.atomic():
+            changed = queryset.filter(completed=False)
+            paths, rows = self.subtask_paths(changed), self.task_rows(changed)
+            bulk_changed(queryset, "completed", True)
+            updated = changed.update(completed=True, completed_at=now)
+            recount_ancestors(paths, using=queryset.db)
+            for task_id, user_id in rows:
+                task_toggled(user_id, task_id, True, now)
+        self.message_user(request, f"{updated} task(s) marked as completed.")
+
+    @admin.action(description="Mark selected tasks as pending", permissions=["change"])
+    def mark_pending(self, request, queryset):
+        """
+        Reopen the selected completed tasks with a single UPDATE.
+        """
+        self.retire_cached_results(queryset)
+        with transaction.atomic():
+            changed = queryset.filter(completed=True)
+            paths, rows = self.subtask_paths(changed), self.task_rows(changed)
+            bulk_changed(queryset, "completed", False)
+            updated = changed.update(completed=False, completed_at=None)
+            recount_ancestors(paths, using=queryset.db)
+            for task_id, user_id in rows:
+                task_toggled(user_id, task_id, False, None)
+        self.message_user(request, f"{updated} task(s) marked as pending.")
+
+    @admin.action(description="Set priority of selected tasks", permissions=["change"])
+    def set_priority(self, request, queryset):
+        """
+        Set the priority chosen in the action form with a single UPDATE.
+        """
+        priority = request.POST.get("priority")
+        if priority not in dict(PRIORITY_CHOICES):
+            self.message_user(
+                request, "Choose a priority to apply.", level=messages.ERROR
+            )
+            return
+        self.retire_cached_results(queryset)
+        with transaction.atomic():
+            bulk_changed(queryset, "priority", priority)
+            updated = queryset.update(priority=priority)
+            for task_id, user_id in self.task_rows(queryset):
+                task_updated(user_id, task_id, {"priority": priority})
+        self.message_user(request, f"{updated} task(s) set to {priority} priority.")
+
+    @admin.action(description="Set category of selected tasks", permissions=["change"])
+    def set_category(self, request, queryset):
+        """
+        Reassign the selected tasks to the category chosen in the action form
+        (or clear it when none is chosen) with a single UPDATE. Tasks may only
+        be moved to a live category of their own owner.
+        """
+        form = self.action_form(request.POST)
+        form.fields["action"].choices = self.get_action_choices(request)
+        if not form.is_valid():
+            self.message_user(request, "Choose a valid category.", level=messages.ERROR)
+            return
+        category = form.cleaned_data["category"]
+        if category and queryset.exclude(user_id=category.user_id).exists():
+            self.message_user(
+                request,
+                f"{category.name} belongs to another user than some of the selected "
+                "tasks; nothing was changed.",
+                level=messages.ERROR,
+            )
+            return
+        self.retire_cached_results(queryset)
+        with transaction.atomic():
+            # Lock the category so it cannot be deleted while tasks move in
+            if category and not (
+                TaskCategory.objects.select_for_update()
+                .filter(pk=category.pk, deleted_at__isnull=True)
+                .exists()
+            ):
+                self.message_user(
+                    request, "Choose a valid category.", level=messages.ERROR
+                )
+                return
+            bulk_changed(queryset, "category", category and category.pk)
+            updated = queryset.update(category=category)
+            changes = {"category": category and category.name}
+            for task_id, user_id in self.task_rows(queryset):
+                task_updated(user_id, task_id, changes)
+        self.message_user(
+            request,
+            f"{updated} task(s) moved to {category.name if category else 'no category'}.",
+        )
+
+    @admin.action(description="Delete selected tasks in chunks", permissions=["delete"])
+    def delete_in_chunks(self, request, queryset):
+        """
+        Delete the selected tasks with one DELETE per chunk of primary keys,
+        so large selections never hold locks on every row at once. Only
+        tasks are counted, not the tags, reminders and history they take
+        along.
+        """
+        pks = list(queryset.order_by().values_list("pk", flat=True))
+        manager = queryset.model.objects.db_manager(queryset.db)
+        deleted = 0
+        for start in range(0, len(pks), DELETE_CHUNK_SIZE):
+            end = start + DELETE_CHUNK_SIZE
+            tasks = manager.filter(pk__in=pks[start:end])
+            with transaction.atomic(using=queryset.db):
+                paths = self.subtask_paths(tasks)
+                counts = tasks.delete()[1]
+                deleted += counts.get(queryset.model._meta.label, 0)
+                recount_ancestors(paths, using=queryset.db)
+        self.message_user(request, f"{deleted} task(s) deleted.")
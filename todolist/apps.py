@@ -4,3 +4,65 @@ from django.apps import AppConfig
 class TodolistConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "todolist"
+
+    def ready(self):
+        # Django imports
+        from django.contrib.auth.models import User
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import (
+            m2m_changed,
+            post_delete,
+            post_migrate,
+            post_save,
+            pre_delete,
+        )
+
+        # App imports
+        from .activity import record_deleted, record_saved
+        from .caching import data_changed
+        from .metrics import install_query_wrapper
+        from .events import task_deleted, task_saved
+        from .models import Task, TaskCategory
+        from .sharding import purge_user_data, reserve_id_block
+        from .suggest import install_unicode_lower
+
+        post_save.connect(task_saved, sender=Task, dispatch_uid="task_saved_event")
+        post_delete.connect(
+            task_deleted, sender=Task, dispatch_uid="task_deleted_event"
+        )
+
+        # Task history
+        post_save.connect(record_saved, sender=Task, dispatch_uid="task_saved_activity")
+        post_delete.connect(
+            record_deleted, sender=Task, dispatch_uid="task_deleted_activity"
+        )
+
+        # Cached per-user results are retired whenever the user's data changes
+        for model, name in ((Task, "task"), (TaskCategory, "category")):
+            post_save.connect(
+                data_changed, sender=model, dispatch_uid=f"{name}_saved_data"
+            )
+            post_delete.connect(
+                data_changed, sender=model, dispatch_uid=f"{name}_deleted_data"
+            )
+        m2m_changed.connect(
+            data_changed, sender=Task.tags.through, dispatch_uid="task_tags_data"
+        )
+
+        # Sharding: per-database id blocks, and user data outside "default"
+        post_migrate.connect(
+            reserve_id_block, sender=self, dispatch_uid="todolist_id_block"
+        )
+        pre_delete.connect(
+            purge_user_data, sender=User, dispatch_uid="user_shard_purge"
+        )
+
+        # Query counts and time for /metrics
+        connection_created.connect(
+            install_query_wrapper, dispatch_uid="todolist_query_metrics"
+        )
+
+        # Suggestions: lowercase non-ASCII titles on SQLite too
+        connection_created.connect(
+            install_unicode_lower, dispatch_uid="todolist_unicode_lower"
+        )
@@ -0,0 +1,43 @@
+# Standard imports
+import contextvars
+import logging
+import threading
+
+# Django imports
+from django.db import connections, transaction
+
+# App imports
+from .sharding import current_db
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+
+def run_job(func, args, kwargs):
+    """Run a background job, logging failures and releasing its connections"""
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception(f"BACKGROUND JOB FAILED: {func.__name__}")
+    finally:
+        connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Run ``func`` in a daemon thread once the current transaction commits,
+    so the job sees the data that scheduled it. The thread inherits the
+    caller's context, so it uses the same shard. Jobs must be idempotent:
+    a restart loses queued work, and the matching management command is the
+    way to catch up.
+    """
+
+    context = contextvars.copy_context()
+
+    def start():
+        threading.Thread(
+            target=context.run, args=(run_job, func, args, kwargs), daemon=True
+        ).start()
+
+    transaction.on_commit(start, using=current_db())
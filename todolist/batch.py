@@ -0,0 +1,115 @@
+# Standard imports
+import asyncio
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Django imports
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Methods that may run in parallel because they do not write
+READ_METHODS = {"GET", "HEAD"}
+# Headers that describe the batch itself and must not reach its sub-requests
+BATCH_ONLY_HEADERS = {"HTTP_IDEMPOTENCY_KEY"}
+
+
+def build_subrequest(request, method, path, body=None):
+    """
+    A request for ``path`` that inherits the batch request's headers and
+    its already authenticated user, so the sub-request skips JWT decoding.
+    ``request`` may also be a plain Django request (e.g. a page view).
+    """
+    parts = urlsplit(path)
+    payload = json.dumps(body).encode() if body is not None else b""
+    environ = {
+        key: value
+        for key, value in request.META.items()
+        if (key.startswith("HTTP_") and key not in BATCH_ONLY_HEADERS)
+        or key in ("REMOTE_ADDR", "SERVER_NAME")
+    }
+    environ.update(
+        {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": parts.path,
+            "QUERY_STRING": parts.query,
+            "SERVER_PORT": request.META.get("SERVER_PORT", "80"),
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(payload)),
+            "wsgi.input": io.BytesIO(payload),
+            "wsgi.url_scheme": request.scheme,
+        }
+    )
+    subrequest = WSGIRequest(environ)
+    subrequest._force_auth_user = request.user
+    subrequest._force_auth_token = getattr(request, "auth", None)
+    return subrequest
+
+
+def response_body(response):
+    """The payload of a view's response, without a render/parse round trip"""
+    if hasattr(response, "data"):
+        return response.data
+    if not response.content:
+        return None
+    if response.get("Content-Type", "").startswith("application/json"):
+        return json.loads(response.content)
+    return response.content.decode(response.charset)
+
+
+def run_subrequest(request, method, path, body=None):
+    """
+    Resolve and call the view for one sub-request, returning its status
+    and body. Only ordinary synchronous API views can be batched. A view
+    that raises fails its own sub-request with a 500, so the results of
+    the others (writes included) still reach the client.
+    """
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return {"status": 404, "body": {"detail": "Not found."}}
+    # DRF sets ``cls`` on the views built by APIView and ViewSet.as_view()
+    view_class = getattr(match.func, "cls", None)
+    if (
+        asyncio.iscoroutinefunction(match.func)
+        or getattr(view_class, "batchable", True) is False
+    ):
+        return {"status": 400, "body": {"detail": "This endpoint cannot be batched."}}
+
+    subrequest = build_subrequest(request, method, path, body)
+    try:
+        response = match.func(subrequest, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception(f"BATCH SUBREQUEST FAILED: {method} {path}")
+        return {"status": 500, "body": {"detail": "Server error."}}
+    if response.streaming:
+        return {"status": 400, "body": {"detail": "This endpoint cannot be batched."}}
+    logger.debug(f"BATCH SUBREQUEST: {method} {path} | Status={response.status_code}")
+    return {"status": response.status_code, "body": response_body(response)}
+
+
+def run_in_worker(request, item):
+    """Run a sub-request on a pool thread, releasing its connections"""
+    try:
+        return run_subrequest(request, **item)
+    finally:
+        connections.close_all()
+
+
+def run_batch(request, items, parallel=False, max_workers=4):
+    """
+    Run sub-requests in order and return their results in the same order.
+    A batch made only of reads may run on a thread pool when ``parallel``
+    is set; any write makes the whole batch sequential.
+    """
+    if parallel and all(item["method"] in READ_METHODS for item in items):
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+            return list(pool.map(lambda item: run_in_worker(request, item), items))
+    return [run_subrequest(request, **item) for item in items]
@@ -0,0 +1,82 @@
+# Standard imports
+import hashlib
+import logging
+import time
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# App imports
+from . import metrics
+from .sharding import current_db
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+
+def version_key(user_id):
+    return f"todolist:data-version:{user_id}"
+
+
+def data_version(user_id):
+    """
+    Current version of a user's task data. Cached results include it in
+    their key, so bumping the version retires all of them at once. A
+    version lost to eviction restarts from the clock, never from a value
+    that old entries may still be stored under.
+    """
+    key = version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns())
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(*user_ids):
+    """
+    Retire the cached results of the given users once the current
+    transaction commits; bumping earlier would let a concurrent read cache
+    the old data under the new version.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+
+    def bump():
+        for user_id in user_ids:
+            try:
+                cache.incr(version_key(user_id))
+            except ValueError:
+                # Never read since it was evicted; the next read starts afresh
+                pass
+
+    transaction.on_commit(bump, using=current_db())
+
+
+def cached_for_user(user_id, name, params, compute, timeout=None):
+    """
+    ``compute()`` cached per user, data version and request parameters.
+    Entries also expire after ``timeout`` seconds (TODOLIST_USER_CACHE_SECONDS
+    by default) as a backstop.
+    """
+    digest = hashlib.sha256(repr(sorted(params.items())).encode()).hexdigest()[:16]
+    key = f"todolist:{name}:{user_id}:{data_version(user_id)}:{digest}"
+    result = cache.get(key)
+    if result is not None:
+        metrics.inc("todolist_cache_hits_total", (("cache", name),))
+    else:
+        metrics.inc("todolist_cache_misses_total", (("cache", name),))
+        result = compute()
+        if timeout is None:
+            timeout = getattr(settings, "TODOLIST_USER_CACHE_SECONDS", 300)
+        cache.set(key, result, timeout)
+        logger.debug(f"USER CACHE MISS: {name} | User={user_id}")
+    return result
+
+
+def data_changed(sender, instance, action="post", **kwargs):
+    """Signal receiver for saved and deleted tasks and categories, and tag sets"""
+    if action.startswith("post"):
+        bump_data_version(instance.user_id)
@@ -0,0 +1,294 @@
+# Standard imports
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+# Django imports
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+# External imports
+from rest_framework.utils.encoders import JSONEncoder
+
+# App imports
+from .sharding import current_db
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Fields whose change alone makes an update a "toggled" event
+TOGGLE_FIELDS = {"completed", "completed_at"}
+# Task fields carried by "created" events, and by "updated" events when they
+# change: what the task list renders, plus what the next write needs
+EVENT_FIELDS = [
+    "title",
+    "description",
+    "category",
+    "priority",
+    "due_date",
+    "completed",
+    "created_at",
+    "completed_at",
+    "position",
+    "version",
+]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class BaseEventBroker:
+    """
+    Base class for event brokers. ``publish`` is called from ordinary
+    (synchronous) request threads; ``subscribe`` is called from inside the
+    event loop that serves the stream.
+    """
+
+    def publish(self, user_id, event):
+        raise NotImplementedError(
+            "subclasses of BaseEventBroker must implement publish()"
+        )
+
+    def subscribe(self, user_id):
+        raise NotImplementedError(
+            "subclasses of BaseEventBroker must implement subscribe()"
+        )
+
+    def unsubscribe(self, subscription):
+        pass
+
+    def has_subscribers(self, user_id):
+        """Lets publishers skip building events nobody will receive"""
+        return True
+
+
+class Subscription:
+    """
+    One open stream. Events are queued on the stream's own event loop; when
+    a slow reader lets the queue fill up, the backlog is replaced by a single
+    ``resync`` event telling the client to fetch the list again.
+    """
+
+    def __init__(self, user_id, maxsize):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def push(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+
+    async def get(self, timeout):
+        """Next event, or None when nothing arrived within ``timeout`` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalEventBroker(BaseEventBroker):
+    """
+    Fan events out to the streams opened in this process. Only works with a
+    single worker process: a stream never hears of writes handled by another
+    worker, so deploy one ASGI worker or swap in a broker backed by shared
+    infrastructure.
+    """
+
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or getattr(settings, "TASK_EVENTS_QUEUE_SIZE", 100)
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id, self.queue_size)
+        with self.lock:
+            self.subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.user_id, None)
+
+    def has_subscribers(self, user_id):
+        return bool(self.subscriptions.get(user_id))
+
+    def publish(self, user_id, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # The stream's loop is gone; its cleanup never ran
+                self.unsubscribe(subscription)
+        return len(subscriptions)
+
+
+_broker = None
+
+
+def get_event_broker():
+    """
+    The process-wide broker named by the TODOLIST_EVENT_BROKER setting.
+    Overriding the setting in a test swaps the broker.
+    """
+    global _broker
+    if _broker is None:
+        path = getattr(
+            settings, "TODOLIST_EVENT_BROKER", "todolist.events.LocalEventBroker"
+        )
+        _broker = import_string(path)()
+    return _broker
+
+
+@receiver(setting_changed)
+def reset_event_broker(setting, **kwargs):
+    global _broker
+    if setting in ("TODOLIST_EVENT_BROKER", "TASK_EVENTS_QUEUE_SIZE"):
+        _broker = None
+
+
+async def stream_events(
+    broker, subscription, heartbeat=15, retry_ms=3000, max_duration=300
+):
+    """
+    Serialize a subscription as a text/event-stream body. A comment line is
+    sent after ``heartbeat`` idle seconds so proxies keep the connection
+    open. Django 4.2 does not notice clients that go away mid-stream, so the
+    stream ends after ``max_duration`` seconds and EventSource reconnects.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_duration
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            event = await subscription.get(min(heartbeat, remaining))
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps(event, cls=JSONEncoder)
+            yield f"event: {event['type']}\ndata: {data}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def publish_after_commit(user_id, build_event):
+    """
+    Publish the event returned by ``build_event`` once the current
+    transaction commits, so streams never announce a rolled-back write.
+    """
+    broker = get_event_broker()
+
+    def publish():
+        if not broker.has_subscribers(user_id):
+            return
+        event = build_event()
+        broker.publish(user_id, event)
+        logger.debug(
+            f"TASK EVENT: User={user_id} | Type={event['type']} | ID={event['id']}"
+        )
+
+    transaction.on_commit(publish, using=current_db())
+
+
+def event_value(task, name):
+    """A field of ``task`` as the API shows it"""
+    if name == "category":
+        category = task.category
+        return category.name if category and not category.is_deleted else None
+    value = getattr(task, name)
+    if name in ("created_at", "completed_at"):
+        return value and value.strftime(TIMESTAMP_FORMAT)
+    return value
+
+
+def task_saved(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Announce created tasks with the EVENT_FIELDS, and updated tasks with
+    those of the EVENT_FIELDS that changed
+    """
+    task_id = instance.id
+    if created:
+        publish_after_commit(
+            instance.user_id,
+            lambda: {
+                "type": "created",
+                "id": task_id,
+                "task": {
+                    "id": task_id,
+                    **{name: event_value(instance, name) for name in EVENT_FIELDS},
+                },
+            },
+        )
+        return
+    if update_fields and set(update_fields) <= TOGGLE_FIELDS:
+        publish_after_commit(
+            instance.user_id,
+            lambda: toggled_event(task_id, instance.completed, instance.completed_at),
+        )
+        return
+    changed = [
+        name
+        for name in EVENT_FIELDS
+        if instance.has_changed(instance._meta.get_field(name).attname)
+    ]
+    if changed:
+        task_updated(
+            instance.user_id,
+            task_id,
+            lambda: {name: event_value(instance, name) for name in changed},
+        )
+
+
+def toggled_event(task_id, completed, completed_at):
+    """Compact event for a completion change"""
+    return {
+        "type": "toggled",
+        "id": task_id,
+        "completed": completed,
+        "completed_at": completed_at and completed_at.strftime(TIMESTAMP_FORMAT),
+    }
+
+
+def task_toggled(user_id, task_id, completed, completed_at):
+    """Announce a toggle written with a plain UPDATE, which sends no signals"""
+    publish_after_commit(
+        user_id, lambda: toggled_event(task_id, completed, completed_at)
+    )
+
+
+def task_updated(user_id, task_id, changes):
+    """
+    Announce the ``changes`` (field name to new value, as the API shows it)
+    of an update; also for updates written with a plain UPDATE, which sends
+    no signals. ``changes`` may be a callable, then only called when someone
+    is listening.
+    """
+    publish_after_commit(
+        user_id,
+        lambda: {
+            "type": "updated",
+            "id": task_id,
+            "changes": changes() if callable(changes) else changes,
+        },
+    )
+
+
+def task_deleted(sender, instance, **kwargs):
+    """Announce deleted tasks"""
+    task_id = instance.id
+    publish_after_commit(instance.user_id, lambda: {"type": "deleted", "id": task_id})
@@ -5,10 +5,16 @@ from django_filters import (
     ChoiceFilter,
     CharFilter,
     BooleanFilter,
+    NumberFilter,
 )
+from django.db.models import Exists, OuterRef
+
+# External imports
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
 
 # App imports
-from .models import Task, PRIORITY_CHOICES
+from .models import DUE_DATE_MISSING, Task, TaskTag, PRIORITY_CHOICES
 
 
 class TaskFilter(FilterSet):
@@ -16,8 +22,16 @@ class TaskFilter(FilterSet):
     created_at = DateFilter(field_name="created_at", lookup_expr="date")
     completed_at = DateFilter(field_name="completed_at", lookup_expr="date")
     due_date = DateFilter(field_name="due_date")
+    due_after = DateFilter(field_name="due_date", lookup_expr="gte")
+    due_before = DateFilter(field_name="due_date", lookup_expr="lte")
     priority = ChoiceFilter(choices=PRIORITY_CHOICES)
     completed = BooleanFilter()
+    parent = NumberFilter(field_name="parent_id")
+    is_root = BooleanFilter(field_name="parent", lookup_expr="isnull")
+    tag = CharFilter(method="filter_any_tag", help_text="Comma-separated tag names")
+    tag_all = CharFilter(
+        method="filter_all_tags", help_text="Comma-separated tag names"
+    )
 
     class Meta:
         model = Task
@@ -29,3 +43,124 @@ class TaskFilter(FilterSet):
             "priority",
             "completed",
         ]
+
+    @staticmethod
+    def tagged(names):
+        """EXISTS subquery matching tasks carrying any of ``names``"""
+        return Exists(
+            TaskTag.objects.filter(
+                task=OuterRef("pk"), tag__user=OuterRef("user"), tag__name__in=names
+            )
+        )
+
+    @staticmethod
+    def tag_names(value):
+        return [name.strip() for name in value.split(",") if name.strip()]
+
+    def filter_any_tag(self, queryset, name, value):
+        """Tasks carrying at least one of the given tags"""
+        names = self.tag_names(value)
+        return queryset.filter(self.tagged(names)) if names else queryset
+
+    def filter_all_tags(self, queryset, name, value):
+        """Tasks carrying every one of the given tags"""
+        for tag_name in self.tag_names(value):
+            queryset = queryset.filter(self.tagged([tag_name]))
+        return queryset
+
+
+class TaskOrderingFilter(BaseFilterBackend):
+    """
+    Sort tasks by one of the whitelisted ``ordering`` values. Each one ends
+    with a unique tie-breaker and matches a composite index on Task, so a
+    page is read in index order instead of sorting the user's tasks.
+    """
+
+    ordering_param = "ordering"
+    orderings = {
+        "position": ["position"],
+        "created_at": ["created_at", "id"],
+        "-created_at": ["-created_at", "-id"],
+        # NULLs last: tasks without a due date go after the dated ones
+        "due_date": [DUE_DATE_MISSING.asc(), "due_date", "id"],
+        "priority": ["priority", "created_at", "id"],
+        "-priority": ["-priority", "-created_at", "-id"],
+        "completed,due_date": ["completed", DUE_DATE_MISSING.asc(), "due_date", "id"],
+    }
+
+    def requested_ordering(self, request):
+        """
+        The requested ordering value, or None when none is requested. Not
+        named get_ordering: CursorPagination calls that on filter backends.
+        """
+        value = request.query_params.get(self.ordering_param, "").replace(" ", "")
+        if value and value not in self.orderings:
+            raise ValidationError(
+                {self.ordering_param: [f"Choose one of: {', '.join(self.orderings)}."]}
+            )
+        return value or None
+
+    def filter_queryset(self, request, queryset, view):
+        value = self.requested_ordering(request)
+        if value is None:
+            return queryset
+        return queryset.order_by(*self.orderings[value])
+
+    @staticmethod
+    def sort_columns(terms):
+        """Columns read by the ordering ``terms``"""
+        return [
+            term.lstrip("-") if isinstance(term, str) else "due_date" for term in terms
+        ]
+
+    @staticmethod
+    def sort_key(terms):
+        """
+        Python sort key putting tasks in the order of ``order_by(*terms)``,
+        unsaved ones (virtual occurrences) after stored ones on ties.
+        """
+        getters = []
+        for term in terms:
+            if not isinstance(term, str):
+                # The only expression sorted on is DUE_DATE_MISSING
+                getters.append((due_date_missing, term.descending))
+                continue
+            field = Task._meta.get_field(term.lstrip("-"))
+            if not field.primary_key:
+                getters.append((column_value(field), term.startswith("-")))
+        descending_ids = "-id" in terms
+
+        def key(task):
+            values = [
+                Descending(getter(task)) if descending else getter(task)
+                for getter, descending in getters
+            ]
+            pk = task.pk or 0
+            values += [task.pk is None, Descending(pk) if descending_ids else pk]
+            return tuple(values)
+
+        return key
+
+
+def due_date_missing(task):
+    return task.due_date is None
+
+
+def column_value(field):
+    """Getter of the value ``field`` sorts on in the database (e.g. a rank)"""
+    return lambda task: field.get_prep_value(getattr(task, field.attname))
+
+
+class Descending:
+    """Sort key value compared in reverse"""
+
+    __slots__ = ["value"]
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
@@ -0,0 +1,158 @@
+# Standard imports
+import functools
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from django.http import HttpResponse
+
+# App imports
+from .sharding import shard_aliases
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+READYZ_CACHE_KEY = "todolist:readyz"
+
+# Last readiness result of this process: (monotonic expiry, status, body)
+_lock = threading.Lock()
+_ready = None
+
+
+@functools.lru_cache(maxsize=None)
+def migration_nodes():
+    """
+    Every migration on disk, read once per process (the files do not change
+    while it runs), with the migrations each squashed one replaces.
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    return {
+        key: (
+            tuple(loader.replacements[key].replaces)
+            if key in loader.replacements
+            else ()
+        )
+        for key in loader.graph.nodes
+    }
+
+
+def check_database(alias):
+    """Reach ``alias`` and make sure every migration on disk is applied to it"""
+    connection = connections[alias]
+    try:
+        applied = MigrationRecorder(connection).applied_migrations()
+    finally:
+        # Runs in a throwaway thread: do not leave its connection open
+        connection.close()
+    pending = [
+        key
+        for key, replaces in migration_nodes().items()
+        if key not in applied
+        and not (replaces and all(replaced in applied for replaced in replaces))
+    ]
+    if pending:
+        return f"{len(pending)} unapplied migration{'s' if len(pending) > 1 else ''}"
+    return "ok"
+
+
+def check_cache():
+    """Write and read a key; unreachable cache servers raise"""
+    cache.set(READYZ_CACHE_KEY, time.time(), 60)
+    cache.get(READYZ_CACHE_KEY)
+    return "ok"
+
+
+def readiness_checks():
+    aliases = dict.fromkeys([DEFAULT_DB_ALIAS, *shard_aliases()])
+    checks = {
+        f"database:{alias}": functools.partial(check_database, alias)
+        for alias in aliases
+    }
+    checks["cache"] = check_cache
+    return checks
+
+
+def run_checks():
+    """
+    Run the readiness checks side by side, giving them all
+    TODOLIST_READYZ_TIMEOUT_SECONDS; one that takes longer counts as failed
+    and is left to finish on its own.
+    """
+    timeout = getattr(settings, "TODOLIST_READYZ_TIMEOUT_SECONDS", 2)
+    checks = readiness_checks()
+    executor = ThreadPoolExecutor(
+        max_workers=len(checks), thread_name_prefix="todolist-readyz"
+    )
+    futures = {name: executor.submit(check) for name, check in checks.items()}
+    wait(futures.values(), timeout=timeout)
+    executor.shutdown(wait=False)
+
+    results = {}
+    for name, future in futures.items():
+        if not future.done():
+            results[name] = "timeout"
+        elif future.exception() is not None:
+            logger.error(f"READINESS CHECK FAILED: {name}", exc_info=future.exception())
+            results[name] = "error"
+        else:
+            results[name] = future.result()
+    return results
+
+
+def readiness():
+    """
+    (status code, body) of the readiness checks, run at most once per
+    TODOLIST_READYZ_CACHE_SECONDS in this process; probes arriving meanwhile
+    get the last result.
+    """
+    global _ready
+    with _lock:
+        now = time.monotonic()
+        if _ready is not None and _ready[0] > now:
+            return _ready[1:]
+        results = run_checks()
+        ready = all(result == "ok" for result in results.values())
+        if not ready:
+            logger.warning(f"NOT READY: {results}")
+        status = 200 if ready else 503
+        body = json.dumps(
+            {"status": "ok" if ready else "unavailable", "checks": results}
+        )
+        expires = time.monotonic() + getattr(
+            settings, "TODOLIST_READYZ_CACHE_SECONDS", 5
+        )
+        _ready = (expires, status, body)
+        return status, body
+
+
+def forget_readiness():
+    """Drop the cached readiness result (tests, or after a deploy step)"""
+    global _ready
+    with _lock:
+        _ready = None
+
+
+def healthz(request):
+    """Liveness: the process answers requests. No I/O at all"""
+    return HttpResponse("ok", content_type="text/plain")
+
+
+def readyz(request):
+    """Readiness: the databases are reachable and migrated, the cache answers"""
+    status, body = readiness()
+    response = HttpResponse(body, status=status, content_type="application/json")
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+# Paths answered by HealthCheckMiddleware
+PROBES = {"/healthz": healthz, "/readyz": readyz}
@@ -0,0 +1,146 @@
+# Standard imports
+import functools
+import hashlib
+import logging
+import math
+from datetime import timedelta
+
+# Django imports
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+# External imports
+from rest_framework import status
+from rest_framework.response import Response
+
+# App imports
+from .models import IdempotencyKey
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request):
+    """Hash of what makes two requests the same: method, path and body"""
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.path}\n".encode())
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def lease_duration():
+    """How long an unfinished claim holds its key before another request may take it"""
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_KEY_LEASE_SECONDS", 60))
+
+
+def claim_key(user, key, fingerprint):
+    """
+    Insert the in-progress row for ``key``. Returns ``(record, True)`` when
+    this request claimed it, or the existing row and False when another
+    request (finished or still running) got there first. The row can vanish
+    between our failed INSERT and the read when the winner's view fails and
+    releases the key: then the claim is tried once more, and ``(None, False)``
+    means the key kept changing hands.
+    """
+    now = timezone.now()
+    ttl = getattr(settings, "IDEMPOTENCY_KEY_TTL_SECONDS", 24 * 60 * 60)
+    # An expired key is free again, and so is one whose request never finished
+    IdempotencyKey.objects.filter(user=user, key=key).filter(
+        Q(expires_at__lte=now)
+        | Q(status_code__isnull=True, claimed_at__lte=now - lease_duration())
+    ).delete()
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=user,
+                    key=key,
+                    fingerprint=fingerprint,
+                    expires_at=now + timedelta(seconds=ttl),
+                    claimed_at=now,
+                )
+            return record, True
+        except IntegrityError:
+            record = IdempotencyKey.objects.filter(user=user, key=key).first()
+            if record is not None:
+                return record, False
+    return None, False
+
+
+def in_progress(retry_after):
+    """409 for a duplicate of a request that has not finished yet"""
+    response = Response(
+        {"detail": f"A request with this {HEADER} is still in progress."},
+        status=status.HTTP_409_CONFLICT,
+    )
+    response["Retry-After"] = max(math.ceil(retry_after), 1)
+    return response
+
+
+def replay(record, fingerprint):
+    """The response for a request whose key was already claimed"""
+    if record.fingerprint != fingerprint:
+        return Response(
+            {"detail": f"This {HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if record.status_code is None:
+        # The key is free again once the claim's lease runs out
+        lapses = record.claimed_at + lease_duration() - timezone.now()
+        return in_progress(lapses.total_seconds())
+    response = Response(record.response_body, status=record.status_code)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(view_method):
+    """
+    Make a view method safe to retry. Requests carrying an Idempotency-Key
+    header run once per user and key; retries get the stored response
+    without running the view, and a duplicate that arrives while the first
+    request is still running is answered 409. Only successful responses are
+    stored: on errors the key is released so the client can try again. A
+    claim left unfinished by a dead worker lapses after
+    IDEMPOTENCY_KEY_LEASE_SECONDS, so the key does not answer 409 until it
+    expires.
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return view_method(self, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = request_fingerprint(request)
+        record, claimed = claim_key(request.user, key, fingerprint)
+        if record is None:
+            return in_progress(1)
+        if not claimed:
+            logger.info(f"IDEMPOTENT REPLAY: User={request.user.id} | Key={key}")
+            return replay(record, fingerprint)
+
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        if status.is_success(response.status_code):
+            IdempotencyKey.objects.filter(pk=record.pk).update(
+                status_code=response.status_code, response_body=response.data
+            )
+        else:
+            record.delete()
+        return response
+
+    return wrapper
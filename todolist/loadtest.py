@@ -0,0 +1,313 @@
+# Standard imports
+import http.client
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlencode, urlsplit
+
+# Operations a virtual user mixes, with their default weights
+DEFAULT_MIX = {"create": 30, "list": 30, "search": 20, "toggle": 15, "delete": 5}
+PRIORITIES = ["low", "medium", "high"]
+WORDS = ["report", "invoice", "call", "groceries", "review", "deploy", "plan", "email"]
+# Share of failed requests refused by a throttle above which the report warns
+THROTTLED_WARNING_SHARE = 0.5
+
+
+class LoadTestError(Exception):
+    """The load test could not start"""
+
+
+def decode(content):
+    try:
+        return json.loads(content) if content else None
+    except ValueError:
+        return None
+
+
+class HTTPTransport:
+    """Requests over one keep-alive connection to a running instance"""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise LoadTestError(f"Not an http(s) URL: {base_url!r}")
+        self.connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.connection = None
+
+    def request(self, method, path, body=None, headers=None):
+        if self.connection is None:
+            self.connection = self.connection_class(self.netloc, timeout=self.timeout)
+        headers = {"Accept": "application/json", **(headers or {})}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            self.connection.request(method, self.prefix + path, payload, headers)
+            response = self.connection.getresponse()
+            content = response.read()
+        except (OSError, http.client.HTTPException):
+            # Reconnect on the next request
+            self.connection.close()
+            self.connection = None
+            raise
+        return response.status, decode(content)
+
+
+class InProcessTransport:
+    """
+    Requests through this process's Django handler, without sockets: the
+    whole middleware and view stack runs, but no server is needed.
+    """
+
+    def __init__(self):
+        # Django imports
+        from django.test import Client
+
+        self.client = Client(raise_request_exception=False)
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.client.generic(
+            method,
+            path,
+            json.dumps(body) if body is not None else "",
+            content_type="application/json",
+            headers=headers,
+        )
+        return response.status_code, decode(response.content)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of sorted ``values``"""
+    if not values:
+        return None
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+class Stats:
+    """Latencies and errors per endpoint, kept by one worker and merged"""
+
+    def __init__(self):
+        self.timings = defaultdict(list)
+        # Failed requests per endpoint by status code ("network" without one)
+        self.errors = defaultdict(Counter)
+
+    def add(self, endpoint, seconds, status):
+        self.timings[endpoint].append(seconds * 1000)
+        if status is None or status >= 400:
+            self.errors[endpoint][str(status or "network")] += 1
+
+    def merge(self, other):
+        for endpoint, timings in other.timings.items():
+            self.timings[endpoint].extend(timings)
+            self.errors[endpoint].update(other.errors[endpoint])
+
+    def summary(self, elapsed):
+        """One row per endpoint plus a "Total" row, as plain dicts"""
+        rows = []
+        everything = []
+        for endpoint in sorted(self.timings):
+            timings = self.timings[endpoint]
+            everything.extend(timings)
+            rows.append(self.row(endpoint, timings, self.errors[endpoint], elapsed))
+        rows.append(
+            self.row("Total", everything, sum(self.errors.values(), Counter()), elapsed)
+        )
+        return rows
+
+    @staticmethod
+    def row(endpoint, timings, errors, elapsed):
+        timings = sorted(timings)
+        failed = sum(errors.values())
+        return {
+            "endpoint": endpoint,
+            "requests": len(timings),
+            "errors": failed,
+            "error_statuses": dict(sorted(errors.items())),
+            "error_rate": failed / len(timings) if timings else 0.0,
+            "throughput": len(timings) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(timings, 50),
+            "p95_ms": percentile(timings, 95),
+            "p99_ms": percentile(timings, 99),
+        }
+
+
+def report_warnings(rows):
+    """
+    Reasons not to trust a report: when throttles refused most failed
+    requests, it measured the throttle rates rather than the API.
+    """
+    total = rows[-1]
+    throttled = total["error_statuses"].get("429", 0)
+    if not throttled or throttled < total["errors"] * THROTTLED_WARNING_SHARE:
+        return []
+    return [
+        f"{throttled} of {total['requests']} requests were throttled (429): run "
+        "the target with the todochallenge.settings.loadtest settings"
+    ]
+
+
+class VirtualUser:
+    """One API client: logs in, then runs operations picked from the mix"""
+
+    def __init__(self, transport, username, password, mix, rng):
+        self.transport = transport
+        self.username = username
+        self.password = password
+        self.headers = {}
+        self.operations = list(mix)
+        self.weights = list(mix.values())
+        self.rng = rng
+        self.task_ids = []
+        self.created = 0
+        self.stats = Stats()
+
+    def call(self, endpoint, method, path, body=None):
+        """Send one request, timing it under ``endpoint``"""
+        started = time.perf_counter()
+        try:
+            status, data = self.transport.request(method, path, body, self.headers)
+        except (OSError, http.client.HTTPException):
+            status, data = None, None
+        self.stats.add(endpoint, time.perf_counter() - started, status)
+        return status, data
+
+    def log_in(self):
+        """Register (when missing) and log in; True once a JWT is held"""
+        credentials = {"username": self.username, "password": self.password}
+        # 400 means the user exists already, from an earlier run
+        try:
+            self.transport.request(
+                "POST", "/api/accounts/register/", credentials, self.headers
+            )
+        except (OSError, http.client.HTTPException):
+            return False
+        status, data = self.call(
+            "POST /api/accounts/login/", "POST", "/api/accounts/login/", credentials
+        )
+        if status != 200 or not data or "access" not in data:
+            return False
+        self.headers["Authorization"] = f"Bearer {data['access']}"
+        return True
+
+    def step(self):
+        operation = self.rng.choices(self.operations, self.weights)[0]
+        if operation in ("toggle", "delete") and not self.task_ids:
+            operation = "create"
+        getattr(self, operation)()
+
+    def create(self):
+        self.created += 1
+        status, data = self.call(
+            "POST /api/tasks/",
+            "POST",
+            "/api/tasks/",
+            {
+                "title": f"{self.rng.choice(WORDS).title()} {self.created}",
+                "description": " ".join(self.rng.choices(WORDS, k=8)),
+                "priority": self.rng.choice(PRIORITIES),
+            },
+        )
+        if status == 201:
+            self.task_ids.append(data["id"])
+
+    def list(self):
+        self.call("GET /api/tasks/", "GET", "/api/tasks/")
+
+    def search(self):
+        query = urlencode({"search": self.rng.choice(WORDS)})
+        self.call("GET /api/tasks/?search=", "GET", f"/api/tasks/?{query}")
+
+    def toggle(self):
+        task_id = self.rng.choice(self.task_ids)
+        self.call(
+            "POST /api/tasks/{id}/toggle-complete/",
+            "POST",
+            f"/api/tasks/{task_id}/toggle-complete/",
+        )
+
+    def delete(self):
+        task_id = self.task_ids.pop(self.rng.randrange(len(self.task_ids)))
+        self.call("DELETE /api/tasks/{id}/", "DELETE", f"/api/tasks/{task_id}/")
+
+
+def run_load(
+    make_transport,
+    users=10,
+    password="loadtest-pass",
+    prefix="loadtest",
+    concurrency=10,
+    duration=None,
+    requests=None,
+    mix=None,
+    seed=None,
+):
+    """
+    Drive the API with ``concurrency`` virtual users, spread round-robin
+    over ``users`` accounts, until ``requests`` requests were sent or
+    ``duration`` seconds passed. ``make_transport`` returns a new transport
+    for each virtual user. Returns the merged Stats and the seconds spent.
+    """
+    if duration is None and requests is None:
+        raise LoadTestError("Give a duration or a number of requests")
+    mix = {name: weight for name, weight in (mix or DEFAULT_MIX).items() if weight}
+    unknown = set(mix) - set(DEFAULT_MIX)
+    if unknown:
+        raise LoadTestError(f"Unknown operations in the mix: {sorted(unknown)}")
+    if not mix:
+        raise LoadTestError("The mix has no operation with a weight")
+
+    workers = []
+    for index in range(concurrency):
+        account = index % users
+        workers.append(
+            VirtualUser(
+                make_transport(),
+                f"{prefix}-{account}",
+                password,
+                mix,
+                random.Random(None if seed is None else seed + index),
+            )
+        )
+    logged_in = [worker for worker in workers if worker.log_in()]
+    if not logged_in:
+        raise LoadTestError("No virtual user could log in")
+
+    sent = itertools.count()
+    started = time.perf_counter()
+    deadline = started + duration if duration is not None else None
+
+    def work(worker):
+        while deadline is None or time.perf_counter() < deadline:
+            if requests is not None and next(sent) >= requests:
+                break
+            worker.step()
+
+    if len(logged_in) == 1:
+        work(logged_in[0])
+    else:
+        threads = [
+            threading.Thread(target=work, args=(worker,), daemon=True)
+            for worker in logged_in
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    stats = Stats()
+    for worker in workers:
+        stats.merge(worker.stats)
+    return stats, elapsed
@@ -0,0 +1,141 @@
+# Standard imports
+import json
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# App imports
+from todolist.loadtest import (
+    DEFAULT_MIX,
+    HTTPTransport,
+    InProcessTransport,
+    LoadTestError,
+    report_warnings,
+    run_load,
+)
+
+
+def parse_mix(value):
+    """``create=30,list=40`` into ``{"create": 30, "list": 40}``"""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        try:
+            mix[name.strip()] = int(weight)
+        except ValueError:
+            raise CommandError(f"Bad --mix item {item!r}; use name=weight")
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the API with concurrent virtual users logging in with JWTs and "
+        "creating, listing, searching, toggling and deleting tasks; reports "
+        "throughput, latency percentiles and errors per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            help="Base URL of a running instance, e.g. http://localhost:8000. "
+            "Without it requests go through this process's Django handler.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=10, help="Virtual users at once."
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=10,
+            help="Accounts the virtual users are spread over; created if missing.",
+        )
+        parser.add_argument(
+            "--duration", type=float, help="Seconds to run (default 30)."
+        )
+        parser.add_argument(
+            "--requests", type=int, help="Stop after this many requests instead."
+        )
+        parser.add_argument(
+            "--mix",
+            type=parse_mix,
+            default=DEFAULT_MIX,
+            help="Operation weights (default "
+            + ",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items())
+            + ").",
+        )
+        parser.add_argument(
+            "--prefix", default="loadtest", help="Username prefix of the accounts."
+        )
+        parser.add_argument(
+            "--password", default="loadtest-pass", help="Password of the accounts."
+        )
+        parser.add_argument(
+            "--seed", type=int, help="Seed for a reproducible operation sequence."
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=30, help="HTTP timeout in seconds."
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON."
+        )
+
+    def handle(self, *args, **options):
+        if options["url"]:
+            url, timeout = options["url"], options["timeout"]
+
+            def make_transport():
+                return HTTPTransport(url, timeout=timeout)
+
+        else:
+            make_transport = InProcessTransport
+
+        duration = options["duration"]
+        if duration is None and options["requests"] is None:
+            duration = 30
+        try:
+            stats, elapsed = run_load(
+                make_transport,
+                users=options["users"],
+                password=options["password"],
+                prefix=options["prefix"],
+                concurrency=options["concurrency"],
+                duration=duration,
+                requests=options["requests"],
+                mix=options["mix"],
+                seed=options["seed"],
+            )
+        except LoadTestError as error:
+            raise CommandError(str(error))
+
+        rows = stats.summary(elapsed)
+        warnings = report_warnings(rows)
+        if options["json"]:
+            self.stdout.write(
+                json.dumps(
+                    {"seconds": elapsed, "endpoints": rows, "warnings": warnings}
+                )
+            )
+            return
+        self.stdout.write(
+            f"{options['concurrency']} virtual user(s), {elapsed:.1f}s "
+            f"against {options['url'] or 'the in-process handler'}"
+        )
+        self.stdout.write(
+            f"{'Endpoint':<40} {'Reqs':>7} {'Errors':>7} {'Err %':>6} "
+            f"{'Req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  Error statuses"
+        )
+        for row in rows:
+            latencies = " ".join(
+                f"{row[key]:>8.1f}" if row[key] is not None else f"{'-':>8}"
+                for key in ("p50_ms", "p95_ms", "p99_ms")
+            )
+            statuses = " ".join(
+                f"{code}x{count}" for code, count in row["error_statuses"].items()
+            )
+            self.stdout.write(
+                f"{row['endpoint']:<40} {row['requests']:>7} {row['errors']:>7} "
+                f"{row['error_rate'] * 100:>6.1f} {row['throughput']:>8.1f} "
+                f"{latencies}  {statuses}".rstrip()
+            )
+        for warning in warnings:
+            self.stdout.write(self.style.WARNING(f"Warning: {warning}"))
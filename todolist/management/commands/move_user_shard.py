@@ -0,0 +1,56 @@
+# Django imports
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+# App imports
+from todolist.sharding import (
+    ShardMoveConflict,
+    directory_entry,
+    move_user,
+    shard_aliases,
+)
+
+
+class Command(BaseCommand):
+    help = "Move a user's tasks, categories, tags and history to another shard."
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_id", type=int, help="Id of the user to move.")
+        parser.add_argument("shard", help="TODOLIST_SHARDS alias to move them to.")
+        parser.add_argument(
+            "--grace-seconds",
+            type=float,
+            default=5,
+            help="Seconds to let writes in flight finish once writes are refused.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows copied per INSERT.",
+        )
+
+    def handle(self, *args, **options):
+        if options["shard"] not in shard_aliases():
+            raise CommandError(
+                f"Unknown shard {options['shard']!r}; "
+                f"TODOLIST_SHARDS is {shard_aliases()}."
+            )
+        if not User.objects.filter(pk=options["user_id"]).exists():
+            raise CommandError(f"User {options['user_id']} does not exist.")
+        source = directory_entry(options["user_id"]).alias
+        try:
+            moved = move_user(
+                options["user_id"],
+                options["shard"],
+                grace_seconds=options["grace_seconds"],
+                batch_size=options["batch_size"],
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+        except ShardMoveConflict as error:
+            raise CommandError(f"{error}; nothing was moved, run the command again.")
+        self.stdout.write(
+            f"Moved {moved} row(s) of user {options['user_id']} "
+            f"from {source} to {options['shard']}."
+        )
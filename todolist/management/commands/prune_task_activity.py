@@ -0,0 +1,37 @@
+# Standard imports
+from datetime import timedelta
+
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# App imports
+from todolist.activity import prune_activity
+from todolist.sharding import each_shard
+
+
+class Command(BaseCommand):
+    help = "Delete task activity older than the retention period, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "TASK_ACTIVITY_RETENTION_DAYS", 365),
+            help="Keep activity from this many most recent days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "TASK_ACTIVITY_PRUNE_BATCH_SIZE", 1000),
+            help="Rows deleted per DELETE.",
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options["days"])
+        count = sum(
+            prune_activity(before, batch_size=options["batch_size"])
+            for _ in each_shard()
+        )
+        self.stdout.write(f"Deleted {count} task activity entries.")
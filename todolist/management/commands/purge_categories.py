@@ -0,0 +1,30 @@
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# App imports
+from todolist.models import TaskCategory, purge_category
+from todolist.sharding import each_shard
+
+
+class Command(BaseCommand):
+    help = "Finish deleting categories whose background purge was interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "CATEGORY_PURGE_BATCH_SIZE", 1000),
+            help="Tasks detached per UPDATE.",
+        )
+
+    def handle(self, *args, **options):
+        for _ in each_shard():
+            category_ids = TaskCategory.objects.filter(
+                deleted_at__isnull=False
+            ).values_list("id", flat=True)
+            for category_id in list(category_ids):
+                count = purge_category(category_id, batch_size=options["batch_size"])
+                self.stdout.write(
+                    f"Purged category {category_id}, detached {count} task(s)."
+                )
@@ -0,0 +1,16 @@
+# Django imports
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# App imports
+from todolist.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys whose TTL has passed."
+
+    def handle(self, *args, **options):
+        count, _ = IdempotencyKey.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+        self.stdout.write(f"Deleted {count} expired idempotency key(s).")
@@ -0,0 +1,42 @@
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models.functions import Length
+
+# App imports
+from todolist.models import Task, rebalance_positions
+from todolist.sharding import each_shard
+
+
+class Command(BaseCommand):
+    help = "Renumber the manual order of users whose position keys grew too long."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="users",
+            help="Rebalance this user id regardless of key length (repeatable).",
+        )
+        parser.add_argument(
+            "--max-length",
+            type=int,
+            default=getattr(settings, "TASK_POSITION_REBALANCE_LENGTH", 32),
+            help="Rebalance users with any position key longer than this.",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options["users"]
+        if not user_ids:
+            user_ids = []
+            for _ in each_shard():
+                user_ids += (
+                    Task.objects.annotate(key_length=Length("position"))
+                    .filter(key_length__gt=options["max_length"])
+                    .values_list("user_id", flat=True)
+                    .distinct()
+                )
+        for user_id in user_ids:
+            count = rebalance_positions(user_id)
+            self.stdout.write(f"Rebalanced {count} task(s) of user {user_id}.")
@@ -0,0 +1,88 @@
+# Standard imports
+import os
+import time
+from datetime import date
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+
+# App imports
+from todolist.seeding import SeedError, seed_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Create synthetic users, categories and tasks for performance tests: "
+        "COPY on PostgreSQL, batched INSERTs elsewhere. The same --seed and "
+        "--until give the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Users to create.")
+        parser.add_argument(
+            "--tasks-per-user", type=int, default=100, help="Tasks of each user."
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the generated data."
+        )
+        parser.add_argument(
+            "--until",
+            type=date.fromisoformat,
+            help="Date (YYYY-MM-DD) of the newest tasks; defaults to today.",
+        )
+        parser.add_argument(
+            "--days", type=int, default=365, help="Days of task history to spread."
+        )
+        parser.add_argument(
+            "--prefix", default="seed", help="Username prefix of the users."
+        )
+        parser.add_argument(
+            "--password", default="seed-pass", help="Password of every user."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=10000, help="Rows per COPY or INSERT."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes generating and writing tasks (one on SQLite).",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["tasks_per_user"] < 0:
+            raise CommandError(
+                "--users must be positive, --tasks-per-user not negative"
+            )
+        started = time.monotonic()
+        last_report = [started]
+
+        def progress(done, total):
+            now = time.monotonic()
+            if now - last_report[0] >= 5 or done == total:
+                last_report[0] = now
+                rate = done / max(now - started, 1e-9)
+                self.stdout.write(f"{done}/{total} tasks ({rate:,.0f}/s)")
+
+        try:
+            counts = seed_data(
+                options["users"],
+                options["tasks_per_user"],
+                seed=options["seed"],
+                prefix=options["prefix"],
+                password=options["password"],
+                until=options["until"],
+                days=options["days"],
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                progress=progress,
+            )
+        except SeedError as error:
+            raise CommandError(str(error))
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {counts['users']} user(s), {counts['categories']} "
+                f"categories and {counts['tasks']} task(s) in {elapsed:.1f}s."
+            )
+        )
@@ -0,0 +1,66 @@
+# Standard imports
+import time
+
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+# App imports
+from todolist.reminders import send_due_reminders
+from todolist.sharding import each_shard
+
+
+class Command(BaseCommand):
+    help = "Send reminders for pending tasks that are due soon or overdue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and scan again every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=getattr(settings, "REMINDER_INTERVAL_SECONDS", 60),
+            help="Seconds to wait between ticks when --loop is given.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "REMINDER_BATCH_SIZE", 500),
+            help="Number of reminders recorded and sent per transaction.",
+        )
+        parser.add_argument(
+            "--days-ahead",
+            type=int,
+            default=getattr(settings, "REMINDER_DAYS_AHEAD", 1),
+            help="Remind about tasks due up to this many days from today.",
+        )
+        parser.add_argument(
+            "--lookback-days",
+            type=int,
+            default=getattr(settings, "REMINDER_LOOKBACK_DAYS", 7),
+            help="Remind about overdue tasks up to this many days past due.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = sum(
+                send_due_reminders(
+                    days_ahead=options["days_ahead"],
+                    lookback_days=options["lookback_days"],
+                    batch_size=options["batch_size"],
+                )
+                for _ in each_shard()
+            )
+            self.stdout.write(f"Sent {sent} reminder(s).")
+            if not options["loop"]:
+                break
+            # Long-running workers must not hold on to stale connections
+            close_old_connections()
+            try:
+                time.sleep(options["interval"])
+            except KeyboardInterrupt:
+                break
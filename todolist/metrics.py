@@ -0,0 +1,325 @@
+# Standard imports
+import atexit
+import bisect
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+# Django imports
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: exited workers' files are simply kept
+    fcntl = None
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the request latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Exposed metrics: name -> (type, help)
+METRICS = {
+    "todolist_http_request_duration_seconds": (
+        "histogram",
+        "Time to answer a request, by view, method and status",
+    ),
+    "todolist_db_queries_total": ("counter", "Database queries run, by view"),
+    "todolist_db_query_seconds_total": (
+        "counter",
+        "Time spent running database queries, by view",
+    ),
+    "todolist_cache_hits_total": ("counter", "Per-user cache lookups that hit"),
+    "todolist_cache_misses_total": ("counter", "Per-user cache lookups that missed"),
+    "todolist_throttled_requests_total": (
+        "counter",
+        "Requests refused by a throttle, by view",
+    ),
+    "todolist_login_failures_total": ("counter", "Failed logins at UserLoginView"),
+}
+
+# View the queries of the current request are counted for
+current_view = ContextVar("todolist_metrics_view", default="-")
+
+# This process's values since it started: counters are
+# {(name, labels): value}, histograms {(name, labels): [bucket counts..., sum]}
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_last_flush = 0.0
+# Names this process's file, so a later process reusing the pid gets its own
+_started = time.time_ns()
+
+# Values of exited workers, merged into one file by collect()
+ARCHIVE_NAME = "archive.json"
+EMPTY_ARCHIVE = {"counters": [], "histograms": [], "merged": []}
+
+
+def reset():
+    """Forget this process's values (a forked worker starts from zero)"""
+    global _last_flush, _started
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _last_flush = 0.0
+        _started = time.time_ns()
+
+
+os.register_at_fork(after_in_child=reset)
+
+
+def inc(name, labels=(), value=1):
+    """Add ``value`` to a counter; ``labels`` is a tuple of (name, value) pairs"""
+    key = (name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, labels, seconds):
+    """Record one observation in a histogram"""
+    key = (name, labels)
+    with _lock:
+        values = _histograms.get(key)
+        if values is None:
+            values = _histograms[key] = [0] * (len(BUCKETS) + 2)
+        values[bisect.bisect_left(BUCKETS, seconds)] += 1
+        values[-1] += seconds
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting queries and their time per view"""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        labels = (("view", current_view.get()),)
+        elapsed = time.perf_counter() - started
+        with _lock:
+            key = ("todolist_db_queries_total", labels)
+            _counters[key] = _counters.get(key, 0) + 1
+            key = ("todolist_db_query_seconds_total", labels)
+            _counters[key] = _counters.get(key, 0) + elapsed
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """``connection_created`` receiver: count every query of the connection"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def metrics_dir():
+    default = Path(tempfile.gettempdir()) / "todolist-metrics"
+    return Path(getattr(settings, "TODOLIST_METRICS_DIR", default))
+
+
+def flush(force=False):
+    """
+    Write this process's values to its own file in the metrics directory,
+    at most every TODOLIST_METRICS_FLUSH_SECONDS unless ``force`` is given.
+    Each process only ever writes its own file, so workers never contend.
+    """
+    global _last_flush
+    now = time.monotonic()
+    interval = getattr(settings, "TODOLIST_METRICS_FLUSH_SECONDS", 1)
+    if not force and now - _last_flush < interval:
+        return
+    with _lock:
+        _last_flush = now
+        state = {
+            "counters": [
+                [name, labels, value] for (name, labels), value in _counters.items()
+            ],
+            "histograms": [
+                [name, labels, values] for (name, labels), values in _histograms.items()
+            ],
+        }
+    directory = metrics_dir()
+    path = directory / f"metrics-{os.getpid()}-{_started}.json"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(state))
+        os.replace(temporary, path)
+    except OSError:
+        logger.exception(f"METRICS NOT WRITTEN: {path}")
+
+
+atexit.register(flush, force=True)
+
+
+def add_state(counters, histograms, state):
+    """Add the values of a written ``state`` to ``counters`` and ``histograms``"""
+    for name, labels, value in state["counters"]:
+        key = (name, tuple(map(tuple, labels)))
+        counters[key] = counters.get(key, 0) + value
+    for name, labels, values in state["histograms"]:
+        key = (name, tuple(map(tuple, labels)))
+        total = histograms.setdefault(key, [0] * len(values))
+        for index, value in enumerate(values):
+            total[index] += value
+
+
+def read_state(path):
+    """Values written to ``path``, or None while it is missing or being replaced"""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def exited_worker_files(paths):
+    """
+    Files of processes that have exited: their pid is gone, or a newer file
+    has the same pid (the pid was reused).
+    """
+    started = {}
+    for path in paths:
+        try:
+            pid, start = map(int, path.stem.split("-")[1:])
+        except ValueError:
+            continue
+        started.setdefault(pid, []).append((start, path))
+    exited = []
+    for pid, files in started.items():
+        files.sort()
+        if not process_alive(pid):
+            exited += [path for _, path in files]
+        else:
+            exited += [path for _, path in files[:-1]]
+    return exited
+
+
+@contextlib.contextmanager
+def directory_lock(directory):
+    """
+    Hold the metrics directory's lock file. Yields False, holding nothing,
+    without fcntl or a writable directory.
+    """
+    try:
+        lock_file = open(directory / "metrics.lock", "a")
+    except OSError:
+        lock_file = None
+    if fcntl is None or lock_file is None:
+        yield False
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def archive_exited(directory, paths, archive):
+    """
+    Add the files of exited workers to the ``archive`` read from the archive
+    file and delete them, so the directory does not grow with every replaced
+    worker. The archive lists the files it holds, so a crash before the
+    deletes never counts them twice. Call under ``directory_lock``.
+    """
+    exited = exited_worker_files(paths)
+    archive_path = directory / ARCHIVE_NAME
+    merged = set(archive["merged"])
+    fresh = [path for path in exited if path.name not in merged]
+    if fresh:
+        counters, histograms = {}, {}
+        add_state(counters, histograms, archive)
+        for path in fresh:
+            state = read_state(path)
+            if state is not None:
+                add_state(counters, histograms, state)
+        archive = {
+            "counters": [
+                [name, labels, value] for (name, labels), value in counters.items()
+            ],
+            "histograms": [
+                [name, labels, values] for (name, labels), values in histograms.items()
+            ],
+            # Only names still on disk need remembering
+            "merged": [path.name for path in exited],
+        }
+        temporary = archive_path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(archive))
+        os.replace(temporary, archive_path)
+        logger.info(f"METRICS ARCHIVED: {len(fresh)} exited worker file(s)")
+    for path in exited:
+        path.unlink(missing_ok=True)
+    return archive
+
+
+def collect():
+    """
+    The values of every process that wrote to the metrics directory, this
+    one included, added up. Files of workers that have exited are merged
+    into one archive file, so counters never go backwards when gunicorn
+    replaces a worker and the directory does not keep a file per worker.
+    """
+    flush(force=True)
+    directory = metrics_dir()
+    counters, histograms = {}, {}
+    # Exclusive: a file must never be read both on its own and in the archive
+    with directory_lock(directory) as locked:
+        paths = sorted(directory.glob("metrics-*.json"))
+        archive = read_state(directory / ARCHIVE_NAME) or EMPTY_ARCHIVE
+        if locked:
+            try:
+                archive = archive_exited(directory, paths, archive)
+            except OSError:
+                logger.exception(f"METRICS NOT ARCHIVED: {directory}")
+        add_state(counters, histograms, archive)
+        for path in paths:
+            state = None if path.name in archive["merged"] else read_state(path)
+            if state is not None:
+                add_state(counters, histograms, state)
+    return counters, histograms
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def render(counters, histograms):
+    """Values in the Prometheus text exposition format"""
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        if kind == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+            continue
+        for (metric, labels), values in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ("+Inf",), values):
+                cumulative += count
+                bucket = format_labels(labels + (("le", str(bound)),))
+                lines.append(f"{name}_bucket{bucket} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {values[-1]}")
+            lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,141 @@
+# Standard imports
+import time
+
+# Django imports
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+# App imports
+from . import metrics
+from .health import PROBES, readyz
+from .activity import buffered_activity, close_buffer, flush, open_buffer
+
+
+class HealthCheckMiddleware:
+    """
+    Answer the liveness and readiness probes (``/healthz``, ``/readyz``)
+    before any other middleware runs: no session, authentication, throttling,
+    host check, HTTPS redirect or metrics, so probes stay cheap under load.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        probe = PROBES.get(request.path_info)
+        if probe is not None:
+            return probe(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        probe = PROBES.get(request.path_info)
+        if probe is readyz:
+            # The checks block: keep them off the event loop
+            return await sync_to_async(probe, thread_sensitive=False)(request)
+        if probe is not None:
+            return probe(request)
+        return await self.get_response(request)
+
+
+class TaskActivityMiddleware:
+    """
+    Hold the task activity recorded while handling a request and write it
+    with one INSERT once the response is ready, attributed to the user the
+    request was authenticated as (DRF copies its user onto the request).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with buffered_activity(actor=lambda: getattr(request, "user", None)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not open_buffer():
+            return await self.get_response(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            entries = close_buffer()
+            if entries:
+                await sync_to_async(flush)(entries, getattr(request, "user", None))
+
+
+class MetricsMiddleware:
+    """
+    Time every request and count its database queries for ``/metrics``.
+    Values are kept in memory and written to this process's metrics file at
+    most once per TODOLIST_METRICS_FLUSH_SECONDS.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        token = metrics.current_view.set("-")
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_view.reset(token)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        token = metrics.current_view.set("-")
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_view.reset(token)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # The URL is resolved by now: count the view's queries under its name
+        metrics.current_view.set(view_name(request))
+
+    @staticmethod
+    def record(request, response, seconds):
+        view = view_name(request)
+        metrics.observe(
+            "todolist_http_request_duration_seconds",
+            (
+                ("view", view),
+                ("method", request.method),
+                ("status", str(response.status_code)),
+            ),
+            seconds,
+        )
+        if response.status_code == 429:
+            metrics.inc("todolist_throttled_requests_total", (("view", view),))
+        metrics.flush()
+
+
+def view_name(request):
+    """URL name of the view serving ``request``; a fixed label for 404s"""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match._func_path
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.12 on 2026-10-19 08:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todolist", "0002_taskcategory_task_completed_at_task_due_date_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskReminder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("due_soon", "Due soon"), ("overdue", "Overdue")],
+                        help_text="Kind of reminder sent",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "due_date",
+                    models.DateField(help_text="Due date the reminder refers to"),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Timestamp when the reminder was sent",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("completed", False), ("due_date__isnull", False)),
+                fields=["due_date", "id"],
+                name="task_pending_due_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskreminder",
+            name="task",
+            field=models.ForeignKey(
+                help_text="Task the reminder was sent for",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="reminders",
+                to="todolist.task",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="taskreminder",
+            constraint=models.UniqueConstraint(
+                fields=("task", "kind", "due_date"), name="unique_task_reminder"
+            ),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 4.2.12 on 2026-10-19 08:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todolist", "0003_taskreminder"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskRecurrence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "frequency",
+                    models.CharField(
+                        choices=[
+                            ("daily", "Daily"),
+                            ("weekly", "Weekly"),
+                            ("monthly", "Monthly"),
+                        ],
+                        help_text="Repeat frequency",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "interval",
+                    models.PositiveSmallIntegerField(
+                        default=1,
+                        help_text="Number of frequency units between occurrences",
+                    ),
+                ),
+                (
+                    "ends_on",
+                    models.DateField(
+                        blank=True,
+                        help_text="Last date an occurrence may fall on",
+                        null=True,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="occurrence_date",
+            field=models.DateField(
+                blank=True,
+                help_text="Date of the series occurrence this task materializes",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskrecurrence",
+            name="task",
+            field=models.OneToOneField(
+                help_text="Template task the rule repeats",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="recurrence",
+                to="todolist.task",
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="series",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Recurrence rule this task was materialized from (optional)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="occurrences",
+                to="todolist.taskrecurrence",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="task",
+            constraint=models.UniqueConstraint(
+                fields=("series", "occurrence_date"), name="unique_series_occurrence"
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.12 on 2026-10-19 09:02
+
+from django.db import migrations, models
+from django.db.models import CharField, Max, Value
+from django.db.models.functions import Cast, LPad
+import django.db.models.deletion
+
+# Rows updated per statement while backfilling paths
+BATCH_SIZE = 5000
+
+
+def backfill_paths(apps, schema_editor):
+    """Give every existing (root) task a path made of its own id"""
+    Task = apps.get_model("todolist", "Task")
+    db_alias = schema_editor.connection.alias
+    last_id = Task.objects.using(db_alias).aggregate(last=Max("id"))["last"] or 0
+    for start in range(0, last_id, BATCH_SIZE):
+        Task.objects.using(db_alias).filter(
+            id__gt=start, id__lte=start + BATCH_SIZE
+        ).update(path=LPad(Cast("id", CharField()), 10, Value("0")))
+
+
+class Migration(migrations.Migration):
+
+    # Backfill in short transactions instead of locking the whole table
+    atomic = False
+
+    dependencies = [
+        ("todolist", "0004_taskrecurrence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="completed_descendant_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of completed subtasks at any depth",
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="descendant_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Number of subtasks at any depth"
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Task this task is a subtask of (optional)",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="subtasks",
+                to="todolist.task",
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="path",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Zero-padded ids of the task's ancestors and itself, root first",
+                max_length=200,
+            ),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["user", "path"], name="task_user_path_idx"),
+        ),
+    ]
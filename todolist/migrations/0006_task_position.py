@@ -0,0 +1,60 @@
+# Generated by Django 4.2.12 on 2026-10-19 09:06
+
+from django.db import migrations, models
+
+from todolist.positions import key_between
+
+# Rows written per statement while backfilling positions
+BATCH_SIZE = 1000
+
+
+def backfill_positions(apps, schema_editor):
+    """Number every user's tasks in their current newest-first order"""
+    Task = apps.get_model("todolist", "Task")
+    db_alias = schema_editor.connection.alias
+    user_ids = Task.objects.using(db_alias).values_list("user_id", flat=True).distinct()
+    for user_id in user_ids.iterator():
+        tasks = (
+            Task.objects.using(db_alias)
+            .filter(user_id=user_id)
+            .order_by("-created_at", "-id")
+        )
+        batch, key = [], None
+        for task in tasks.only("id").iterator(chunk_size=BATCH_SIZE):
+            key = key_between(key, None)
+            task.position = key
+            batch.append(task)
+            if len(batch) == BATCH_SIZE:
+                Task.objects.using(db_alias).bulk_update(batch, ["position"])
+                batch = []
+        Task.objects.using(db_alias).bulk_update(batch, ["position"])
+
+
+class Migration(migrations.Migration):
+
+    # Backfill in short transactions instead of locking the whole table
+    atomic = False
+
+    dependencies = [
+        ("todolist", "0005_task_hierarchy"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="position",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Fractional index key of the task in its owner's manual order",
+                max_length=255,
+            ),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "position"], name="task_user_position_idx"
+            ),
+        ),
+    ]
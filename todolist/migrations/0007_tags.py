@@ -0,0 +1,100 @@
+# Generated by Django 4.2.12 on 2026-10-19 09:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("todolist", "0006_task_position"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(help_text="Tag name", max_length=50)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="Owner of the tag",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tags",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="TaskTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="todolist.tag",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="todolist.task",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="tags",
+            field=models.ManyToManyField(
+                blank=True,
+                help_text="Tags attached to the task",
+                related_name="tasks",
+                through="todolist.TaskTag",
+                to="todolist.tag",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tasktag",
+            index=models.Index(fields=["tag", "task"], name="tasktag_tag_task_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="tasktag",
+            constraint=models.UniqueConstraint(
+                fields=("task", "tag"), name="unique_task_tag"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="tag",
+            constraint=models.UniqueConstraint(
+                fields=("user", "name"), name="unique_user_tag"
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2.12 on 2026-10-19 09:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Task rows repointed per UPDATE while splitting the shared categories
+BATCH_SIZE = 1000
+
+
+def split_shared_categories(apps, schema_editor):
+    """
+    Give every user a private copy of each shared category they use and
+    repoint their tasks to it in short primary-key ranges, then drop the
+    shared rows nobody references any more.
+    """
+    Task = apps.get_model("todolist", "Task")
+    TaskCategory = apps.get_model("todolist", "TaskCategory")
+    db_alias = schema_editor.connection.alias
+    for category in (
+        TaskCategory.objects.using(db_alias).filter(user__isnull=True).iterator()
+    ):
+        tasks = Task.objects.using(db_alias).filter(category=category)
+        user_ids = tasks.order_by().values_list("user_id", flat=True).distinct()
+        for user_id in list(user_ids):
+            owned, _ = TaskCategory.objects.using(db_alias).get_or_create(
+                user_id=user_id, name=category.name
+            )
+            pks = tasks.filter(user_id=user_id).order_by("pk")
+            last = 0
+            while True:
+                chunk = list(
+                    pks.filter(pk__gt=last).values_list("pk", flat=True)[:BATCH_SIZE]
+                )
+                if not chunk:
+                    break
+                Task.objects.using(db_alias).filter(pk__in=chunk).update(category=owned)
+                last = chunk[-1]
+        if not tasks.exists():
+            category.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("todolist", "0007_tags"),
+    ]
+
+    # Repoint tasks in short transactions instead of locking the whole table
+    atomic = False
+
+    operations = [
+        migrations.AddField(
+            model_name="taskcategory",
+            name="user",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Owner of the category",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="categories",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="taskcategory",
+            name="name",
+            field=models.CharField(help_text="Category name", max_length=50),
+        ),
+        migrations.RunPython(split_shared_categories, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="taskcategory",
+            constraint=models.UniqueConstraint(
+                fields=("user", "name"), name="unique_user_category"
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.12 on 2026-10-19 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todolist", "0008_category_owner"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="taskcategory",
+            name="unique_user_category",
+        ),
+        migrations.AddField(
+            model_name="taskcategory",
+            name="deleted_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="When deletion was requested; the row is hidden from then on",
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="taskcategory",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("user", "name"),
+                name="unique_user_category",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.12 on 2026-10-19 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todolist", "0010_idempotency_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1,
+                editable=False,
+                help_text="Bumped by every API write, so stale updates can be refused",
+            ),
+        ),
+    ]
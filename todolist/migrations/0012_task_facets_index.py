@@ -0,0 +1,20 @@
+# Generated by Django 4.2.12 on 2026-10-19 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todolist", "0011_task_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "category", "priority", "completed", "due_date"],
+                name="task_facets_idx",
+            ),
+        ),
+    ]
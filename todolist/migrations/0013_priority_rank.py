@@ -0,0 +1,194 @@
+# Generated by Django 4.2.12 on 2026-10-19 10:12
+
+from django.db import migrations, models, transaction
+import django.db.models.expressions
+import todolist.models
+from todolist.migrations._operations import AddIndexOnline
+
+# Task rows converted per UPDATE while backfilling the priority ranks
+BATCH_SIZE = 1000
+RANKS = {"low": 1, "medium": 2, "high": 3}
+
+# Until the text column is dropped, the previous release keeps writing it:
+# on PostgreSQL a trigger copies its inserts and priority changes into the
+# rank, so neither slips past the backfill
+CREATE_RANK_TRIGGER = f"""
+CREATE FUNCTION todolist_task_priority_rank() RETURNS trigger AS $$
+BEGIN
+    NEW.priority_rank := CASE NEW.priority
+        {" ".join(f"WHEN '{value}' THEN {rank}" for value, rank in RANKS.items())}
+        ELSE {RANKS["medium"]}
+    END;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER todolist_task_priority_rank
+    BEFORE INSERT OR UPDATE OF priority ON todolist_task
+    FOR EACH ROW EXECUTE FUNCTION todolist_task_priority_rank();
+"""
+DROP_RANK_TRIGGER = """
+DROP TRIGGER IF EXISTS todolist_task_priority_rank ON todolist_task;
+DROP FUNCTION IF EXISTS todolist_task_priority_rank();
+"""
+
+
+def rank_case():
+    return models.Case(
+        *(models.When(priority=value, then=rank) for value, rank in RANKS.items()),
+        default=RANKS["medium"],
+    )
+
+
+def install_rank_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        # Nothing reaches the NOT NULL step without a rank; the AlterField to
+        # PriorityField drops this default again
+        schema_editor.execute(
+            "ALTER TABLE todolist_task ALTER COLUMN priority_rank "
+            f"SET DEFAULT {RANKS['medium']}"
+        )
+        schema_editor.execute(CREATE_RANK_TRIGGER)
+
+
+def drop_rank_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_RANK_TRIGGER)
+
+
+def backfill_ranks(apps, schema_editor):
+    """
+    Copy each task's priority into the new integer column in short primary
+    key ranges, each committed on its own. Rows written meanwhile are taken
+    care of by the trigger on PostgreSQL, and by RemovePriorityLabels
+    elsewhere.
+    """
+    Task = apps.get_model("todolist", "Task")
+    db_alias = schema_editor.connection.alias
+    pending = (
+        Task.objects.using(db_alias).filter(priority_rank__isnull=True).order_by("pk")
+    )
+    last = 0
+    while True:
+        chunk = list(
+            pending.filter(pk__gt=last).values_list("pk", flat=True)[:BATCH_SIZE]
+        )
+        if not chunk:
+            break
+        Task.objects.using(db_alias).filter(pk__in=chunk).update(
+            priority_rank=rank_case()
+        )
+        last = chunk[-1]
+
+
+def restore_labels(apps, schema_editor):
+    Task = apps.get_model("todolist", "Task")
+    db_alias = schema_editor.connection.alias
+    for value, rank in RANKS.items():
+        Task.objects.using(db_alias).filter(priority_rank=rank).update(priority=value)
+
+
+class RemovePriorityLabels(migrations.RemoveField):
+    """
+    RemoveField of the text priority, in one transaction with the end of the
+    copying. On PostgreSQL the trigger stops with the column; elsewhere the
+    rows written since the backfill are converted first.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        db_alias = schema_editor.connection.alias
+        with transaction.atomic(using=db_alias):
+            if schema_editor.connection.vendor == "postgresql":
+                schema_editor.execute(DROP_RANK_TRIGGER)
+            else:
+                Task = from_state.apps.get_model(app_label, "task")
+                Task.objects.using(db_alias).filter(
+                    models.Q(priority_rank__isnull=True)
+                    | ~models.Q(priority_rank=rank_case())
+                ).update(priority_rank=rank_case())
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+
+def due_date_missing():
+    return django.db.models.expressions.ExpressionWrapper(
+        models.Q(("due_date__isnull", True)), output_field=models.BooleanField()
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Store the priority as a severity rank. The new column is added nullable
+    (no table rewrite), kept in step with the text column by a trigger on
+    PostgreSQL, filled in committed batches, then swapped in for the text
+    column; the indexes are built without blocking writes on PostgreSQL.
+    """
+
+    dependencies = [
+        ("todolist", "0012_task_facets_index"),
+    ]
+
+    atomic = False
+
+    operations = [
+        migrations.RemoveIndex(model_name="task", name="task_facets_idx"),
+        migrations.AddField(
+            model_name="task",
+            name="priority_rank",
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(install_rank_trigger, drop_rank_trigger),
+        migrations.RunPython(backfill_ranks, restore_labels),
+        RemovePriorityLabels(model_name="task", name="priority"),
+        migrations.RenameField(
+            model_name="task", old_name="priority_rank", new_name="priority"
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="priority",
+            field=todolist.models.PriorityField(
+                choices=[("low", "Low"), ("medium", "Medium"), ("high", "High")],
+                default="medium",
+                help_text="Priority level for the task",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "category", "priority", "completed", "due_date"],
+                name="task_facets_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="task_user_created_idx"
+            ),
+        ),
+        AddIndexOnline(
+            model_name="task",
+            index=models.Index(
+                models.F("user"),
+                due_date_missing(),
+                models.F("due_date"),
+                models.F("id"),
+                name="task_user_due_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "priority", "created_at", "id"],
+                name="task_user_priority_idx",
+            ),
+        ),
+        AddIndexOnline(
+            model_name="task",
+            index=models.Index(
+                models.F("user"),
+                models.F("completed"),
+                due_date_missing(),
+                models.F("due_date"),
+                models.F("id"),
+                name="task_user_completed_due_idx",
+            ),
+        ),
+    ]
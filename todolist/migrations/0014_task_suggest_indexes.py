@@ -0,0 +1,52 @@
+# Generated by Django 4.2.12 on 2026-10-19 10:08
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+import django.db.models.functions.text
+from todolist.migrations._operations import AddIndexOnline
+
+# Trigram index behind substring suggestions; PostgreSQL only, so it is not
+# part of the model state
+TRIGRAM_INDEX = "task_title_trgm_idx"
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {TRIGRAM_INDEX} "
+        "ON todolist_task USING gin (lower(title) gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {TRIGRAM_INDEX}")
+
+
+class Migration(migrations.Migration):
+    """
+    Indexes for task suggestions: a (user, lower(title)) B-tree for prefix
+    ranges on every backend, plus a pg_trgm GIN index on PostgreSQL for
+    substring matches. Both are built without blocking writes on PostgreSQL.
+    """
+
+    dependencies = [
+        ("todolist", "0013_priority_rank"),
+    ]
+
+    atomic = False
+
+    operations = [
+        TrigramExtension(),
+        AddIndexOnline(
+            model_name="task",
+            index=models.Index(
+                models.F("user"),
+                django.db.models.functions.text.Lower("title"),
+                name="task_user_title_idx",
+            ),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.12 on 2026-10-19 11:21
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todolist", "0016_user_shards"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="idempotencykey",
+            name="claimed_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                help_text="When the request started; unfinished claims lapse",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# LIKE 'pa%' on lower(title) can only use a B-tree under the "C" collation
+# or a pattern opclass; PostgreSQL only, so it is not part of the model state
+PATTERN_INDEX = "task_user_title_pattern_idx"
+
+
+def create_pattern_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {PATTERN_INDEX} "
+        "ON todolist_task (user_id, lower(title) text_pattern_ops)"
+    )
+
+
+def drop_pattern_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {PATTERN_INDEX}")
+
+
+class Migration(migrations.Migration):
+    """
+    Prefix suggestions on PostgreSQL: a (user, lower(title) text_pattern_ops)
+    index, built without blocking writes.
+    """
+
+    dependencies = [
+        ("todolist", "0017_idempotency_claimed_at"),
+    ]
+
+    atomic = False
+
+    operations = [
+        migrations.RunPython(create_pattern_index, drop_pattern_index),
+    ]
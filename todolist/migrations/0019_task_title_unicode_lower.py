@@ -0,0 +1,57 @@
+# Generated by Django 4.2.12 on 2026-10-19 11:54
+
+from django.db import migrations, models
+import django.db.models.functions.text
+import todolist.models
+
+TITLE_INDEX = "task_user_title_idx"
+
+
+def title_index(lower):
+    return models.Index(models.F("user"), lower("title"), name=TITLE_INDEX)
+
+
+def rebuild_title_index(lower):
+    """
+    RunPython code rebuilding the title index over ``lower(title)`` on SQLite.
+    PostgreSQL keeps its index: UnicodeLower is lower() there.
+    """
+
+    def rebuild(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        Task = apps.get_model("todolist", "Task")
+        schema_editor.execute(f"DROP INDEX IF EXISTS {TITLE_INDEX}")
+        schema_editor.add_index(Task, title_index(lower))
+
+    return rebuild
+
+
+class Migration(migrations.Migration):
+    """
+    Index titles on SQLite through unicode_lower(), the app's own function,
+    instead of lower(): the built-in stays untouched for every other query
+    and every other client of the database file.
+    """
+
+    dependencies = [
+        ("todolist", "0018_task_title_pattern_index"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(model_name="task", name=TITLE_INDEX),
+                migrations.AddIndex(
+                    model_name="task",
+                    index=title_index(todolist.models.UnicodeLower),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(
+                    rebuild_title_index(todolist.models.UnicodeLower),
+                    rebuild_title_index(django.db.models.functions.text.Lower),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Operations shared by the app's migrations. The leading underscore keeps the
+# migration loader from taking this module for a migration.
+
+from django.db import migrations
+
+
+class AddIndexOnline(migrations.AddIndex):
+    """AddIndex built with CREATE INDEX CONCURRENTLY on PostgreSQL"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.add_index(model, self.index, concurrently=True)
+        else:
+            schema_editor.add_index(model, self.index)
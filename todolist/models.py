@@ -2,10 +2,36 @@
 import logging
 
 # Django imports
-from django.db import models
+from django.core import exceptions
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models, transaction
+from django.db.models import (
+    DEFERRED,
+    BooleanField,
+    Case,
+    Count,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.lookups import In
+from django.db.models.functions import Coalesce, Concat, Lower, Substr
 from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
+# App imports
+from .activity import record_toggled
+from .caching import bump_data_version
+from .events import task_toggled
+from .positions import key_between, keys_from_start
+from .sharding import current_db, user_shard
+
 
 # Logger configuration
 logger = logging.getLogger(__name__)
@@ -14,10 +40,157 @@ PRIORITY_CHOICES = [
     ("medium", _("Medium")),
     ("high", _("High")),
 ]
+# Stored rank of each priority, in increasing severity
+PRIORITY_RANKS = {value: rank for rank, (value, _) in enumerate(PRIORITY_CHOICES, 1)}
+PRIORITY_LABELS = {rank: value for value, rank in PRIORITY_RANKS.items()}
+# Sort key that puts tasks without a due date after the dated ones
+DUE_DATE_MISSING = ExpressionWrapper(
+    Q(due_date__isnull=True), output_field=BooleanField()
+)
+# Width of one materialized path segment: a zero-padded task id
+PATH_SEGMENT_WIDTH = 10
+MAX_TASK_DEPTH = 20
+# Advisory lock namespace (PostgreSQL) serializing a user's position picks
+POSITION_LOCK_KEY = 0x706F73
+# Columns kept by set-based UPDATEs, which Task.save never writes back
+MAINTAINED_FIELDS = {
+    "path",
+    "position",
+    "descendant_count",
+    "completed_descendant_count",
+}
+FREQUENCY_CHOICES = [
+    ("daily", _("Daily")),
+    ("weekly", _("Weekly")),
+    ("monthly", _("Monthly")),
+]
+
+
+class PriorityField(models.PositiveSmallIntegerField):
+    """
+    Priority stored as its severity rank (low=1, medium=2, high=3), so the
+    database sorts and indexes it by severity. Python code, filters and the
+    API keep using the string values.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        return PRIORITY_LABELS.get(value, value)
+
+    def to_python(self, value):
+        if value is None or value in PRIORITY_RANKS:
+            return value
+        try:
+            return PRIORITY_LABELS[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise exceptions.ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+
+    def get_prep_value(self, value):
+        if isinstance(value, str):
+            value = PRIORITY_RANKS.get(value, value)
+        return super().get_prep_value(value)
+
+    @cached_property
+    def validators(self):
+        # The inherited range validators would compare labels with numbers
+        return [*self.default_validators, *self._validators]
+
+
+@PriorityField.register_lookup
+class PriorityIContains(In):
+    """
+    ``priority__icontains``: the priorities whose name contains the text,
+    so text search keeps matching priority names on the integer column.
+    """
+
+    lookup_name = "icontains"
+
+    def get_prep_lookup(self):
+        text = str(self.rhs).lower()
+        self.rhs = [value for value in PRIORITY_RANKS if text in value]
+        return super().get_prep_lookup()
+
+
+class UnicodeLower(Lower):
+    """
+    LOWER() that folds non-ASCII letters on SQLite too, whose built-in only
+    folds ASCII: there it calls the unicode_lower() function registered on
+    every connection (see suggest.install_unicode_lower).
+    """
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, function="UNICODE_LOWER", **extra_context
+        )
 
 
 class TaskCategory(models.Model):
-    name = models.CharField(max_length=50, unique=True, help_text="Category name")
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="categories",
+        help_text="Owner of the category",
+    )
+    name = models.CharField(max_length=50, help_text="Category name")
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When deletion was requested; the row is hidden from then on",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "name"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="unique_user_category",
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def is_deleted(self):
+        return self.deleted_at is not None
+
+    def mark_deleted(self):
+        """
+        Hide the category right away. Its tasks keep pointing at it until
+        ``purge_category`` clears them, so readers must treat a deleted
+        category as no category.
+        """
+        self.deleted_at = timezone.now()
+        self.save(update_fields=["deleted_at"])
+        logger.info(f"CATEGORY MARKED DELETED: ID={self.id} | Name='{self.name}'")
+
+
+class Tag(models.Model):
+    """
+    Label owned by a single user. Tasks can carry any number of tags.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="tags",
+        help_text="Owner of the tag",
+    )
+    name = models.CharField(max_length=50, help_text="Tag name")
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "name"], name="unique_user_tag"),
+        ]
 
     def __str__(self):
         return self.name
@@ -38,9 +211,12 @@ class Task(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True, help_text="Timestamp when the task was created"
     )
+    # No database constraint: users live in the default database, while the
+    # rows owned by a user may live on another shard (see todolist.sharding)
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_constraint=False,
         related_name="tasks",
         help_text="Owner of the task",
     )
@@ -52,8 +228,7 @@ class Task(models.Model):
         blank=True,
         help_text="Timestamp when the task was marked as completed",
     )
-    priority = models.CharField(
-        max_length=10,
+    priority = PriorityField(
         choices=PRIORITY_CHOICES,
         default="medium",
         help_text="Priority level for the task",
@@ -66,22 +241,627 @@ class Task(models.Model):
         related_name="tasks",
         help_text="Category or tag for the task",
     )
+    series = models.ForeignKey(
+        "TaskRecurrence",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="occurrences",
+        help_text="Recurrence rule this task was materialized from (optional)",
+    )
+    occurrence_date = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Date of the series occurrence this task materializes",
+    )
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="subtasks",
+        help_text="Task this task is a subtask of (optional)",
+    )
+    path = models.CharField(
+        max_length=PATH_SEGMENT_WIDTH * MAX_TASK_DEPTH,
+        blank=True,
+        editable=False,
+        help_text="Zero-padded ids of the task's ancestors and itself, root first",
+    )
+    descendant_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Number of subtasks at any depth"
+    )
+    completed_descendant_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of completed subtasks at any depth",
+    )
+    tags = models.ManyToManyField(
+        Tag,
+        through="TaskTag",
+        blank=True,
+        related_name="tasks",
+        help_text="Tags attached to the task",
+    )
+    position = models.CharField(
+        max_length=255,
+        blank=True,
+        editable=False,
+        help_text="Fractional index key of the task in its owner's manual order",
+    )
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text="Bumped by every API write, so stale updates can be refused",
+    )
 
     class Meta:
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["series", "occurrence_date"], name="unique_series_occurrence"
+            ),
+        ]
+        indexes = [
+            # Serves the reminder scan over pending tasks by due date
+            models.Index(
+                fields=["due_date", "id"],
+                condition=models.Q(completed=False, due_date__isnull=False),
+                name="task_pending_due_idx",
+            ),
+            # Serves subtree lookups, which are range scans on the path
+            models.Index(fields=["user", "path"], name="task_user_path_idx"),
+            # Serves manual ordering and neighbour lookups when moving tasks
+            models.Index(fields=["user", "position"], name="task_user_position_idx"),
+            # Covers the facet counts: rows arrive grouped by category and
+            # every counted column is in the index (index-only scan)
+            models.Index(
+                fields=["user", "category", "priority", "completed", "due_date"],
+                name="task_facets_idx",
+            ),
+            # One index per ordering allowed by TaskOrderingFilter, so sorted
+            # pages are read in index order. Due dates sort NULLs last through
+            # a leading "due_date IS NULL" key, which works on every backend.
+            models.Index(
+                fields=["user", "created_at", "id"], name="task_user_created_idx"
+            ),
+            models.Index(
+                F("user"),
+                DUE_DATE_MISSING,
+                F("due_date"),
+                F("id"),
+                name="task_user_due_idx",
+            ),
+            models.Index(
+                fields=["user", "priority", "created_at", "id"],
+                name="task_user_priority_idx",
+            ),
+            models.Index(
+                F("user"),
+                F("completed"),
+                DUE_DATE_MISSING,
+                F("due_date"),
+                F("id"),
+                name="task_user_completed_due_idx",
+            ),
+            # Serves title suggestions: prefix ranges over the lowercased
+            # title (PostgreSQL also gets a trigram index, see migration 0014)
+            models.Index(F("user"), UnicodeLower("title"), name="task_user_title_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} ({'Completed' if self.completed else 'Pending'})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember loaded values so save() can tell what changed"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def has_changed(self, attname):
+        """Whether ``attname`` differs from the value loaded from the database"""
+        loaded = getattr(self, "_loaded_values", {}).get(attname, DEFERRED)
+        return loaded is not DEFERRED and loaded != getattr(self, attname)
+
+    @property
+    def depth(self):
+        """Number of ancestors above the task"""
+        return max(len(self.path) // PATH_SEGMENT_WIDTH - 1, 0)
+
+    @property
+    def ancestor_ids(self):
+        """Ids of the task's ancestors, root first, read from the path"""
+        ids = []
+        for start in range(0, len(self.path) - PATH_SEGMENT_WIDTH, PATH_SEGMENT_WIDTH):
+            end = start + PATH_SEGMENT_WIDTH
+            ids.append(int(self.path[start:end]))
+        return ids
+
+    @property
+    def completion_percent(self):
+        """Share of completed subtasks, or the task's own state if it has none"""
+        if not self.descendant_count:
+            return 100 if self.completed else 0
+        return round(100 * self.completed_descendant_count / self.descendant_count)
+
+    def subtree(self):
+        """
+        The task and all its descendants. Paths only hold digits, so the
+        subtree is the range [path, path + 1) and needs no recursive queries.
+        """
+        upper = str(int(self.path) + 1).zfill(len(self.path))
+        return Task.objects.filter(
+            user_id=self.user_id, path__gte=self.path, path__lt=upper
+        )
+
+    def build_path(self):
+        """Path of the task under its current parent"""
+        prefix = self.parent.path if self.parent_id else ""
+        return prefix + str(self.pk).zfill(PATH_SEGMENT_WIDTH)
+
+    def update_ancestor_counts(self, descendants=0, completed=0):
+        """Shift the subtask counters of every ancestor in one UPDATE"""
+        if self.ancestor_ids and (descendants or completed):
+            Task.objects.filter(pk__in=self.ancestor_ids).update(
+                descendant_count=F("descendant_count") + descendants,
+                completed_descendant_count=F("completed_descendant_count") + completed,
+            )
+
+    def move_subtree(self):
+        """
+        Rewrite the paths of the task and its descendants after its parent
+        changed, moving its subtree counts from the old ancestors to the new.
+        """
+        size = 1 + self.descendant_count
+        done = int(self.completed) + self.completed_descendant_count
+        old_path, new_path = self.path, self.build_path()
+        self.update_ancestor_counts(descendants=-size, completed=-done)
+        self.subtree().update(
+            path=Concat(Value(new_path), Substr("path", len(old_path) + 1))
+        )
+        self.path = new_path
+        self.update_ancestor_counts(descendants=size, completed=done)
+
     def save(self, *args, **kwargs):
         """Log task creation/update events"""
-        if not self.pk:
-            logger.info(f"TASK CREATED: '{self.title}' by user {self.user}")
-        else:
-            logger.info(f"TASK UPDATED: '{self.title}' (ID: {self.pk})")
-        super().save(*args, **kwargs)
+        with user_shard(self.user_id), transaction.atomic(using=current_db()):
+            if not self.pk:
+                logger.info(f"TASK CREATED: '{self.title}' by user {self.user}")
+                if not self.position:
+                    # New tasks go first, matching the newest-first listing
+                    lock_positions(self.user_id, connections[current_db()])
+                    first = (
+                        Task.objects.filter(user_id=self.user_id)
+                        .order_by("position")
+                        .values_list("position", flat=True)
+                        .first()
+                    )
+                    self.position = key_between(None, first or None)
+                super().save(*args, **kwargs)
+                self.path = self.build_path()
+                Task.objects.filter(pk=self.pk).update(path=self.path)
+                self.update_ancestor_counts(
+                    descendants=1, completed=int(self.completed)
+                )
+            else:
+                logger.info(f"TASK UPDATED: '{self.title}' (ID: {self.pk})")
+                if kwargs.get("update_fields") is None and not self._state.adding:
+                    # Writing back the loaded values would undo concurrent updates
+                    deferred = self.get_deferred_fields()
+                    kwargs["update_fields"] = [
+                        field.name
+                        for field in self._meta.concrete_fields
+                        if not field.primary_key
+                        and field.attname not in deferred
+                        and field.name not in MAINTAINED_FIELDS
+                    ]
+                super().save(*args, **kwargs)
+                if self.has_changed("completed"):
+                    self.update_ancestor_counts(completed=1 if self.completed else -1)
+                if self.has_changed("parent_id"):
+                    self.move_subtree()
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred
+        }
 
     def delete(self, *args, **kwargs):
         """Log task deletion events"""
         logger.warning(f"TASK DELETED: '{self.title}' (ID: {self.pk})")
-        super().delete(*args, **kwargs)
+        with user_shard(self.user_id), transaction.atomic(using=current_db()):
+            self.update_ancestor_counts(
+                descendants=-(1 + self.descendant_count),
+                completed=-(int(self.completed) + self.completed_descendant_count),
+            )
+            return super().delete(*args, **kwargs)
+
+
+def lock_positions(user_id, connection):
+    """
+    Hold the user's position picks until the transaction ends, so concurrent
+    creates never compute the same key. PostgreSQL takes an advisory lock: a
+    row lock would not stop a creator reading the first position before
+    another one's new first row commits. SQLite needs none, it never lets
+    two transactions that both read go on to write.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)",
+                [POSITION_LOCK_KEY, user_id % 2**31],
+            )
+
+
+def toggle_task(task_id, user_id):
+    """
+    Flip a task's completion in one conditional UPDATE, so concurrent
+    toggles all apply instead of overwriting each other. Returns the new
+    ``(completed, completed_at, version)``, or None when the user has no
+    such task.
+    """
+    now = timezone.now()
+    # Hooks registered below must run with the user's shard active
+    with user_shard(user_id) as alias:
+        connection = connections[alias]
+        with transaction.atomic(using=connection.alias):
+            if supports_update_returning(connection):
+                row = _toggle_returning(connection, task_id, user_id, now)
+            else:
+                # Without RETURNING, read the row back inside the same transaction
+                updated = Task.objects.filter(pk=task_id, user_id=user_id).update(
+                    completed=Case(
+                        When(completed=True, then=Value(False)), default=Value(True)
+                    ),
+                    completed_at=Case(
+                        When(completed=True, then=Value(None)),
+                        default=Value(now),
+                        output_field=models.DateTimeField(),
+                    ),
+                    version=F("version") + 1,
+                )
+                row = updated and (
+                    Task.objects.filter(pk=task_id)
+                    .values_list("completed", "version", "path")
+                    .get()
+                )
+            if not row:
+                return None
+            completed, version, path = bool(row[0]), row[1], row[2]
+            Task(pk=task_id, path=path).update_ancestor_counts(
+                completed=1 if completed else -1
+            )
+        completed_at = now if completed else None
+        task_toggled(user_id, task_id, completed, completed_at)
+        record_toggled(task_id, user_id, completed)
+        bump_data_version(user_id)
+        logger.info(f"TASK TOGGLED: ID={task_id} | Completed={completed} | V={version}")
+        return completed, completed_at, version
+
+
+def supports_update_returning(connection):
+    """PostgreSQL and SQLite 3.35+ (MariaDB only returns from INSERT/DELETE)"""
+    return (
+        connection.vendor in ("postgresql", "sqlite")
+        and connection.features.can_return_columns_from_insert
+    )
+
+
+def _toggle_returning(connection, task_id, user_id, now):
+    """``UPDATE ... RETURNING`` (PostgreSQL, SQLite 3.35+): one round trip"""
+    quote = connection.ops.quote_name
+    column = {
+        name: quote(Task._meta.get_field(name).column)
+        for name in ("id", "user", "completed", "completed_at", "version", "path")
+    }
+    sql = (
+        f"UPDATE {quote(Task._meta.db_table)} SET "
+        f"{column['completed']} = NOT {column['completed']}, "
+        f"{column['completed_at']} = "
+        f"CASE WHEN {column['completed']} THEN NULL ELSE %s END, "
+        f"{column['version']} = {column['version']} + 1 "
+        f"WHERE {column['id']} = %s AND {column['user']} = %s "
+        f"RETURNING {column['completed']}, {column['version']}, {column['path']}"
+    )
+    params = [connection.ops.adapt_datetimefield_value(now), task_id, user_id]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()
+
+
+def rebalance_positions(user_id, batch_size=1000):
+    """
+    Give every task of a user a fresh short position key, keeping the order.
+    Runs in one transaction holding the user's task rows, so concurrent moves
+    wait instead of interleaving with the renumbering.
+    """
+    with user_shard(user_id), transaction.atomic(using=current_db()):
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(user_id=user_id)
+            .order_by("position", "id")
+            .only("id", "position")
+        )
+        for task, key in zip(tasks, keys_from_start(len(tasks))):
+            task.position = key
+        Task.objects.bulk_update(tasks, ["position"], batch_size=batch_size)
+    logger.info(f"POSITIONS REBALANCED: User={user_id} | Count={len(tasks)}")
+    return len(tasks)
+
+
+def recount_ancestors(paths, using=None):
+    """
+    Recompute the subtask counters of every ancestor of the tasks at
+    ``paths`` from the rows below it, one aggregate UPDATE per distinct
+    ancestor. For set-based writes, which skip the counter shifts done by
+    save() and delete(); call in their transaction, after they run.
+    """
+    ancestors = {
+        path[:end]
+        for path in paths
+        for end in range(PATH_SEGMENT_WIDTH, len(path), PATH_SEGMENT_WIDTH)
+    }
+    tasks = Task.objects.using(using)
+    # Root first, so concurrent recounts lock the rows in the same order
+    for path in sorted(ancestors):
+        upper = str(int(path) + 1).zfill(len(path))
+        below = (
+            tasks.filter(user_id=OuterRef("user_id"), path__gt=path, path__lt=upper)
+            .order_by()
+            .values("user_id")
+        )
+        total = below.annotate(total=Count("pk")).values("total")
+        done = below.filter(completed=True).annotate(total=Count("pk")).values("total")
+        tasks.filter(pk=int(path[-PATH_SEGMENT_WIDTH:])).update(
+            descendant_count=Coalesce(Subquery(total), 0),
+            completed_descendant_count=Coalesce(Subquery(done), 0),
+        )
+
+
+def purge_category(category_id, batch_size=1000):
+    """
+    Detach the tasks of a deleted category in batches of ``batch_size``, one
+    short UPDATE per batch, then remove the category row. Safe to run again
+    after an interruption. Returns the number of tasks detached.
+    """
+    tasks = Task.objects.filter(category_id=category_id).order_by("pk")
+    cleared = 0
+    while True:
+        pks = list(tasks.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+        cleared += Task.objects.filter(pk__in=pks, category_id=category_id).update(
+            category=None
+        )
+    # Tasks assigned while the batches ran are detached by SET_NULL here
+    TaskCategory.objects.filter(pk=category_id, deleted_at__isnull=False).delete()
+    logger.info(f"CATEGORY PURGED: ID={category_id} | Tasks={cleared}")
+    return cleared
+
+
+class TaskTag(models.Model):
+    """
+    Link between a task and one of its owner's tags. The unique (task, tag)
+    index serves prefetching a page of tasks; the (tag, task) index serves
+    tag filters, which run as EXISTS subqueries.
+    """
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="+")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["task", "tag"], name="unique_task_tag"),
+        ]
+        indexes = [
+            models.Index(fields=["tag", "task"], name="tasktag_tag_task_idx"),
+        ]
+
+
+class TaskRecurrence(models.Model):
+    """
+    Recurrence rule attached to a template task. The template's due date is
+    the first occurrence; later occurrences are generated on demand and only
+    stored as Task rows once they are completed or edited.
+    """
+
+    task = models.OneToOneField(
+        Task,
+        on_delete=models.CASCADE,
+        related_name="recurrence",
+        help_text="Template task the rule repeats",
+    )
+    frequency = models.CharField(
+        max_length=10, choices=FREQUENCY_CHOICES, help_text="Repeat frequency"
+    )
+    interval = models.PositiveSmallIntegerField(
+        default=1, help_text="Number of frequency units between occurrences"
+    )
+    ends_on = models.DateField(
+        null=True, blank=True, help_text="Last date an occurrence may fall on"
+    )
+
+    def __str__(self):
+        return f"Every {self.interval} {self.frequency} for task {self.task_id}"
+
+
+class TaskReminder(models.Model):
+    """
+    Record of a reminder sent for a task, one per task, kind and due date,
+    so the reminder scheduler never notifies twice for the same deadline.
+    """
+
+    DUE_SOON = "due_soon"
+    OVERDUE = "overdue"
+    KIND_CHOICES = [
+        (DUE_SOON, _("Due soon")),
+        (OVERDUE, _("Overdue")),
+    ]
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name="reminders",
+        help_text="Task the reminder was sent for",
+    )
+    kind = models.CharField(
+        max_length=10, choices=KIND_CHOICES, help_text="Kind of reminder sent"
+    )
+    due_date = models.DateField(help_text="Due date the reminder refers to")
+    sent_at = models.DateTimeField(
+        auto_now_add=True, help_text="Timestamp when the reminder was sent"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task", "kind", "due_date"], name="unique_task_reminder"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} reminder for task {self.task_id}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Outcome of a request sent with an ``Idempotency-Key`` header. The row is
+    claimed before the request runs (its unique index doubles as the lock
+    against concurrent duplicates) and filled in with the response once the
+    request succeeds, so retries within the TTL get the same response back.
+    A claim never filled in (its worker died) is only honoured for a lease.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="User who sent the request",
+    )
+    key = models.CharField(max_length=255, help_text="Client supplied key")
+    fingerprint = models.CharField(
+        max_length=64, help_text="SHA-256 of the method, path and body"
+    )
+    status_code = models.PositiveSmallIntegerField(
+        null=True, blank=True, help_text="Stored status, empty while in progress"
+    )
+    response_body = models.JSONField(
+        null=True, blank=True, encoder=DjangoJSONEncoder, help_text="Stored body"
+    )
+    expires_at = models.DateTimeField(help_text="When the key may be reused")
+    claimed_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the request started; unfinished claims lapse",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="unique_user_idempotency_key"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["expires_at"], name="idempotency_expires_idx"),
+        ]
+
+    def __str__(self):
+        return f"Idempotency key {self.key} of user {self.user_id}"
+
+
+class TaskActivity(models.Model):
+    """
+    One change to a task: who made it and a compact diff of the fields it
+    touched, stored as ``{field: [old, new]}``. Rows are only ever inserted
+    (and pruned by age), and they outlive their task, so deletions stay on
+    record.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    TOGGLED = "toggled"
+    DELETED = "deleted"
+    ACTION_CHOICES = [
+        (CREATED, _("Created")),
+        (UPDATED, _("Updated")),
+        (TOGGLED, _("Toggled")),
+        (DELETED, _("Deleted")),
+    ]
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="activity",
+        help_text="Task that changed; may no longer exist",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name="+",
+        help_text="Owner of the task",
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text="User who made the change, empty for background jobs",
+    )
+    action = models.CharField(
+        max_length=10, choices=ACTION_CHOICES, help_text="Kind of change"
+    )
+    changes = models.JSONField(
+        default=dict,
+        encoder=DjangoJSONEncoder,
+        help_text="Changed fields as {field: [old, new]}",
+    )
+    timestamp = models.DateTimeField(
+        default=timezone.now, help_text="When the change was made"
+    )
+
+    class Meta:
+        indexes = [
+            # Serves a task's history, newest first
+            models.Index(fields=["task", "timestamp"], name="activity_task_time_idx"),
+            # Serves the retention prune, oldest first
+            models.Index(fields=["timestamp"], name="activity_time_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_action_display()} task {self.task_id} at {self.timestamp}"
+
+
+class UserShard(models.Model):
+    """
+    Directory entry placing a user's tasks, categories, tags and history on
+    one of the TODOLIST_SHARDS databases. Users are placed by a stable hash
+    of their id the first time they are seen; the entry is what makes them
+    movable afterwards. Kept in the default database.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="shard",
+        help_text="User whose data is placed",
+    )
+    alias = models.CharField(
+        max_length=100, help_text="DATABASES alias holding the user's data"
+    )
+    moving = models.BooleanField(
+        default=False,
+        help_text="Set while the user's data is copied to another shard; "
+        "writes are refused meanwhile",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True, help_text="When the user was last placed or moved"
+    )
+
+    def __str__(self):
+        return f"User {self.user_id} on {self.alias}"
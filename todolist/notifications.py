@@ -0,0 +1,83 @@
+# Standard imports
+import logging
+from dataclasses import dataclass
+
+# Django imports
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.utils.module_loading import import_string
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Messages delivered by LocmemNotificationBackend, mirroring django.core.mail.outbox
+outbox = []
+
+
+@dataclass(frozen=True)
+class Notification:
+    """
+    A message addressed to a single user about a single task.
+    """
+
+    user_id: int
+    recipient: str
+    subject: str
+    body: str
+    task_id: int = None
+
+
+class BaseNotificationBackend:
+    """
+    Base class for notification backends. Subclasses deliver a batch of
+    notifications at once and must raise if the batch could not be sent.
+    """
+
+    def send_messages(self, notifications):
+        raise NotImplementedError(
+            "subclasses of BaseNotificationBackend must implement send_messages()"
+        )
+
+
+class LoggingNotificationBackend(BaseNotificationBackend):
+    """Write notifications to the application log"""
+
+    def send_messages(self, notifications):
+        for notification in notifications:
+            logger.info(
+                f"NOTIFICATION: User={notification.user_id} | "
+                f"Task={notification.task_id} | Subject='{notification.subject}'"
+            )
+        return len(notifications)
+
+
+class LocmemNotificationBackend(BaseNotificationBackend):
+    """Keep notifications in memory so tests can inspect them offline"""
+
+    def send_messages(self, notifications):
+        outbox.extend(notifications)
+        return len(notifications)
+
+
+class EmailNotificationBackend(BaseNotificationBackend):
+    """Deliver notifications through Django's configured email backend"""
+
+    def send_messages(self, notifications):
+        messages = [
+            (n.subject, n.body, None, [n.recipient]) for n in notifications if n.recipient
+        ]
+        return send_mass_mail(messages, fail_silently=False)
+
+
+def get_notification_backend(path=None):
+    """
+    Instantiate the backend named by ``path`` or the
+    TODOLIST_NOTIFICATION_BACKEND setting.
+    """
+    path = path or getattr(
+        settings,
+        "TODOLIST_NOTIFICATION_BACKEND",
+        "todolist.notifications.LoggingNotificationBackend",
+    )
+    return import_string(path)()
@@ -0,0 +1,146 @@
+"""
+Fractional index keys for manual task ordering.
+
+A key is an integer part followed by an optional fraction. The first
+character of the integer part encodes its length, so keys compare correctly
+as plain strings: appending or prepending only increments or decrements the
+integer part, and inserting between two keys extends the fraction. Moving a
+task therefore rewrites exactly one row. Keys only use digits and lowercase
+letters, which sort the same way under every common collation.
+"""
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Heads "0".."h" are negative integers, "i".."z" non-negative ones
+FIRST_POSITIVE_HEAD = "i"
+LAST_NEGATIVE_HEAD = "h"
+INTEGER_ZERO = FIRST_POSITIVE_HEAD + DIGITS[0]
+# Head "0" introduces a 19 character integer part
+SMALLEST_INTEGER = DIGITS[0] * 19
+
+
+def integer_length(head):
+    """Length of the integer part introduced by ``head``"""
+    index = DIGITS.index(head)
+    if head >= FIRST_POSITIVE_HEAD:
+        return index - DIGITS.index(FIRST_POSITIVE_HEAD) + 2
+    return DIGITS.index(LAST_NEGATIVE_HEAD) - index + 2
+
+
+def split_key(key):
+    """Split ``key`` into its integer part and its fraction"""
+    if not key or key[0] not in DIGITS:
+        raise ValueError(f"Invalid position key: {key!r}")
+    length = integer_length(key[0])
+    if len(key) < length:
+        raise ValueError(f"Invalid position key: {key!r}")
+    return key[:length], key[length:]
+
+
+def midpoint(a, b):
+    """
+    Fraction strictly between fractions ``a`` and ``b`` (``b`` may be None for
+    one). Neither input nor output ends with the zero digit.
+    """
+    if b is not None:
+        # Carry over the common prefix, padding ``a`` with zeros
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n:
+            return b[:n] + midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + midpoint(a[1:], None)
+
+
+def increment_integer(integer):
+    """Next integer part, or None past the largest representable one"""
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        value = DIGITS.index(digits[i]) + 1
+        if value < BASE:
+            digits[i] = DIGITS[value]
+            return head + "".join(digits)
+        digits[i] = DIGITS[0]
+    if head == LAST_NEGATIVE_HEAD:
+        return INTEGER_ZERO
+    if head == DIGITS[-1]:
+        return None
+    head = DIGITS[DIGITS.index(head) + 1]
+    if head > FIRST_POSITIVE_HEAD:
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def decrement_integer(integer):
+    """Previous integer part, or None below the smallest representable one"""
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        value = DIGITS.index(digits[i]) - 1
+        if value >= 0:
+            digits[i] = DIGITS[value]
+            return head + "".join(digits)
+        digits[i] = DIGITS[-1]
+    if head == FIRST_POSITIVE_HEAD:
+        return LAST_NEGATIVE_HEAD + DIGITS[-1]
+    if head == DIGITS[0]:
+        return None
+    head = DIGITS[DIGITS.index(head) - 1]
+    if head < LAST_NEGATIVE_HEAD:
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def key_between(a, b):
+    """
+    Key strictly between keys ``a`` and ``b``, where None stands for the
+    start or the end of the list.
+    """
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"Position keys out of order: {a!r} >= {b!r}")
+    if a is None:
+        if b is None:
+            return INTEGER_ZERO
+        integer_b, fraction_b = split_key(b)
+        if integer_b == SMALLEST_INTEGER:
+            return integer_b + midpoint("", fraction_b)
+        if integer_b < b:
+            return integer_b
+        result = decrement_integer(integer_b)
+        if result is None:
+            raise ValueError("Cannot decrement below the smallest position key")
+        return result
+
+    integer_a, fraction_a = split_key(a)
+    if b is None:
+        result = increment_integer(integer_a)
+        return integer_a + midpoint(fraction_a, None) if result is None else result
+
+    integer_b, fraction_b = split_key(b)
+    if integer_a == integer_b:
+        return integer_a + midpoint(fraction_a, fraction_b)
+    result = increment_integer(integer_a)
+    if result is None:
+        raise ValueError("Cannot increment past the largest position key")
+    if result < b:
+        return result
+    return integer_a + midpoint(fraction_a, None)
+
+
+def keys_from_start(count):
+    """``count`` short, evenly spaced keys in ascending order"""
+    keys, key = [], None
+    for _ in range(count):
+        key = key_between(key, None)
+        keys.append(key)
+    return keys
@@ -0,0 +1,190 @@
+# Standard imports
+import cProfile
+import logging
+import os
+import pstats
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Django imports
+from django.conf import settings
+from django.contrib import admin
+from django.http import Http404
+from django.template.response import TemplateResponse
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Ways a request asks to be profiled
+PROFILE_HEADER = "X-Profile"
+PROFILE_PARAM = "profile"
+# Saved profiles are named <milliseconds>-<id>--<endpoint>.prof
+PROFILE_NAME = re.compile(
+    r"^(?P<stamp>\d+)-(?P<id>[0-9a-f]+)--(?P<endpoint>[\w.-]+)\.prof$"
+)
+SORT_KEYS = {"cumulative": 3, "tottime": 2, "calls": 1}
+
+
+def profile_dir():
+    return Path(
+        getattr(settings, "TODOLIST_PROFILE_DIR", settings.BASE_DIR / "profiles")
+    )
+
+
+def endpoint_label(request, view):
+    """e.g. ``GET-TaskViewSet.list``, safe to use in a file name"""
+    action = getattr(view, "action", None) or request.method.lower()
+    return f"{request.method}-{type(view).__name__}.{action}"
+
+
+def save_profile(profiler, endpoint):
+    """Write the stats of ``profiler`` to the profile directory, then prune it"""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = uuid.uuid4().hex[:12]
+    name = f"{int(time.time() * 1000)}-{profile_id}--{endpoint}.prof"
+    profiler.dump_stats(directory / name)
+    prune_profiles(directory)
+    return profile_id
+
+
+def prune_profiles(directory):
+    """
+    Keep at most TODOLIST_PROFILE_MAX_FILES profiles, none older than
+    TODOLIST_PROFILE_MAX_AGE_DAYS; the oldest go first.
+    """
+    max_files = getattr(settings, "TODOLIST_PROFILE_MAX_FILES", 200)
+    max_age = getattr(settings, "TODOLIST_PROFILE_MAX_AGE_DAYS", 7) * 86400
+    cutoff = (time.time() - max_age) * 1000
+    profiles = sorted(saved_profiles(directory), key=lambda item: item["stamp"])
+    for index, item in enumerate(profiles):
+        if index < len(profiles) - max_files or item["stamp"] < cutoff:
+            item["path"].unlink(missing_ok=True)
+
+
+def saved_profiles(directory=None):
+    """The saved profiles, as dicts with their path, stamp, id and endpoint"""
+    directory = directory or profile_dir()
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for entry in os.scandir(directory):
+        match = PROFILE_NAME.match(entry.name)
+        if match:
+            profiles.append(
+                {
+                    "path": Path(entry.path),
+                    "stamp": int(match["stamp"]),
+                    "id": match["id"],
+                    "endpoint": match["endpoint"],
+                    "when": datetime.fromtimestamp(
+                        int(match["stamp"]) / 1000, tz=timezone.utc
+                    ),
+                }
+            )
+    return profiles
+
+
+def top_functions(paths, sort="cumulative", limit=30):
+    """
+    The ``limit`` most expensive functions over the profiles at ``paths``
+    (their stats are added up), with calls and seconds per function.
+    """
+    stats = pstats.Stats(*map(str, paths))
+    column = SORT_KEYS.get(sort, SORT_KEYS["cumulative"])
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][column], reverse=True)
+    return stats.total_tt, [
+        {
+            "function": pstats.func_std_string(function),
+            "calls": calls,
+            "primitive_calls": primitive,
+            "tottime": tottime,
+            "cumtime": cumtime,
+        }
+        for function, (primitive, calls, tottime, cumtime, _) in rows[:limit]
+    ]
+
+
+class ProfiledViewMixin:
+    """
+    Run a view under cProfile when a staff user asks for it with the
+    ``X-Profile: 1`` header or the ``?profile=1`` query parameter. The stats
+    are saved for the admin's profile report and the response names them in
+    its ``X-Profile-Id`` header. Requests that do not ask are not touched.
+    """
+
+    _profiler = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not (
+            request.headers.get(PROFILE_HEADER)
+            or request.query_params.get(PROFILE_PARAM)
+        ):
+            return
+        if not request.user.is_staff:
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is running in this process
+            logger.warning(f"PROFILE SKIPPED: {request.method} {request.path}")
+            return
+        self._profiler = profiler
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._profiler is not None:
+            self._profiler.disable()
+            endpoint = endpoint_label(request, self)
+            profile_id = save_profile(self._profiler, endpoint)
+            self._profiler = None
+            response["X-Profile-Id"] = profile_id
+            logger.info(f"REQUEST PROFILED: {endpoint} | ID={profile_id}")
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def profile_report(request):
+    """
+    Admin page listing the profiled endpoints; pick one (or one profile) to
+    see its most expensive functions.
+    """
+    profiles = sorted(saved_profiles(), key=lambda item: item["stamp"], reverse=True)
+    endpoints = {}
+    for item in profiles:
+        endpoints.setdefault(item["endpoint"], []).append(item)
+
+    sort = request.GET.get("sort", "cumulative")
+    selected = request.GET.get("endpoint")
+    profile_id = request.GET.get("id")
+    chosen = []
+    if profile_id:
+        chosen = [item for item in profiles if item["id"] == profile_id]
+    elif selected:
+        chosen = endpoints.get(selected, [])
+    if (profile_id or selected) and not chosen:
+        raise Http404("No such profile")
+
+    context = {
+        **admin.site.each_context(request),
+        "title": "Request profiles",
+        "endpoints": [
+            {"name": name, "count": len(items), "latest": items[0]}
+            for name, items in sorted(endpoints.items())
+        ],
+        "selected": selected or (chosen[0]["endpoint"] if chosen else None),
+        "profile_id": profile_id,
+        "profiles": endpoints.get(chosen[0]["endpoint"], []) if chosen else [],
+        "sort": sort,
+        "sort_keys": list(SORT_KEYS),
+    }
+    if chosen:
+        context["total_time"], context["functions"] = top_functions(
+            [item["path"] for item in chosen], sort=sort
+        )
+        context["profiled_requests"] = len(chosen)
+    return TemplateResponse(request, "admin/profiles.html", context)
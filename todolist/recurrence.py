@@ -0,0 +1,180 @@
+# Standard imports
+import bisect
+import calendar
+import heapq
+import itertools
+from datetime import date, timedelta
+
+# Django imports
+from django.utils.functional import cached_property
+
+# App imports
+from .models import Task
+
+
+# Upper bound on virtual occurrences generated per series and window
+MAX_OCCURRENCES_PER_WINDOW = 1000
+
+# Fields copied from the template task into each occurrence
+OCCURRENCE_FIELDS = ["title", "description", "user", "category", "priority"]
+
+
+def add_months(anchor, months):
+    """Shift ``anchor`` by ``months``, clamping the day to the month length"""
+    month_index = anchor.month - 1 + months
+    year, month = anchor.year + month_index // 12, month_index % 12 + 1
+    day = min(anchor.day, calendar.monthrange(year, month)[1])
+    return date(year, month, day)
+
+
+def nth_occurrence(rule, anchor, n):
+    """Date of the ``n``-th occurrence after the anchor (the 0-th one)"""
+    if rule.frequency == "monthly":
+        return add_months(anchor, n * rule.interval)
+    step = rule.interval * (7 if rule.frequency == "weekly" else 1)
+    return anchor + timedelta(days=n * step)
+
+
+def first_index_on_or_after(rule, anchor, start):
+    """
+    Smallest occurrence index whose date falls on or after ``start``,
+    computed arithmetically so distant windows cost the same as near ones.
+    """
+    if start <= anchor:
+        return 0
+    if rule.frequency == "monthly":
+        months = (start.year - anchor.year) * 12 + start.month - anchor.month
+        n = max(months // rule.interval, 0)
+    else:
+        step = rule.interval * (7 if rule.frequency == "weekly" else 1)
+        n = -(-(start - anchor).days // step)
+    while nth_occurrence(rule, anchor, n) < start:
+        n += 1
+    return n
+
+
+def occurrence_dates(rule, anchor, start, end):
+    """
+    Yield the occurrence dates of ``rule`` inside ``[start, end]``, excluding
+    the anchor itself, which is the template task. The cost is proportional
+    to the number of dates in the window, not to the length of the series.
+    """
+    if rule.ends_on:
+        end = min(end, rule.ends_on)
+    n = max(first_index_on_or_after(rule, anchor, start), 1)
+    for _ in range(MAX_OCCURRENCES_PER_WINDOW):
+        current = nth_occurrence(rule, anchor, n)
+        if current > end:
+            return
+        yield current
+        n += 1
+
+
+def is_occurrence(rule, anchor, day):
+    """Check that ``day`` is a generated occurrence of ``rule``"""
+    return day in occurrence_dates(rule, anchor, day, day)
+
+
+def build_occurrence(template, day):
+    """
+    Unsaved Task standing for the occurrence of ``template`` on ``day``.
+    It carries a ``virtual_id`` so clients can address it before it exists.
+    """
+    occurrence = Task(
+        **{field: getattr(template, field) for field in OCCURRENCE_FIELDS},
+        series=template.recurrence,
+        occurrence_date=day,
+        due_date=day,
+    )
+    occurrence.created_at = template.created_at
+    occurrence.virtual_tags = list(template.tags.all())
+    occurrence.virtual_id = f"{template.pk}:{day.isoformat()}"
+    return occurrence
+
+
+def virtual_occurrences(templates, start, end):
+    """
+    Unsaved occurrences of every template inside ``[start, end]`` that have
+    not been materialized yet. Runs one query for the materialized dates of
+    all series in the window.
+    """
+    templates = list(templates)
+    materialized = set(
+        Task.objects.filter(
+            series__in=[template.recurrence for template in templates],
+            occurrence_date__range=(start, end),
+        ).values_list("series_id", "occurrence_date")
+    )
+    occurrences = []
+    for template in templates:
+        rule = template.recurrence
+        for day in occurrence_dates(rule, template.due_date, start, end):
+            if (rule.pk, day) not in materialized:
+                occurrences.append(build_occurrence(template, day))
+    return occurrences
+
+
+def materialize_occurrence(template, day):
+    """
+    Store the occurrence of ``template`` on ``day`` as a Task row. The unique
+    (series, occurrence_date) constraint makes concurrent calls converge on
+    the same row.
+    """
+    defaults = {field: getattr(template, field) for field in OCCURRENCE_FIELDS}
+    defaults["due_date"] = day
+    task, created = Task.objects.get_or_create(
+        series=template.recurrence, occurrence_date=day, defaults=defaults
+    )
+    if created:
+        task.tags.set(template.tags.all())
+    return task
+
+
+class TasksWithOccurrences:
+    """
+    Stored tasks merged with virtual occurrences, both in the order of the
+    sort ``key`` (``tasks`` is a queryset already sorted that way). Slicing
+    it, as paginators do, loads only the stored rows the slice may hold.
+    """
+
+    def __init__(self, tasks, occurrences, key):
+        self.tasks = tasks
+        self.key = key
+        self.occurrences = sorted(occurrences, key=key)
+        self.occurrence_keys = [key(occurrence) for occurrence in self.occurrences]
+
+    @cached_property
+    def stored_count(self):
+        return self.tasks.count()
+
+    def __len__(self):
+        return self.stored_count + len(self.occurrences)
+
+    def __iter__(self):
+        return heapq.merge(self.tasks, self.occurrences, key=self.key)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            return self.slice(start, stop)
+        # Range indexing resolves negative indexes and raises IndexError
+        position = range(len(self))[index]
+        return self.slice(position, position + 1)[0]
+
+    def slice(self, start, stop):
+        """Merged tasks ``start`` to ``stop``, reading ``stop - start`` rows or so"""
+        if start >= stop:
+            return []
+        # Each occurrence sorted before a stored row shifts it one place down,
+        # so the row at ``start`` is at most that many rows earlier
+        first = max(min(start - len(self.occurrences), self.stored_count - 1), 0)
+        rows = list(self.tasks[first:stop])
+        occurrences, position = self.occurrences, 0
+        if first and rows:
+            # What sorts before row ``first`` all lies before ``start``
+            skipped = bisect.bisect_left(self.occurrence_keys, self.key(rows[0]))
+            occurrences, position = occurrences[skipped:], first + skipped
+        merged = heapq.merge(rows, occurrences, key=self.key)
+        return list(itertools.islice(merged, start - position, stop - position))
@@ -0,0 +1,111 @@
+# Standard imports
+import logging
+from datetime import timedelta
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django.utils import timezone
+
+# App imports
+from .models import Task, TaskReminder
+from .notifications import Notification, get_notification_backend
+from .sharding import current_db
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+
+def reminder_candidates(today, days_ahead=1, lookback_days=7):
+    """
+    Pending tasks due between ``today - lookback_days`` and
+    ``today + days_ahead`` that have not been reminded for their current due
+    date yet, annotated with the reminder kind and ordered for keyset paging.
+
+    The bounded ``due_date`` range is served by the partial index on pending
+    tasks, so the scan never touches completed or undated rows.
+    """
+    start = today - timedelta(days=lookback_days)
+    end = today + timedelta(days=days_ahead)
+    already_sent = TaskReminder.objects.filter(
+        task=OuterRef("pk"),
+        kind=OuterRef("reminder_kind"),
+        due_date=OuterRef("due_date"),
+    )
+    return (
+        Task.objects.filter(completed=False, due_date__range=(start, end))
+        .annotate(
+            reminder_kind=Case(
+                When(due_date__lt=today, then=Value(TaskReminder.OVERDUE)),
+                default=Value(TaskReminder.DUE_SOON),
+            )
+        )
+        .exclude(Exists(already_sent))
+        .order_by("due_date", "id")
+    )
+
+
+def build_notification(task):
+    """Compose the reminder message for an annotated candidate task"""
+    if task.reminder_kind == TaskReminder.OVERDUE:
+        subject = f"Task overdue: {task.title}"
+        body = f"'{task.title}' was due on {task.due_date} and is still pending."
+    else:
+        subject = f"Task due soon: {task.title}"
+        body = f"'{task.title}' is due on {task.due_date}."
+    return Notification(
+        user_id=task.user_id,
+        recipient=task.user.email,
+        subject=subject,
+        body=body,
+        task_id=task.id,
+    )
+
+
+def send_due_reminders(
+    today=None, days_ahead=1, lookback_days=7, batch_size=500, backend=None
+):
+    """
+    Send one reminder per task and due date, batch by batch.
+
+    Each batch records its reminders and hands the notifications to the
+    backend inside one transaction, so a failed delivery rolls the records
+    back and the batch is retried on the next tick. Returns the number of
+    reminders sent.
+    """
+    today = today or timezone.localdate()
+    backend = backend or get_notification_backend()
+    candidates = reminder_candidates(today, days_ahead, lookback_days)
+
+    sent = 0
+    last = None
+    while True:
+        page = candidates
+        if last is not None:
+            page = page.filter(
+                Q(due_date__gt=last.due_date) | Q(due_date=last.due_date, id__gt=last.id)
+            )
+        with transaction.atomic(using=current_db()):
+            batch = list(
+                page.select_for_update(skip_locked=True, of=("self",))[:batch_size]
+            )
+            if not batch:
+                break
+            # Users may live in another database than their tasks: load the
+            # recipients of the batch with one query instead of a join
+            users = User.objects.in_bulk({task.user_id for task in batch})
+            for task in batch:
+                task.user = users[task.user_id]
+            TaskReminder.objects.bulk_create(
+                [
+                    TaskReminder(task=task, kind=task.reminder_kind, due_date=task.due_date)
+                    for task in batch
+                ]
+            )
+            backend.send_messages([build_notification(task) for task in batch])
+        sent += len(batch)
+        last = batch[-1]
+        logger.info(f"REMINDERS_SENT: Batch={len(batch)} | Total={sent}")
+    return sent
@@ -0,0 +1,511 @@
+# Standard imports
+import bisect
+import io
+import itertools
+import logging
+import math
+import multiprocessing
+import random
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+# Django imports
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+# App imports
+from .models import PATH_SEGMENT_WIDTH, PRIORITY_RANKS, Task, TaskCategory, UserShard
+from .positions import keys_from_start
+from .sharding import ID_BLOCK_SIZE, hashed_shard, sharding_enabled
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Distributions of the generated data
+PRIORITY_WEIGHTS = {"low": 30, "medium": 50, "high": 20}
+CATEGORY_NAMES = [
+    "Work",
+    "Personal",
+    "Shopping",
+    "Health",
+    "Finance",
+    "Home",
+    "Errands",
+    "Learning",
+    "Travel",
+    "Family",
+]
+CATEGORIES_PER_USER = (2, 6)
+UNCATEGORIZED_SHARE = 0.15
+DUE_DATE_SHARE = 0.55
+# Days from creation to due date, and to completion: log-normal / exponential
+DUE_DAYS_MEDIAN, DUE_DAYS_SIGMA = 7, 0.9
+COMPLETION_DAYS_MEAN = 3
+# Completion chance grows with age: from the first value (just created) to
+# the sum of both (created ``days`` ago)
+COMPLETED_SHARE = (0.15, 0.7)
+EMPTY_DESCRIPTION_SHARE = 0.35
+DESCRIPTION_CHARS_MEDIAN, DESCRIPTION_CHARS_SIGMA = 80, 1.0
+DESCRIPTION_MAX_CHARS = 2000
+
+VERBS = [
+    "Call",
+    "Email",
+    "Review",
+    "Write",
+    "Plan",
+    "Book",
+    "Pay",
+    "Fix",
+    "Clean",
+    "Buy",
+    "Prepare",
+    "Update",
+    "Schedule",
+    "Finish",
+    "Read",
+    "Organize",
+    "Renew",
+    "Send",
+    "Check",
+    "Draft",
+]
+OBJECTS = [
+    "the report",
+    "the dentist",
+    "groceries",
+    "the rent",
+    "the quarterly budget",
+    "flight tickets",
+    "the kitchen sink",
+    "birthday gift",
+    "meeting notes",
+    "project proposal",
+    "car insurance",
+    "the garden",
+    "tax documents",
+    "the team",
+    "the presentation",
+    "library books",
+    "passport",
+    "weekly groceries",
+    "the newsletter",
+    "client feedback",
+    "the backlog",
+    "gym membership",
+    "the landlord",
+    "holiday plans",
+    "code review",
+]
+TITLES = [f"{verb} {thing}" for verb in VERBS for thing in OBJECTS]
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat duis aute "
+    "irure in reprehenderit voluptate velit esse cillum fugiat nulla pariatur "
+    "excepteur sint occaecat cupidatat non proident sunt culpa qui officia deserunt "
+    "mollit anim id est laborum"
+).split()
+# Descriptions are slices of one long text, starting at a word
+_words = random.Random(0).choices(WORDS, k=2 * DESCRIPTION_MAX_CHARS)
+TEXT = " ".join(_words).capitalize()
+TEXT_STARTS = [0] + [index + 1 for index, char in enumerate(TEXT) if char == " "][
+    : len(_words) // 2
+]
+
+TASK_FIELDS = [
+    "id",
+    "user",
+    "title",
+    "description",
+    "completed",
+    "created_at",
+    "completed_at",
+    "due_date",
+    "priority",
+    "category",
+    "path",
+    "position",
+    "descendant_count",
+    "completed_descendant_count",
+    "version",
+]
+CATEGORY_FIELDS = ["id", "user", "name"]
+
+# Escapes of PostgreSQL's COPY text format
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+COPY_SPECIAL = re.compile(r"[\\\t\n\r]")
+
+
+class SeedError(Exception):
+    pass
+
+
+def cumulative(weights):
+    return list(itertools.accumulate(weights))
+
+
+PRIORITY_VALUES = [PRIORITY_RANKS[name] for name in PRIORITY_WEIGHTS]
+PRIORITY_TOTALS = cumulative(PRIORITY_WEIGHTS.values())
+# A user's first categories get most of the tasks (weights 1, 1/2, 1/3...)
+CATEGORY_TOTALS = [
+    cumulative(1 / (rank + 1) for rank in range(count))
+    for count in range(CATEGORIES_PER_USER[1] + 1)
+]
+
+
+def pick(rng, values, totals):
+    """Weighted choice, with the cumulative weights computed beforehand"""
+    return values[bisect.bisect(totals, rng.random() * totals[-1])]
+
+
+def user_rng(seed, index, stream):
+    """
+    Generator of one user's ``stream`` ("categories", "tasks"). It only
+    depends on the seed and the user's index, so the data comes out the same
+    however users are split into batches and workers.
+    """
+    return random.Random(f"{seed}:{index}:{stream}")
+
+
+def day_end(until):
+    """Midnight UTC after ``until``: no generated timestamp is later"""
+    next_day = until + timedelta(days=1)
+    return datetime.combine(next_day, datetime.min.time(), tzinfo=timezone.utc)
+
+
+def generate_categories(seed, index):
+    rng = user_rng(seed, index, "categories")
+    return rng.sample(CATEGORY_NAMES, rng.randint(*CATEGORIES_PER_USER))
+
+
+def generate_tasks(seed, index, count, category_ids, until, days):
+    """
+    ``count`` tasks of the user at ``index``, oldest first, as dicts of
+    TASK_FIELDS without ids, paths and positions.
+    """
+    rng = user_rng(seed, index, "tasks")
+    end = day_end(until)
+    span = days * 86400
+    category_totals = CATEGORY_TOTALS[len(category_ids)]
+    tasks = []
+    for _ in range(count):
+        # Recent tasks are more common than old ones
+        age = rng.triangular(0, span, 0)
+        created_at = end - timedelta(seconds=int(age))
+        completed = rng.random() < COMPLETED_SHARE[0] + COMPLETED_SHARE[1] * age / span
+        completed_at = None
+        if completed:
+            delay = rng.expovariate(1 / (COMPLETION_DAYS_MEAN * 86400))
+            completed_at = min(created_at + timedelta(seconds=int(delay)), end)
+        due_date = None
+        if rng.random() < DUE_DATE_SHARE:
+            due_days = rng.lognormvariate(math.log(DUE_DAYS_MEDIAN), DUE_DAYS_SIGMA)
+            due_date = created_at.date() + timedelta(days=round(due_days))
+        description = ""
+        if rng.random() >= EMPTY_DESCRIPTION_SHARE:
+            length = rng.lognormvariate(
+                math.log(DESCRIPTION_CHARS_MEDIAN), DESCRIPTION_CHARS_SIGMA
+            )
+            start = rng.choice(TEXT_STARTS)
+            stop = start + min(int(length), DESCRIPTION_MAX_CHARS)
+            description = TEXT[start:stop].strip() + "."
+        category = None
+        if category_ids and rng.random() >= UNCATEGORIZED_SHARE:
+            category = pick(rng, category_ids, category_totals)
+        tasks.append(
+            {
+                "title": rng.choice(TITLES),
+                "description": description,
+                "completed": completed,
+                "created_at": created_at,
+                "completed_at": completed_at,
+                "due_date": due_date,
+                "priority": pick(rng, PRIORITY_VALUES, PRIORITY_TOTALS),
+                "category": category,
+            }
+        )
+    tasks.sort(key=lambda task: task["created_at"])
+    return tasks
+
+
+def task_rows(seed, users, tasks_per_user, first_id, until, days):
+    """
+    Rows (tuples in TASK_FIELDS order) of the tasks of ``users``, a list of
+    (index, user id, category ids). Ids follow creation order; positions put
+    the newest task first, like tasks created through the API.
+    """
+    positions = keys_from_start(tasks_per_user)[::-1]
+    task_id = first_id
+    for index, user_id, category_ids in users:
+        tasks = generate_tasks(seed, index, tasks_per_user, category_ids, until, days)
+        for task, position in zip(tasks, positions):
+            yield (
+                task_id,
+                user_id,
+                task["title"],
+                task["description"],
+                task["completed"],
+                task["created_at"],
+                task["completed_at"],
+                task["due_date"],
+                task["priority"],
+                task["category"],
+                str(task_id).zfill(PATH_SEGMENT_WIDTH),
+                position,
+                0,
+                0,
+                1,
+            )
+            task_id += 1
+
+
+def copy_formatter(field):
+    """Function writing values of ``field`` in PostgreSQL's COPY text format"""
+    if isinstance(field, models.BooleanField):
+        return lambda value: "t" if value else "f"
+    if isinstance(field, (models.CharField, models.TextField)):
+        # Searching is much cheaper than translating, and escapes are rare
+        return lambda value: (
+            value.translate(COPY_ESCAPES) if COPY_SPECIAL.search(value) else value
+        )
+    if isinstance(field, models.DateField):
+        # DateTimeField too
+        return lambda value: "\\N" if value is None else value.isoformat()
+    return lambda value: "\\N" if value is None else str(value)
+
+
+def write_rows(connection, model, fields, rows, batch_size):
+    """
+    Insert ``rows`` into ``model``'s table with their ids as given, in
+    batches: with COPY on PostgreSQL, elsewhere with executemany INSERTs.
+    ``auto_now_add`` values are kept, unlike with ``bulk_create``.
+    """
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = [model._meta.get_field(name) for name in fields]
+    names = ", ".join(quote(field.column) for field in columns)
+    written = 0
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            sql = f"COPY {table} ({names}) FROM STDIN"
+            formatters = [copy_formatter(field) for field in columns]
+            for batch in batched(rows, batch_size):
+                buffer = io.StringIO()
+                for row in batch:
+                    buffer.write(
+                        "\t".join([fmt(value) for fmt, value in zip(formatters, row)])
+                    )
+                    buffer.write("\n")
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+                written += len(batch)
+            return written
+        adapters = [database_adapter(connection, field) for field in columns]
+        placeholders = ", ".join(["%s"] * len(columns))
+        sql = f"INSERT INTO {table} ({names}) VALUES ({placeholders})"
+        for batch in batched(rows, batch_size):
+            cursor.executemany(
+                sql,
+                [
+                    [adapt(value) for adapt, value in zip(adapters, row)]
+                    for row in batch
+                ],
+            )
+            written += len(batch)
+    return written
+
+
+def database_adapter(connection, field):
+    if isinstance(field, models.DateTimeField):
+        return connection.ops.adapt_datetimefield_value
+    if isinstance(field, models.DateField):
+        return connection.ops.adapt_datefield_value
+    return lambda value: value
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, size)):
+        yield batch
+
+
+def reserve_ids(connection, model, count):
+    """
+    Take ``count`` consecutive primary keys of ``model`` from its counter, so
+    rows inserted later through the ORM never collide with the seeded ones.
+    Returns the first id.
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+            sequence = cursor.fetchone()[0]
+            cursor.execute(
+                "SELECT setval(%s, nextval(%s) + %s - 1) - %s + 1",
+                [sequence, sequence, count, count],
+            )
+            return cursor.fetchone()[0]
+        quote = connection.ops.quote_name
+        cursor.execute(
+            f"SELECT MAX({quote(model._meta.pk.column)}) FROM {quote(table)}"
+        )
+        last = cursor.fetchone()[0] or 0
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = %s", [table])
+            row = cursor.fetchone()
+            last = max(last, row[0] if row else 0)
+        # Empty tables of a shard start at the shard's block (see reserve_id_block)
+        last = max(
+            last, list(settings.DATABASES).index(connection.alias) * ID_BLOCK_SIZE
+        )
+        # SQLite and MySQL move their counters past the ids inserted
+        return last + 1
+
+
+def create_users(count, prefix, password, joined, batch_size):
+    """
+    ``count`` users named ``<prefix><index>``, all with ``password``: it is
+    hashed once, since hashing is deliberately slow. Returns their ids in
+    index order.
+    """
+    width = len(str(count - 1))
+    names = [f"{prefix}{index:0{width}d}" for index in range(count)]
+    if User.objects.filter(username__in=names[:1] + names[-1:]).exists():
+        raise SeedError(f"Users named {prefix}* exist already; pick another prefix")
+    hashed = make_password(password)
+    for batch in batched(names, batch_size):
+        User.objects.bulk_create(
+            [
+                User(
+                    username=name,
+                    email=f"{name}@example.com",
+                    password=hashed,
+                    date_joined=joined,
+                )
+                for name in batch
+            ],
+            batch_size=batch_size,
+        )
+    ids = dict(
+        User.objects.filter(username__startswith=prefix).values_list("username", "id")
+    )
+    return [ids[name] for name in names]
+
+
+def place_users(user_ids, batch_size):
+    """Shard of each user, written to the directory; "default" unsharded"""
+    if not sharding_enabled():
+        return {user_id: DEFAULT_DB_ALIAS for user_id in user_ids}
+    aliases = {user_id: hashed_shard(user_id) for user_id in user_ids}
+    UserShard.objects.bulk_create(
+        [UserShard(user_id=user_id, alias=alias) for user_id, alias in aliases.items()],
+        batch_size=batch_size,
+    )
+    return aliases
+
+
+def seed_categories(alias, seed, users, batch_size):
+    """
+    Categories of ``users``, a list of (index, user id) on ``alias``. Returns
+    (index, user id, category ids) per user.
+    """
+    names = [generate_categories(seed, index) for index, _ in users]
+    connection = connections[alias]
+    with transaction.atomic(using=alias):
+        category_id = reserve_ids(connection, TaskCategory, sum(map(len, names)))
+        placed, rows = [], []
+        for (index, user_id), user_names in zip(users, names):
+            ids = list(range(category_id, category_id + len(user_names)))
+            category_id += len(user_names)
+            placed.append((index, user_id, ids))
+            rows += [(id_, user_id, name) for id_, name in zip(ids, user_names)]
+        write_rows(connection, TaskCategory, CATEGORY_FIELDS, rows, batch_size)
+    return placed
+
+
+def seed_task_batch(job):
+    """
+    Write the tasks of one batch of users in one transaction. Runs in the
+    worker processes, each with its own database connection.
+    """
+    alias, seed, users, tasks_per_user, first_id, until, days, batch_size = job
+    rows = task_rows(seed, users, tasks_per_user, first_id, until, days)
+    connection = connections[alias]
+    with transaction.atomic(using=alias):
+        return write_rows(connection, Task, TASK_FIELDS, rows, batch_size)
+
+
+def seed_data(
+    users,
+    tasks_per_user,
+    seed=0,
+    prefix="seed",
+    password="seed-pass",
+    until=None,
+    days=365,
+    batch_size=10000,
+    workers=1,
+    progress=None,
+):
+    """
+    Create ``users`` users with ``tasks_per_user`` tasks each, plus their
+    categories. The same seed, ``until`` date and sizes give the same data.
+    Task batches of about ``batch_size`` rows run in ``workers`` processes
+    (on SQLite, which allows one writer at a time, in this one). Returns the
+    counts of created users, categories and tasks.
+    """
+    until = until or datetime.now(timezone.utc).date()
+    started = time.monotonic()
+    joined = day_end(until) - timedelta(days=days)
+    user_ids = create_users(users, prefix, password, joined, batch_size)
+    placement = place_users(user_ids, batch_size)
+    by_alias = {}
+    for index, user_id in enumerate(user_ids):
+        by_alias.setdefault(placement[user_id], []).append((index, user_id))
+
+    jobs, categories = [], 0
+    users_per_batch = max(1, batch_size // max(tasks_per_user, 1))
+    for alias, alias_users in by_alias.items():
+        placed = seed_categories(alias, seed, alias_users, batch_size)
+        categories += sum(len(ids) for _, _, ids in placed)
+        if not tasks_per_user:
+            continue
+        with transaction.atomic(using=alias):
+            task_id = reserve_ids(
+                connections[alias], Task, len(placed) * tasks_per_user
+            )
+        for batch in batched(placed, users_per_batch):
+            jobs.append(
+                (alias, seed, batch, tasks_per_user, task_id, until, days, batch_size)
+            )
+            task_id += len(batch) * tasks_per_user
+
+    if any(connections[alias].vendor == "sqlite" for alias in by_alias):
+        workers = 1
+    tasks = 0
+    if workers > 1:
+        # Forked workers must not share this process's connections
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        with context.Pool(workers) as pool:
+            for written in pool.imap_unordered(seed_task_batch, jobs):
+                tasks += written
+                if progress:
+                    progress(tasks, users * tasks_per_user)
+    else:
+        for job in jobs:
+            tasks += seed_task_batch(job)
+            if progress:
+                progress(tasks, users * tasks_per_user)
+
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"DATA SEEDED: Users={users} | Categories={categories} | Tasks={tasks} "
+        f"| Seconds={elapsed:.1f}"
+    )
+    return {"users": users, "categories": categories, "tasks": tasks}
@@ -1,15 +1,91 @@
+# Django imports
+from django.conf import settings
+
 # External imports
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 
 # App imports
-from .models import Task, TaskCategory, PRIORITY_CHOICES
+from .models import (
+    Tag,
+    Task,
+    TaskActivity,
+    TaskCategory,
+    TaskRecurrence,
+    MAX_TASK_DEPTH,
+    PRIORITY_CHOICES,
+)
+
+
+class TagNamesField(serializers.ListField):
+    """
+    Tags as a list of names. Reads go through ``tags.all()`` so a prefetch
+    on the queryset serves a whole page of tasks with one query.
+    """
+
+    child = serializers.CharField(max_length=50)
+
+    def get_attribute(self, instance):
+        if instance.pk is None:
+            # Virtual occurrences of recurring tasks carry their template's tags
+            return getattr(instance, "virtual_tags", [])
+        return instance.tags.all()
+
+    def to_representation(self, data):
+        return [tag.name for tag in data]
+
+
+class SparseFieldsetMixin:
+    """
+    Let read requests pick the fields they get back with ``?fields=a,b`` or
+    drop some with ``?exclude=c``. Unknown names are ignored; writes always
+    use every field.
+    """
+
+    @classmethod
+    def selected_fields(cls, request):
+        """Names of the fields the request asks for, in declaration order"""
+        available = cls.Meta.fields
+        params = getattr(request, "query_params", None)
+        if params is None or request.method not in SAFE_METHODS:
+            return list(available)
+        fields = {name for name in params.get("fields", "").split(",") if name}
+        exclude = {name for name in params.get("exclude", "").split(",") if name}
+        return [
+            name
+            for name in available
+            if (not fields or name in fields) and name not in exclude
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None:
+            return
+        selected = set(self.selected_fields(request))
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Task model. Handles validation and data transformation.
     """
 
+    # Model columns read by each field, so views can load only those
+    FIELD_COLUMNS = {
+        "user": ["user"],
+        "category": ["category", "category__name", "category__deleted_at"],
+        "parent": ["parent"],
+        "completion_percent": [
+            "completed",
+            "descendant_count",
+            "completed_descendant_count",
+        ],
+        "tags": [],
+    }
+
     category = serializers.PrimaryKeyRelatedField(
         queryset=TaskCategory.objects.all(),
         allow_null=True,
@@ -30,6 +106,25 @@ class TaskSerializer(serializers.ModelSerializer):
         read_only=True,
         help_text="Timestamp when the task was marked as completed",
     )
+    parent = serializers.PrimaryKeyRelatedField(
+        queryset=Task.objects.all(),
+        allow_null=True,
+        required=False,
+        help_text="Task this task is a subtask of",
+    )
+    tags = TagNamesField(
+        required=False,
+        help_text="Names of the owner's tags; unknown names are created",
+    )
+    completion_percent = serializers.IntegerField(
+        read_only=True,
+        help_text="Share of completed subtasks at any depth",
+    )
+    version = serializers.IntegerField(
+        min_value=1,
+        required=False,
+        help_text="Version last read; updates of a newer version are refused",
+    )
 
     class Meta:
         model = Task
@@ -44,8 +139,25 @@ class TaskSerializer(serializers.ModelSerializer):
             "priority",
             "due_date",
             "completed_at",
+            "occurrence_date",
+            "parent",
+            "descendant_count",
+            "completed_descendant_count",
+            "completion_percent",
+            "position",
+            "tags",
+            "version",
+        ]
+        read_only_fields = [
+            "id",
+            "created_at",
+            "user",
+            "completed_at",
+            "occurrence_date",
+            "descendant_count",
+            "completed_descendant_count",
+            "position",
         ]
-        read_only_fields = ["id", "created_at", "user", "completed_at"]
         extra_kwargs = {
             "description": {"required": False},
             "completed": {"read_only": True},
@@ -54,21 +166,96 @@ class TaskSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         """Transform datetime to string representation"""
         representation = super().to_representation(instance)
-        representation["created_at"] = instance.created_at.strftime("%Y-%m-%d %H:%M:%S")
-        if instance.completed_at:
+        if "id" in representation and getattr(instance, "virtual_id", None):
+            # Occurrences not stored yet are addressed as "<template id>:<date>"
+            representation["id"] = instance.virtual_id
+        if "created_at" in representation:
+            representation["created_at"] = instance.created_at.strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+        if representation.get("completed_at"):
             representation["completed_at"] = instance.completed_at.strftime(
                 "%Y-%m-%d %H:%M:%S"
             )
-        if instance.category:
+        if "category" not in representation:
+            return representation
+        if instance.category and not instance.category.is_deleted:
             representation["category"] = instance.category.name
+        else:
+            # Tasks of a category being deleted are detached in the background
+            representation["category"] = None
         return representation
 
+    @classmethod
+    def columns_for(cls, fields):
+        """Model columns needed to serialize ``fields``"""
+        columns = ["id"]
+        for name in fields:
+            columns += cls.FIELD_COLUMNS.get(name, [name])
+        return list(dict.fromkeys(columns))
+
+    def create(self, validated_data):
+        """Create the task, then attach its tags"""
+        tags = validated_data.pop("tags", None)
+        validated_data.pop("version", None)
+        task = super().create(validated_data)
+        if tags is not None:
+            self.save_tags(task, tags)
+        return task
+
+    def update(self, instance, validated_data):
+        """Update the task, replacing its tags when they are given"""
+        tags = validated_data.pop("tags", None)
+        task = super().update(instance, validated_data)
+        if tags is not None:
+            self.save_tags(task, tags)
+        return task
+
+    @staticmethod
+    def save_tags(task, names):
+        """Replace the task's tags, creating the owner's missing tags in bulk"""
+        names = list(dict.fromkeys(name.strip() for name in names if name.strip()))
+        user_tags = Tag.objects.filter(user_id=task.user_id, name__in=names)
+        existing = {tag.name for tag in user_tags}
+        missing = [
+            Tag(user_id=task.user_id, name=n) for n in names if n not in existing
+        ]
+        if missing:
+            Tag.objects.bulk_create(missing, ignore_conflicts=True)
+        task.tags.set(user_tags.all())
+
     def validate_description(self, value):
         """Ensure description is not empty"""
         if value is not None and not value.strip():
             raise serializers.ValidationError("Description cannot be empty")
         return value
 
+    def validate_category(self, value):
+        """Ensure the category is one of the requesting user's live categories"""
+        request = self.context.get("request")
+        if value is None:
+            return value
+        if value.is_deleted or (request and value.user_id != request.user.id):
+            raise serializers.ValidationError("Category not found")
+        return value
+
+    def validate_parent(self, value):
+        """Ensure the parent is an own task and the hierarchy stays a tree"""
+        if value is None:
+            return value
+        request = self.context.get("request")
+        if request and value.user_id != request.user.id:
+            raise serializers.ValidationError("Parent task not found")
+        if value.depth + 1 >= MAX_TASK_DEPTH:
+            raise serializers.ValidationError(
+                f"Subtasks cannot be nested more than {MAX_TASK_DEPTH} levels deep"
+            )
+        if self.instance and value.path.startswith(self.instance.path):
+            raise serializers.ValidationError(
+                "A task cannot be moved under itself or its subtasks"
+            )
+        return value
+
     def validate(self, data):
         """
         Validate user authentication and request context
@@ -87,6 +274,88 @@ class TaskSerializer(serializers.ModelSerializer):
 
 
 class TaskCategorySerializer(serializers.ModelSerializer):
+    task_count = serializers.IntegerField(
+        read_only=True,
+        help_text="Number of the user's tasks in the category",
+    )
+
     class Meta:
         model = TaskCategory
+        fields = ["id", "name", "task_count"]
+
+    def validate_name(self, value):
+        """Ensure the name is unique among the user's categories"""
+        request = self.context.get("request")
+        categories = TaskCategory.objects.filter(
+            user=request.user, name=value, deleted_at__isnull=True
+        )
+        if self.instance:
+            categories = categories.exclude(pk=self.instance.pk)
+        if categories.exists():
+            raise serializers.ValidationError(
+                "You already have a category with this name"
+            )
+        return value
+
+
+class TaskRecurrenceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskRecurrence
+        fields = ["frequency", "interval", "ends_on"]
+        extra_kwargs = {"interval": {"min_value": 1}}
+
+
+class TaskActivitySerializer(serializers.ModelSerializer):
+    actor = serializers.CharField(source="actor.username", default=None)
+
+    class Meta:
+        model = TaskActivity
+        fields = ["id", "action", "changes", "actor", "timestamp"]
+        read_only_fields = fields
+
+
+class TagSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Tag
         fields = ["id", "name"]
+
+    def validate_name(self, value):
+        """Ensure the name is unique among the user's tags"""
+        request = self.context.get("request")
+        tags = Tag.objects.filter(user=request.user, name=value)
+        if self.instance:
+            tags = tags.exclude(pk=self.instance.pk)
+        if tags.exists():
+            raise serializers.ValidationError("You already have a tag with this name")
+        return value
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"]
+    )
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False, allow_null=True)
+
+    def validate_path(self, value):
+        """Only API endpoints can be batched"""
+        if not value.startswith("/api/"):
+            raise serializers.ValidationError("Path must start with /api/")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchRequestSerializer(many=True, allow_empty=False)
+    parallel = serializers.BooleanField(
+        default=False,
+        help_text="Run the sub-requests concurrently when all of them are reads",
+    )
+
+    def validate_requests(self, value):
+        """Cap the number of sub-requests per batch"""
+        limit = getattr(settings, "BATCH_MAX_REQUESTS", 20)
+        if len(value) > limit:
+            raise serializers.ValidationError(
+                f"A batch cannot contain more than {limit} requests"
+            )
+        return value
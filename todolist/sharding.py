@@ -0,0 +1,456 @@
+# Standard imports
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Django imports
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+# External imports
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+# Models whose rows live on their owner's shard; everything else (users,
+# sessions, the shard directory, idempotency keys) stays in "default"
+SHARDED_MODELS = {
+    "task",
+    "taskcategory",
+    "tag",
+    "tasktag",
+    "taskrecurrence",
+    "taskreminder",
+    "taskactivity",
+}
+# Each DATABASES alias hands out primary keys from its own block, so rows
+# keep their ids (and the URLs that use them) when a user changes shard
+ID_BLOCK_SIZE = 10**12
+
+# (alias, user id) the current request or job is routed to
+_active = ContextVar("todolist_shard", default=None)
+
+
+class ShardMoveConflict(Exception):
+    """The user's rows changed on the old shard while they were being moved"""
+
+
+class ShardMoving(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Your tasks are being moved. Retry in a few seconds."
+    default_code = "shard_moving"
+
+
+def shard_aliases():
+    """DATABASES aliases holding user data, from the TODOLIST_SHARDS setting"""
+    return list(getattr(settings, "TODOLIST_SHARDS", [DEFAULT_DB_ALIAS]))
+
+
+def sharding_enabled():
+    return shard_aliases() != [DEFAULT_DB_ALIAS]
+
+
+def is_sharded(model):
+    return (
+        model._meta.app_label == "todolist" and model._meta.model_name in SHARDED_MODELS
+    )
+
+
+def hashed_shard(user_id, aliases=None):
+    """Stable placement of a new user: the same id always hashes the same"""
+    aliases = aliases or shard_aliases()
+    digest = hashlib.sha256(str(user_id).encode()).digest()
+    return aliases[int.from_bytes(digest[:8], "big") % len(aliases)]
+
+
+def directory_entry(user_id):
+    """The user's directory entry, created from the hash on first sight"""
+    # Imported here: the models module imports this one
+    from .models import UserShard
+
+    entry, created = UserShard.objects.get_or_create(
+        user_id=user_id, defaults={"alias": hashed_shard(user_id)}
+    )
+    if created:
+        logger.info(f"USER PLACED: User={user_id} | Shard={entry.alias}")
+    return entry
+
+
+def shard_for_user(user_id):
+    """DATABASES alias holding the data of ``user_id``"""
+    if not sharding_enabled():
+        return DEFAULT_DB_ALIAS
+    active = _active.get()
+    if active and active[1] == user_id:
+        return active[0]
+    return directory_entry(user_id).alias
+
+
+def current_db():
+    """Alias the current request or job is routed to"""
+    active = _active.get()
+    return active[0] if active else DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def use_shard(alias, user_id=None):
+    """Route sharded queries without a more specific hint to ``alias``"""
+    token = _active.set((alias, user_id))
+    try:
+        yield alias
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def user_shard(user_id):
+    """Route sharded queries to the shard of ``user_id``"""
+    active = _active.get()
+    if not sharding_enabled() or (active and active[1] == user_id):
+        yield current_db()
+        return
+    with use_shard(directory_entry(user_id).alias, user_id) as alias:
+        yield alias
+
+
+def each_shard():
+    """Yield every shard alias with queries routed to it, for batch jobs"""
+    for alias in shard_aliases():
+        with use_shard(alias):
+            yield alias
+
+
+class ShardRouter:
+    """
+    Send the sharded models to the shard of the user they belong to:
+    related lookups follow the instance they start from, and everything
+    else goes to the shard activated for the current request or job. Does
+    nothing while TODOLIST_SHARDS is just "default".
+    """
+
+    def db_for_read(self, model, **hints):
+        if not sharding_enabled():
+            return None
+        if not is_sharded(model):
+            # Also for users reached from a sharded row
+            return DEFAULT_DB_ALIAS
+        instance = hints.get("instance")
+        if instance is not None:
+            if instance._meta.label == settings.AUTH_USER_MODEL:
+                return shard_for_user(instance.pk)
+            if instance._state.db:
+                return instance._state.db
+        active = _active.get()
+        if active:
+            return active[0]
+        user_id = getattr(instance, "user_id", None)
+        return shard_for_user(user_id) if user_id else None
+
+    db_for_write = db_for_read
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if settings.AUTH_USER_MODEL in (obj1._meta.label, obj2._meta.label):
+            return True
+        return None
+
+
+class ShardedViewMixin:
+    """
+    Route a view's queries to the shard of the authenticated user. Writes
+    are refused while the user's data is being moved.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        # Whatever ``initial`` activates ends with the request
+        token = _active.set(_active.get())
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _active.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not sharding_enabled() or not request.user.is_authenticated:
+            return
+        entry = directory_entry(request.user.id)
+        if entry.moving and request.method not in SAFE_METHODS:
+            raise ShardMoving()
+        _active.set((entry.alias, request.user.id))
+
+
+def user_data(user_id):
+    """
+    Querysets over everything a user owns, parents before children, so
+    inserting them in this order satisfies every foreign key.
+    """
+    from .models import (
+        Tag,
+        Task,
+        TaskActivity,
+        TaskCategory,
+        TaskRecurrence,
+        TaskReminder,
+        TaskTag,
+    )
+
+    return [
+        TaskCategory.objects.filter(user_id=user_id),
+        Tag.objects.filter(user_id=user_id),
+        # Parents before subtasks: a parent's path is a prefix of its children's
+        Task.objects.filter(user_id=user_id).order_by("path"),
+        TaskRecurrence.objects.filter(task__user_id=user_id),
+        TaskTag.objects.filter(task__user_id=user_id),
+        TaskReminder.objects.filter(task__user_id=user_id),
+        TaskActivity.objects.filter(user_id=user_id),
+    ]
+
+
+def ordered_rows(queryset, alias):
+    return queryset.using(alias).order_by(*queryset.query.order_by or ["pk"])
+
+
+def row_values(model, row):
+    """Every column of ``row``, as loaded; what a copy has to reproduce"""
+    return tuple(getattr(row, field.attname) for field in model._meta.concrete_fields)
+
+
+def fingerprint(queryset, alias):
+    """Digest of every row of ``queryset`` on ``alias``, in copy order"""
+    model = queryset.model
+    digest = hashlib.sha256()
+    columns = [field.attname for field in model._meta.concrete_fields]
+    for values in ordered_rows(queryset, alias).values_list(*columns).iterator():
+        digest.update(repr(values).encode())
+    return digest.hexdigest()
+
+
+def copy_rows(queryset, source, target, batch_size):
+    """
+    Insert the rows of ``queryset`` on ``source`` into ``target`` as they
+    are, ids and timestamps included. Returns the copied ids and the
+    fingerprint of the rows as they were read.
+    """
+    model = queryset.model
+    # bulk_create stamps auto_now(_add) fields; put the original values back
+    stamped = [
+        field.attname
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    pks, digest = [], hashlib.sha256()
+    batch = []
+    for row in ordered_rows(queryset, source).iterator(chunk_size=batch_size):
+        digest.update(repr(row_values(model, row)).encode())
+        pks.append(row.pk)
+        batch.append(row)
+        if len(batch) == batch_size:
+            insert_batch(model, batch, target, stamped)
+            batch = []
+    if batch:
+        insert_batch(model, batch, target, stamped)
+    return pks, digest.hexdigest()
+
+
+def insert_batch(model, rows, target, stamped):
+    original = [{name: getattr(row, name) for name in stamped} for row in rows]
+    model.objects.using(target).bulk_create(rows)
+    if stamped:
+        for row, values in zip(rows, original):
+            for name, value in values.items():
+                setattr(row, name, value)
+        model.objects.using(target).bulk_update(rows, stamped)
+    return len(rows)
+
+
+def delete_rows(queryset, alias):
+    """
+    Delete the rows of ``queryset`` on ``alias`` with one plain DELETE: the
+    rows were moved, not removed, so no deletion signals are sent.
+    """
+    model = queryset.model
+    pks = queryset.using(alias).values("pk")
+    sql, params = pks.query.sql_with_params()
+    quote = connections[alias].ops.quote_name
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} "
+            f"WHERE {quote(model._meta.pk.column)} IN ({sql})",
+            params,
+        )
+        return cursor.rowcount
+
+
+def delete_copied(copied, alias, batch_size):
+    """
+    Delete the rows listed in ``copied`` ([(queryset, ids)], parents first)
+    from ``alias``, children first, by id only: rows the copy did not see
+    are never touched.
+    """
+    for queryset, pks in reversed(copied):
+        for start in range(0, len(pks), batch_size):
+            end = start + batch_size
+            delete_rows(queryset.model.objects.filter(pk__in=pks[start:end]), alias)
+
+
+def id_block(alias):
+    """First id of ``alias``'s block and the first id past it"""
+    start = list(settings.DATABASES).index(alias) * ID_BLOCK_SIZE
+    return start, start + ID_BLOCK_SIZE
+
+
+def check_id_blocks(user_id, source, target):
+    """
+    Refuse a move that would push ``target``'s id counters into another
+    shard's block. Only PostgreSQL sequences ignore explicitly inserted ids:
+    SQLite (and MySQL) hand out one past the largest id in the table, so
+    rows copied in from a later block would make the target's next inserts
+    collide with that block's own ids.
+    """
+    if connections[target].vendor == "postgresql":
+        return
+    _, end = id_block(target)
+    for queryset in user_data(user_id):
+        largest = queryset.using(source).order_by("-pk").values_list("pk", flat=True)
+        if (largest.first() or 0) >= end:
+            raise ValueError(
+                f"User {user_id} has {queryset.model.__name__} ids past the id "
+                f"block of {target!r}; on {connections[target].vendor} they "
+                "would advance its counter into another shard's block"
+            )
+
+
+def move_user(user_id, target, grace_seconds=5, batch_size=1000):
+    """
+    Move a user's data to the ``target`` shard while the site keeps
+    running. The directory entry is flagged first, so API writes are
+    refused (reads keep going to the old shard); after ``grace_seconds``
+    for writes already in flight, rows are copied with their ids in one
+    transaction on the target.
+
+    Background jobs and slow requests may still write to the old shard, so
+    before anything is deleted there the user's rows are read again (locked,
+    where the database supports it) and compared with what was copied. Any
+    difference undoes the copy and raises ShardMoveConflict, leaving the
+    user on the old shard; otherwise the entry is switched and exactly the
+    copied rows are deleted. Returns the number of rows moved.
+    """
+    from .models import Task, UserShard
+
+    if target not in shard_aliases():
+        raise ValueError(f"{target!r} is not one of TODOLIST_SHARDS")
+    source = directory_entry(user_id).alias
+    if source == target:
+        return 0
+    check_id_blocks(user_id, source, target)
+
+    entry = UserShard.objects.filter(user_id=user_id)
+    entry.update(moving=True)
+    copied, copy_committed = [], False
+    try:
+        time.sleep(grace_seconds)
+        with transaction.atomic(using=target):
+            for queryset in user_data(user_id):
+                pks, digest = copy_rows(queryset, source, target, batch_size)
+                copied.append((queryset, pks, digest))
+        copy_committed = True
+
+        with transaction.atomic(using=source):
+            # Holds off updates of the user's tasks until the rows are gone
+            list(
+                Task.objects.using(source)
+                .select_for_update()
+                .filter(user_id=user_id)
+                .values_list("pk", flat=True)
+            )
+            for queryset, _, digest in copied:
+                if fingerprint(queryset, source) != digest:
+                    raise ShardMoveConflict(
+                        f"{queryset.model.__name__} rows of user {user_id} "
+                        f"changed on {source} during the move"
+                    )
+            delete_copied(
+                [(queryset, pks) for queryset, pks, _ in copied], source, batch_size
+            )
+            if any(queryset.using(source).exists() for queryset in user_data(user_id)):
+                raise ShardMoveConflict(
+                    f"Rows of user {user_id} were added on {source} during the move"
+                )
+            entry.update(alias=target, moving=False)
+    except BaseException:
+        if copy_committed:
+            with transaction.atomic(using=target):
+                delete_copied(
+                    [(queryset, pks) for queryset, pks, _ in copied],
+                    target,
+                    batch_size,
+                )
+        entry.update(alias=source, moving=False)
+        raise
+
+    moved = sum(len(pks) for _, pks, _ in copied)
+    logger.info(f"USER MOVED: User={user_id} | {source} -> {target} | Rows={moved}")
+    return moved
+
+
+def purge_user_data(sender, instance, using, **kwargs):
+    """
+    Delete the data of a user being deleted from their shard. Cascades only
+    reach rows in the user's own database, which is "default".
+    """
+    from .models import UserShard
+
+    # Users get an entry before their first row is written
+    alias = (
+        UserShard.objects.filter(user_id=instance.pk)
+        .values_list("alias", flat=True)
+        .first()
+    )
+    if alias is None or alias == using:
+        return
+    with transaction.atomic(using=alias):
+        for queryset in reversed(user_data(instance.pk)):
+            delete_rows(queryset, alias)
+
+
+def reserve_id_block(sender, using, **kwargs):
+    """
+    After migrating an alias, start the sharded tables' primary keys at the
+    alias's block (its position in DATABASES times ID_BLOCK_SIZE). Counters
+    already past the block start are left alone, so ids are never reused.
+    """
+    from django.apps import apps
+
+    start = list(settings.DATABASES).index(using) * ID_BLOCK_SIZE
+    if not start:
+        return
+    connection = connections[using]
+    tables = [
+        model._meta.db_table
+        for model in apps.get_app_config("todolist").get_models()
+        if is_sharded(model)
+    ]
+    with connection.cursor() as cursor:
+        for table in tables:
+            if connection.vendor == "sqlite":
+                cursor.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) SELECT %s, 0 "
+                    "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = %s)",
+                    [table, table],
+                )
+                cursor.execute(
+                    "UPDATE sqlite_sequence SET seq = %s WHERE name = %s AND seq < %s",
+                    [start, table, start],
+                )
+            elif connection.vendor == "postgresql":
+                cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+                sequence = cursor.fetchone()[0]
+                cursor.execute(
+                    f"SELECT setval(%s, GREATEST(%s, last_value)) FROM {sequence}",
+                    [sequence, start],
+                )
@@ -0,0 +1,140 @@
+// Key sent with writes so retried requests are applied only once
+function newIdempotencyKey() {
+    if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+    return `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+}
+
+function logout() {
+    console.log('Logout');
+    localStorage.removeItem('auth_token');
+}
+
+/**
+ * Verify authentication status via backend API
+ * Checks both token existence and validity
+ */
+async function checkAuth() {
+    try {
+        // 1. Check for token in localStorage
+        const token = localStorage.getItem('auth_token');
+        if (!token) {
+            throw new Error('Authentication token not found');
+        }
+
+        // 2. Validate token with backend
+        const response = await fetch('/api/accounts/check-auth/', {
+            method: 'GET',
+            headers: {
+                'Authorization': `Bearer ${token}`
+            }
+        });
+
+        // 3. Handle invalid/expired tokens
+        if (!response.ok) {
+            if (response.status === 401) {
+                console.warn('Token invalid/expired - Removing stored token');
+                localStorage.removeItem('auth_token');
+            }
+            throw new Error('Authentication validation failed');
+        }
+
+        // 4. Return validated user data
+        const authData = await response.json();
+        console.log('Valid authentication:', authData.username);
+        return authData;
+
+    } catch (error) {
+        // 5. Redirect to login on any authentication failure
+        console.error('Authentication check error:', error.message);
+        window.location.href = '/login/';
+        return null;
+    }
+}
+
+/**
+ * Send several GET calls in one /api/batch/ request, checking the
+ * session on the way. Resolves to the sub-responses in request order,
+ * or null after redirecting to the login page.
+ */
+async function batchGet(paths) {
+    const token = localStorage.getItem('auth_token');
+    if (!token) return checkAuth();
+    const response = await fetch('/api/batch/', {
+        method: 'POST',
+        headers: {
+            'Authorization': `Bearer ${token}`,
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+            parallel: true,
+            requests: ['/api/accounts/check-auth/', ...paths].map(
+                path => ({ method: 'GET', path: path })
+            )
+        })
+    });
+    if (!response.ok) return checkAuth();  // Redirects when the token is invalid
+    const [auth, ...responses] = (await response.json()).responses;
+    if (auth.status !== 200) return checkAuth();
+    return responses;
+}
+
+/**
+ * Typeahead for a text input: fills a <datalist> with the titles and
+ * category names suggested by /api/tasks/suggest/. Keystrokes are
+ * debounced and a newer query cancels the request still in flight.
+ */
+function attachSuggestions(input, delay = 150) {
+    const list = document.createElement('datalist');
+    list.id = `${input.id || input.name}-suggestions`;
+    input.after(list);
+    input.setAttribute('list', list.id);
+    input.setAttribute('autocomplete', 'off');
+    let timer = null;
+    let controller = null;
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(async () => {
+            if (controller) controller.abort();
+            const query = input.value.trim();
+            if (!query) {
+                list.replaceChildren();
+                return;
+            }
+            controller = new AbortController();
+            try {
+                const response = await fetch(
+                    `/api/tasks/suggest/?q=${encodeURIComponent(query)}`,
+                    {
+                        headers: { 'Authorization': `Bearer ${localStorage.getItem('auth_token')}` },
+                        signal: controller.signal
+                    }
+                );
+                if (!response.ok) return;
+                const data = await response.json();
+                const names = [
+                    ...data.tasks.map(task => task.title),
+                    ...data.categories.map(category => category.name)
+                ];
+                list.replaceChildren(...[...new Set(names)].map(name => {
+                    const option = document.createElement('option');
+                    option.value = name;
+                    return option;
+                }));
+            } catch (error) {
+                if (error.name !== 'AbortError') console.error('Suggestions failed:', error);
+            }
+        }, delay);
+    });
+}
+
+// Function to handle API responses
+function handleResponse(response) {
+    return response.json().then(data => {
+        if (!response.ok) {
+            const error = (data && data.detail) ? data.detail : response.statusText;
+            throw new Error(error);
+        }
+        return data;
+    });
+}
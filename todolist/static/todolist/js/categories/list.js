@@ -0,0 +1,82 @@
+document.addEventListener('DOMContentLoaded', async () => {
+    try {
+        // Verify authentication
+        const authData = await checkAuth();
+        if (!authData) return;
+
+        // Load categories from the backend
+        loadCategories();
+    } catch (error) {
+        console.error('Error loading categories:', error);
+        window.location.href = '/login/';
+    }
+});
+
+// Function to load categories from the backend, one cursor page at a time
+async function loadCategories(url = '/api/categories/') {
+    try {
+        const token = localStorage.getItem('auth_token');
+        const response = await fetch(url, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+
+        if (response.ok) {
+            const page = await response.json();
+            const categoryList = document.getElementById('categoryList');
+            const loadMore = document.getElementById('loadMoreCategories');
+            const firstPage = url === '/api/categories/';
+            if (firstPage) {
+                categoryList.innerHTML = ''; // Clear previous list
+            }
+
+            if (firstPage && page.results.length === 0) {
+                categoryList.innerHTML = '<li class="list-group-item">No categories found.</li>';
+                loadMore.classList.add('d-none');
+                return;
+            }
+
+            page.results.forEach(category => {
+                const listItem = document.createElement('li');
+                listItem.className = 'list-group-item d-flex justify-content-between align-items-center';
+
+                // Category name, task count and delete button
+                listItem.innerHTML = `
+                    <span>${category.name} <span class="badge bg-secondary">${category.task_count}</span></span>
+                    <button class="btn btn-danger btn-sm delete-category" data-id="${category.id}">Delete</button>
+                `;
+                listItem.querySelector('.delete-category').addEventListener('click', async (e) => {
+                    const categoryId = e.target.getAttribute('data-id');
+                    await deleteCategory(categoryId);
+                    loadCategories(); // Reload categories after deletion
+                });
+                categoryList.appendChild(listItem);
+            });
+
+            // Follow the cursor only when the user asks for more
+            loadMore.classList.toggle('d-none', !page.next);
+            loadMore.onclick = () => loadCategories(page.next);
+        } else {
+            console.error('Failed to fetch categories:', response.statusText);
+        }
+    } catch (error) {
+        console.error('Error loading categories:', error);
+    }
+}
+
+// Function to delete a category
+async function deleteCategory(categoryId) {
+    try {
+        const token = localStorage.getItem('auth_token');
+        const response = await fetch(`/api/categories/${categoryId}/`, {
+            method: 'DELETE',
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+
+        if (!response.ok) {
+            const errorData = await response.json();
+            throw new Error(errorData.message || 'Failed to delete category');
+        }
+    } catch (error) {
+        alert(error.message);
+    }
+}
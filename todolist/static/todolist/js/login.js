@@ -0,0 +1,50 @@
+document.getElementById('loginForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    // Clear previous errors
+    document.querySelectorAll('.invalid-feedback').forEach(el => el.textContent = '');
+    document.getElementById('loginMessage').innerHTML = '';
+
+    const formData = new FormData(this);
+    const data = {
+        username: formData.get('username'),
+        password: formData.get('password')
+    };
+
+    try {
+        const response = await fetch('/api/accounts/login/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (response.ok) {
+            // Save token in localStorage
+            localStorage.setItem('auth_token', result.access);
+            localStorage.setItem('refresh_token', result.refresh);
+            document.getElementById('loginMessage').innerHTML = `
+                <div class="alert alert-success">
+                    Login successful! Redirecting to tasks...
+                </div>
+            `;
+
+            // Redirect to tasks page after 2 seconds
+            setTimeout(() => {
+                window.location.href = '/tasks/';
+            }, 2000);
+        } else {
+            // Show error messages
+            if (result.detail) {
+                document.getElementById('loginMessage').innerHTML = `
+                    <div class="alert alert-danger">${result.detail}</div>
+                `;
+            }
+        }
+    } catch (error) {
+        document.getElementById('loginMessage').innerHTML = `
+            <div class="alert alert-danger">Unexpected error. Try again.</div>
+        `;
+    }
+});
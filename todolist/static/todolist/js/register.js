@@ -0,0 +1,51 @@
+document.getElementById('registerForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    // Reset error messages
+    document.querySelectorAll('.invalid-feedback').forEach(el => el.textContent = '');
+    document.getElementById('generalError').classList.add('d-none');
+
+    const formData = new FormData(this);
+    const data = {
+        username: formData.get('username'),
+        password: formData.get('password')
+    };
+
+    try {
+        const response = await fetch('/api/accounts/register/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (response.ok) {
+            // Show success message and redirect to login page
+            document.getElementById('generalError').classList.remove('d-none');
+            document.getElementById('generalError').classList.add('success');
+            document.getElementById('generalError').textContent = '¡Login successful! Redirecting to login page...';
+
+            setTimeout(() => {
+                window.location.href = '/login/';
+            }, 2000);
+        } else {
+            // Show error messages
+            if (result.username) {
+                document.getElementById('usernameError').textContent = result.username[0];
+                document.querySelector('[name="username"]').classList.add('is-invalid');
+            }
+            if (result.password) {
+                document.getElementById('passwordError').textContent = result.password[0];
+                document.querySelector('[name="password"]').classList.add('is-invalid');
+            }
+            if (result.non_field_errors) {
+                document.getElementById('generalError').textContent = result.non_field_errors[0];
+                document.getElementById('generalError').classList.remove('d-none');
+            }
+        }
+    } catch (error) {
+        document.getElementById('generalError').textContent = 'An error occurred. Please try again.';
+        document.getElementById('generalError').classList.remove('d-none');
+    }
+});
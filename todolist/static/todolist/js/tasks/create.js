@@ -0,0 +1,118 @@
+document.addEventListener('DOMContentLoaded', async () => {
+    try {
+        // Verify authentication and fetch the first page of categories at once
+        const responses = await batchGet(['/api/categories/']);
+        if (!responses) return;  // Redirect if not authenticated
+
+        // Populate the dropdown with the user's categories, following the cursor
+        const token = localStorage.getItem('auth_token');
+        const select = document.getElementById('categorySelect');
+        let page = responses[0].body;
+        while (page) {
+            page.results.forEach(category => {
+                const option = document.createElement('option');
+                option.value = category.id;
+                option.textContent = category.name;
+                select.appendChild(option);
+            });
+            if (!page.next) break;
+            const response = await fetch(page.next, {
+                headers: { 'Authorization': `Bearer ${token}` }
+            });
+            if (!response.ok) {
+                console.error('Failed to fetch categories:', response.statusText);
+                break;
+            }
+            page = await response.json();
+        }
+    } catch (error) {
+        console.error('Error loading categories:', error);
+    }
+});
+
+/**
+ * Verify authentication status with backend API
+ * @returns {Promise<Object|null>} User data or null if unauthenticated
+ */
+async function checkAuth() {
+    try {
+        const token = localStorage.getItem('auth_token');
+        if (!token) {
+            throw new Error('Authentication token not found');
+        }
+
+        const response = await fetch('/api/accounts/check-auth/', {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+
+        if (!response.ok) {
+            if (response.status === 401) {
+                localStorage.removeItem('auth_token');
+                window.location.href = '/login/';
+            }
+            throw new Error('Authentication validation failed');
+        }
+
+        return await response.json();
+
+    } catch (error) {
+        console.error('Authentication check failed:', error);
+        window.location.href = '/login/';
+        return null;
+    }
+}
+
+attachSuggestions(document.querySelector('#taskForm [name="title"]'));
+
+// One key per filled-in form, so a double submit creates a single task
+let createTaskKey = newIdempotencyKey();
+document.getElementById('taskForm').addEventListener('input', () => {
+    createTaskKey = newIdempotencyKey();
+});
+
+// Task form submission handler
+document.getElementById('taskForm').addEventListener('submit', async function (e) {
+    e.preventDefault();
+
+    try {
+        // First verify authentication
+        const authData = await checkAuth();
+        if (!authData) return;  // Stop if not authenticated
+
+        const token = localStorage.getItem('auth_token');
+        const formData = new FormData(this);
+        const data = {
+            title: formData.get('title'),
+            description: formData.get('description'),
+            category: formData.get('category') || null, // Optional field
+            priority: formData.get('priority'),
+            due_date: formData.get('due_date') || null, // Optional field
+        };
+        console.log('Task data:', data);
+
+        // Create task with valid credentials
+        const response = await fetch('/api/tasks/', {
+            method: 'POST',
+            headers: {
+                'Authorization': `Bearer ${token}`,
+                'Content-Type': 'application/json',
+                'Idempotency-Key': createTaskKey
+            },
+            body: JSON.stringify(data)
+        });
+
+        if (response.ok) {
+            document.getElementById('message').innerHTML = `
+                <div class="alert alert-success">Task created! Redirecting...</div>
+            `;
+            setTimeout(() => window.location.href = '/tasks/', 2000);
+        } else {
+            const errorData = await response.json();
+            throw new Error(errorData.message || 'Failed to create task');
+        }
+    } catch (error) {
+        document.getElementById('message').innerHTML = `
+            <div class="alert alert-danger">${error.message}</div>
+        `;
+    }
+});
@@ -0,0 +1,260 @@
+// Tasks currently shown, kept up to date by the event stream
+let currentTasks = [];
+// URL of the next page of tasks, null on the last page
+let nextPage = null;
+
+// Show a page of tasks: replace the list, or append when loading more
+function showPage(page, append = false) {
+    currentTasks = append ? currentTasks.concat(page.results) : page.results;
+    nextPage = page.next;
+    document.getElementById('loadMoreTasks').classList.toggle('d-none', !nextPage);
+    renderTasks();
+}
+
+function showError(error) {
+    document.getElementById('taskList').innerHTML = `
+        <div class="alert alert-danger">${error.message}</div>
+    `;
+}
+
+// Fetch the first page matching the filters
+async function loadTasks() {
+    const form = document.getElementById('filterForm');
+    const params = new URLSearchParams(new FormData(form)).toString();
+
+    try {
+        // Check the session and fetch the tasks in one request
+        const responses = await batchGet([`/api/tasks/?${params}`]);
+        if (!responses) return;  // Redirect if not authenticated
+        const [tasks] = responses;
+        if (tasks.status !== 200) {
+            throw new Error(tasks.body.detail || 'Failed to load tasks');
+        }
+        showPage(tasks.body);
+    } catch (error) {
+        showError(error);
+    }
+}
+
+// Fetch the page after the ones on screen
+async function loadMoreTasks() {
+    if (!nextPage) return;
+    const token = localStorage.getItem('auth_token');
+    try {
+        const response = await fetch(nextPage, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+        if (response.status === 401) {
+            checkAuth();
+            return;
+        }
+        if (!response.ok) throw new Error('Failed to load tasks');
+        showPage(await response.json(), true);
+    } catch (error) {
+        showError(error);
+    }
+}
+
+function renderTasks() {
+    if (currentTasks.length === 0) {
+        document.getElementById('taskList').innerHTML = `
+            <div class="alert alert-info">No tasks found</div>
+        `;
+        return;
+    }
+    let html = `
+        <table class="table table-striped">
+            <thead>
+                <tr>
+                    <th>Title</th>
+                    <th>Description</th>
+                    <th>Category</th>
+                    <th>Priority</th>
+                    <th>Due Date</th>
+                    <th>Status</th>
+                    <th>Created</th>
+                    <th>Completed</th>
+                    <th>Delete</th>
+                </tr>
+            </thead>
+            <tbody>
+    `;
+
+    currentTasks.forEach(task => {
+        html += `
+            <tr>
+                <td>${task.title}</td>
+                <td class="text-justify">${task.description || 'No description'}</td>
+                <td>${task.category ? task.category : 'No category'}</td>
+                <td>${task.priority}</td>
+                <td>${task.due_date || 'No due date'}</td>
+                <td>
+                    <div class="status-container d-flex flex-column align-items-center">
+                        <div class="form-check form-switch">
+                            <input 
+                                class="form-check-input" 
+                                type="checkbox" 
+                                role="switch" 
+                                id="task-${task.id}" 
+                                ${task.completed ? 'checked' : ''}
+                                onchange="toggleComplete(${task.id}, this)"
+                            >
+                        </div>
+                        <span class="status-text mt-1 ${task.completed ? 'text-success' : 'text-warning'}">
+                            ${task.completed ? 'Completed' : 'Pending'}
+                        </span>
+                    </div>
+                </td>
+                <td>${task.created_at}</td>
+                <td>${task.completed_at || 'Not completed yet'}</td>
+                <td>
+                    <!-- Delete button -->
+                    <button 
+                        class="btn btn-sm btn-danger" 
+                        onclick="deleteTask(event, ${task.id})"
+                        data-bs-toggle="tooltip" 
+                        data-bs-placement="top" 
+                        title="Delete task"
+                    >
+                        ×
+                    </button>
+                </td>
+            </tr>
+        `;
+    });
+
+    html += `</tbody></table>`;
+    document.getElementById('taskList').innerHTML = html;
+}
+
+// True when the filter form narrows the list, so new tasks may not belong in it
+function filtersActive() {
+    const form = document.getElementById('filterForm');
+    return Array.from(new FormData(form).values()).some(value => value !== '');
+}
+
+// Apply one change event to the tasks on screen, without refetching
+function applyEvent(event) {
+    const index = currentTasks.findIndex(task => task.id === event.id);
+    switch (event.type) {
+        case 'created':
+            if (index === -1 && !filtersActive()) currentTasks.unshift(event.task);
+            break;
+        case 'updated':
+            if (index !== -1) Object.assign(currentTasks[index], event.changes);
+            break;
+        case 'toggled':
+            if (index !== -1) {
+                currentTasks[index].completed = event.completed;
+                currentTasks[index].completed_at = event.completed_at;
+            }
+            break;
+        case 'deleted':
+            if (index !== -1) currentTasks.splice(index, 1);
+            break;
+        case 'resync':
+            loadTasks();
+            return;
+    }
+    renderTasks();
+}
+
+// Follow changes made in other tabs and devices
+function subscribeToTaskEvents() {
+    // Authenticated by the HttpOnly access token cookie set at login
+    const source = new EventSource('/api/tasks/events/');
+    let connected = false;
+    ['created', 'updated', 'toggled', 'deleted', 'resync'].forEach(type => {
+        source.addEventListener(type, e => applyEvent(JSON.parse(e.data)));
+    });
+    source.onopen = () => {
+        // Changes made while reconnecting were missed
+        if (connected) loadTasks();
+        connected = true;
+    };
+    source.onerror = () => {
+        // The server refused the stream (e.g. the cookie expired): try again later
+        if (source.readyState === EventSource.CLOSED) {
+            setTimeout(subscribeToTaskEvents, 30000);
+        }
+    };
+}
+
+// Show the server-rendered first page, or load it when none was embedded
+document.addEventListener('DOMContentLoaded', () => {
+    const initialTasks = JSON.parse(document.getElementById('initial-tasks').textContent);
+    if (initialTasks) {
+        showPage(initialTasks);
+    } else {
+        loadTasks();
+    }
+    subscribeToTaskEvents();
+    attachSuggestions(document.getElementById('search'));
+
+    // Filter tasks on form submit
+    document.getElementById('filterForm').addEventListener('submit', function(e) {
+        e.preventDefault();
+        console.log('Filtering tasks...');
+        loadTasks();
+    });
+});
+
+// Toggle completion with auth validation
+async function toggleComplete(id, checkbox) {
+    await checkAuth();
+    const token = localStorage.getItem('auth_token');
+
+    fetch(`/api/tasks/${id}/toggle-complete/`, {
+        method: 'POST',
+        headers: { 
+            'Authorization': `Bearer ${token}`,
+            'Content-Type': 'application/json',
+            'Idempotency-Key': newIdempotencyKey()
+        }
+    })
+    .then(response => {
+        if (response.status === 401) {
+            checkAuth();
+            throw new Error('Session expired');
+        }
+        return response.json();
+    })
+    .then(data => {
+        applyEvent({ type: 'toggled', id: id, completed: data.completed, completed_at: data.completed_at });
+    })
+    .catch(error => {
+        alert(error.message);
+        checkbox.checked = !checkbox.checked;  // Revert UI state
+    });
+}
+
+// Delete task with auth validation
+async function deleteTask(event, id) {
+    const confirmed = confirm('Are you sure you want to delete this task?');
+    if (!confirmed) return;
+
+    await checkAuth();
+    const token = localStorage.getItem('auth_token');
+
+    fetch(`/api/tasks/${id}/`, {
+        method: 'DELETE',
+        headers: { 'Authorization': `Bearer ${token}` }
+    })
+    .then(response => {
+        if (response.status === 401) {
+            checkAuth();
+            throw new Error('Session expired');
+        }
+        if (response.status === 204) {
+            // No content expected for successful deletion
+            return null;
+        }
+        return response.json(); // Parse JSON only if there is content
+    })
+    .then(() => {
+        applyEvent({ type: 'deleted', id: id });
+    })
+    .catch(error => {
+        alert(error.message);
+    });
+}
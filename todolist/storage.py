@@ -0,0 +1,61 @@
+# Standard imports
+import gzip
+import logging
+
+# Django imports
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+# External imports
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+# Logger configuration
+logger = logging.getLogger(__name__)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage that also writes ``.gz`` and ``.br`` siblings of every
+    fingerprinted text asset, so nginx can serve them precompressed with
+    ``gzip_static``/``brotli_static`` and never compress at request time.
+    Brotli siblings are skipped when the brotli package is not installed.
+    """
+
+    compressible_extensions = (".css", ".js", ".json", ".map", ".svg", ".txt")
+    # Smaller files do not shrink enough to be worth a second request path
+    min_size = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = []
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.append(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in dict.fromkeys(hashed_names):
+            if hashed_name.endswith(self.compressible_extensions):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        """Write the compressed siblings of ``name`` that are smaller than it"""
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < self.min_size:
+            return
+        variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(content, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+            logger.debug(f"STATIC COMPRESSED: {name}{suffix} | {len(compressed)} bytes")
@@ -0,0 +1,73 @@
+# Django imports
+from django.db import connections
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.functions import Length
+
+# App imports
+from .models import Task, TaskCategory, UnicodeLower
+
+
+# Upper bound of a prefix range: sorts after any text starting with the prefix
+PREFIX_END = chr(0x10FFFF)
+# Shortest query matched anywhere in the text; shorter ones match prefixes only
+SUBSTRING_MIN_LENGTH = 3
+
+
+def unicode_lower(value):
+    """Python's lowercasing, the one applied to the query text"""
+    return value.lower() if isinstance(value, str) else value
+
+
+def install_unicode_lower(sender, connection, **kwargs):
+    """
+    ``connection_created`` receiver: register unicode_lower() on every SQLite
+    connection, next to the built-in lower() that only folds ASCII, so "É"
+    matches a query lowercased by Python. Deterministic, so the title index
+    can use it.
+    """
+    if connection.vendor == "sqlite":
+        connection.connection.create_function(
+            "unicode_lower", 1, unicode_lower, deterministic=True
+        )
+
+
+def matching(queryset, field, text):
+    """
+    Rows whose lowercased ``field`` matches ``text``, best matches first.
+
+    PostgreSQL matches prefixes and substrings with LIKE on ``lower(field)``;
+    short prefixes are served by a text_pattern_ops index, substrings by the
+    pg_trgm GIN index. Prefixes rank first, then shorter values. Elsewhere
+    the match is a prefix range over the ``unicode_lower(field)`` expression
+    index, read in index order so LIMIT stops early.
+    """
+    queryset = queryset.annotate(match_key=UnicodeLower(field))
+    if connections[queryset.db].vendor == "postgresql":
+        if len(text) < SUBSTRING_MIN_LENGTH:
+            queryset = queryset.filter(match_key__startswith=text)
+        else:
+            queryset = queryset.filter(match_key__contains=text)
+        not_prefix = ExpressionWrapper(
+            ~Q(match_key__startswith=text), output_field=BooleanField()
+        )
+        return queryset.order_by(not_prefix, Length(field), "match_key", "id")
+    return queryset.filter(
+        match_key__gte=text, match_key__lt=text + PREFIX_END
+    ).order_by("match_key", "id")
+
+
+def suggest(user_id, query, limit):
+    """Top ``limit`` task titles and category names matching ``query``"""
+    text = query.strip().lower()
+    if not text:
+        return {"tasks": [], "categories": []}
+    tasks = matching(Task.objects.filter(user_id=user_id), "title", text)
+    categories = matching(
+        TaskCategory.objects.filter(user_id=user_id, deleted_at__isnull=True),
+        "name",
+        text,
+    )
+    return {
+        "tasks": list(tasks.values("id", "title")[:limit]),
+        "categories": list(categories.values("id", "name")[:limit]),
+    }
@@ -0,0 +1,152 @@
+# Standard imports
+from datetime import timedelta
+from io import StringIO
+
+# Django imports
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.activity import buffered_activity
+from todolist.models import Task, TaskActivity
+
+
+class TestTaskActivity(TestCase):
+    """Test suite for the recorded history of task changes"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="auditor", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task = Task.objects.create(user=self.user, title="Draft")
+
+    def history(self, task=None):
+        response = self.client.get(f"/api/tasks/{(task or self.task).id}/history/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_creation_is_recorded(self):
+        """Test that a new task records the fields it was created with"""
+        [entry] = self.history()
+        self.assertEqual(entry["action"], "created")
+        self.assertEqual(
+            entry["changes"], {"title": [None, "Draft"], "priority": [None, "medium"]}
+        )
+
+    def test_update_records_only_changed_fields(self):
+        """Test that an update stores a compact diff of the changed fields"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/tasks/{self.task.id}/",
+                {"title": "Final", "priority": "high", "due_date": ""},
+            )
+        entry = self.history()[0]
+        self.assertEqual(entry["action"], "updated")
+        self.assertEqual(
+            entry["changes"],
+            {"title": ["Draft", "Final"], "priority": ["medium", "high"]},
+        )
+
+    def test_toggle_is_recorded(self):
+        """Test that the UPDATE ... RETURNING toggle leaves a history entry"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/tasks/{self.task.id}/toggle-complete/")
+        entry = self.history()[0]
+        self.assertEqual(entry["action"], "toggled")
+        self.assertEqual(entry["changes"], {"completed": [False, True]})
+
+    def test_deletion_outlives_the_task(self):
+        """Test that deleting a task keeps its history"""
+        task_id = self.task.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/tasks/{task_id}/")
+        actions = TaskActivity.objects.filter(task_id=task_id).values_list(
+            "action", flat=True
+        )
+        self.assertEqual(sorted(actions), ["created", "deleted"])
+
+    def test_rolled_back_changes_leave_no_history(self):
+        """Test that activity is only written for committed changes"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/tasks/{self.task.id}/", {"title": ""})
+        self.assertEqual(len(self.history()), 1)
+
+    def test_buffer_writes_with_one_insert(self):
+        """Test that buffered activity is flushed with a single INSERT"""
+        with CaptureQueriesContext(connection) as queries:
+            with buffered_activity(actor=self.user):
+                with self.captureOnCommitCallbacks(execute=True):
+                    for index in range(5):
+                        Task.objects.create(user=self.user, title=f"Task {index}")
+        inserts = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "todolist_taskactivity"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            TaskActivity.objects.filter(actor=self.user, action="created").count(), 5
+        )
+
+    def test_history_of_other_users_tasks_is_hidden(self):
+        """Test that the history endpoint is limited to the user's tasks"""
+        other = User.objects.create_user(username="other", password="pass123")
+        foreign = Task.objects.create(user=other, title="Foreign")
+        response = self.client.get(f"/api/tasks/{foreign.id}/history/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_prune_deletes_old_entries_in_batches(self):
+        """Test that the retention command removes only expired entries"""
+        old = timezone.now() - timedelta(days=400)
+        TaskActivity.objects.bulk_create(
+            TaskActivity(
+                task=self.task, user=self.user, action="updated", timestamp=old
+            )
+            for _ in range(5)
+        )
+        out = StringIO()
+        call_command("prune_task_activity", "--days=365", "--batch-size=2", stdout=out)
+        self.assertIn("Deleted 5", out.getvalue())
+        self.assertEqual(TaskActivity.objects.count(), 1)
+
+
+class TestTaskActivityRequests(TransactionTestCase):
+    """Test suite for activity flushed at the end of real requests"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="batcher", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_request_activity_is_attributed_and_flushed_once(self):
+        """Test that a batch of writes stores its history with one INSERT"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/batch/",
+                {
+                    "requests": [
+                        {"method": "POST", "path": "/api/tasks/", "body": {"title": t}}
+                        for t in ("One", "Two", "Three")
+                    ]
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        inserts = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "todolist_taskactivity"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            TaskActivity.objects.filter(actor=self.user, action="created").count(), 3
+        )
@@ -1,11 +1,27 @@
+# Standard imports
+from datetime import date
+from unittest.mock import patch
+
 # Django imports
 from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.db import connection
 from django.test import TestCase
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 
 # App imports
 from todolist.admin import TaskAdmin
-from todolist.models import Task
+from todolist.models import (
+    Tag,
+    Task,
+    TaskActivity,
+    TaskCategory,
+    TaskReminder,
+    TaskTag,
+)
 
 
 class TestTaskAdmin(TestCase):
@@ -192,3 +208,165 @@ class TestTaskAdmin(TestCase):
         request.user = self.regular_user
         has_permission = self.task_admin.has_delete_permission(request, obj=other_task)
         self.assertFalse(has_permission)
+
+
+class TestTaskAdminActions(TestCase):
+    """Test suite for the bulk actions and changelist of TaskAdmin"""
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(
+            username="adminuser", password="adminpass123"
+        )
+        self.category = TaskCategory.objects.create(name="Work", user=self.superuser)
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", user=self.superuser)
+            for i in range(3)
+        ]
+        self.client.force_login(self.superuser)
+        self.url = reverse("admin:todolist_task_changelist")
+
+    def run_action(self, action, **extra):
+        """Post an admin action for every task created in setUp"""
+        data = {
+            "action": action,
+            "_selected_action": [task.pk for task in self.tasks],
+            **extra,
+        }
+        return self.client.post(self.url, data)
+
+    def test_mark_completed_single_update(self):
+        """Test that completing tasks runs one UPDATE and sets completed_at"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.run_action("mark_completed")
+        self.assertEqual(response.status_code, 302)
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        for task in Task.objects.all():
+            self.assertTrue(task.completed)
+            self.assertIsNotNone(task.completed_at)
+
+    def test_mark_pending(self):
+        """Test that reopening tasks clears completed_at"""
+        Task.objects.update(completed=True, completed_at=timezone.now())
+        self.run_action("mark_pending")
+        self.assertFalse(Task.objects.filter(completed=True).exists())
+        self.assertFalse(Task.objects.filter(completed_at__isnull=False).exists())
+
+    def test_set_priority(self):
+        """Test that the priority chosen in the action form is applied"""
+        self.run_action("set_priority", priority="high")
+        self.assertEqual(Task.objects.filter(priority="high").count(), 3)
+
+    def test_set_priority_records_history(self):
+        """Test that the bulk UPDATE still leaves a history entry per task"""
+        self.tasks[0].priority = "high"
+        self.tasks[0].save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_action("set_priority", priority="high")
+        entries = TaskActivity.objects.filter(action="updated")
+        self.assertEqual(entries.count(), 2)
+        self.assertEqual(entries[0].changes, {"priority": ["medium", "high"]})
+
+    def test_set_priority_requires_choice(self):
+        """Test that the priority action is a no-op without a priority"""
+        self.run_action("set_priority", priority="")
+        self.assertEqual(Task.objects.filter(priority="medium").count(), 3)
+
+    def test_set_category(self):
+        """Test that the category chosen in the action form is applied"""
+        self.run_action("set_category", category=self.category.pk)
+        self.assertEqual(Task.objects.filter(category=self.category).count(), 3)
+
+    def test_set_category_ignores_deleted_categories(self):
+        """Test that a category pending deletion cannot be assigned"""
+        self.category.mark_deleted()
+        self.run_action("set_category", category=self.category.pk)
+        self.assertFalse(Task.objects.filter(category=self.category).exists())
+
+    def test_set_category_refuses_other_owners(self):
+        """Test that tasks are never moved into another user's category"""
+        other = User.objects.create_user(username="other", password="x")
+        self.tasks.append(Task.objects.create(title="Theirs", user=other))
+        self.run_action("set_category", category=self.category.pk)
+        self.assertFalse(Task.objects.filter(category=self.category).exists())
+
+    def test_delete_in_chunks(self):
+        """Test that selected tasks are deleted chunk by chunk"""
+        with patch("todolist.admin.DELETE_CHUNK_SIZE", 2):
+            with CaptureQueriesContext(connection) as ctx:
+                self.run_action("delete_in_chunks")
+        deletes = [
+            q
+            for q in ctx.captured_queries
+            if q["sql"].startswith('DELETE FROM "todolist_task"')
+        ]
+        self.assertEqual(len(deletes), 2)
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_delete_in_chunks_counts_only_tasks(self):
+        """Test that the message leaves out the rows deleted along with tasks"""
+        task = self.tasks[0]
+        Task.objects.create(title="Child", user=self.superuser, parent=task)
+        tag = Tag.objects.create(user=self.superuser, name="home")
+        TaskTag.objects.create(task=task, tag=tag)
+        TaskReminder.objects.create(task=task, kind="overdue", due_date=date.today())
+        self.tasks = [task]
+        response = self.run_action("delete_in_chunks")
+        messages = [str(message) for message in get_messages(response.wsgi_request)]
+        self.assertEqual(messages, ["2 task(s) deleted."])
+
+    def make_subtasks(self):
+        """Nest a child and a grandchild under the first task, select both"""
+        root = self.tasks[0]
+        child = Task.objects.create(title="Child", user=self.superuser, parent=root)
+        grandchild = Task.objects.create(
+            title="Grandchild", user=self.superuser, parent=child
+        )
+        self.tasks = [child, grandchild]
+        return root, child
+
+    def test_completion_actions_recount_ancestors(self):
+        """Test that bulk completion keeps the ancestors' counters right"""
+        root, child = self.make_subtasks()
+        self.run_action("mark_completed")
+        root.refresh_from_db()
+        child.refresh_from_db()
+        self.assertEqual(
+            (root.descendant_count, root.completed_descendant_count), (2, 2)
+        )
+        self.assertEqual(
+            (child.descendant_count, child.completed_descendant_count), (1, 1)
+        )
+        self.run_action("mark_pending")
+        root.refresh_from_db()
+        self.assertEqual(
+            (root.descendant_count, root.completed_descendant_count), (2, 0)
+        )
+
+    def test_delete_actions_recount_ancestors(self):
+        """Test that both delete actions fix the counters of what is left"""
+        root, child = self.make_subtasks()
+        self.tasks = [self.tasks[1]]
+        self.run_action("delete_in_chunks")
+        root.refresh_from_db()
+        self.assertEqual(root.descendant_count, 1)
+        self.tasks = [child]
+        self.run_action("delete_selected", post="yes")
+        root.refresh_from_db()
+        self.assertEqual(root.descendant_count, 0)
+        self.assertFalse(Task.objects.filter(parent=root).exists())
+
+    def test_changelist_query_count_is_constant(self):
+        """Test that the changelist query count does not grow with page size"""
+        for i in range(30):
+            user = User.objects.create_user(username=f"owner{i}", password="x")
+            Task.objects.create(title=f"Owned {i}", user=user, category=self.category)
+
+        counts = []
+        for per_page in (5, 30):
+            with patch.object(TaskAdmin, "list_per_page", per_page):
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
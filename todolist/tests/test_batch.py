@@ -0,0 +1,178 @@
+# Standard imports
+from unittest.mock import patch
+
+# Django imports
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase, override_settings
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+# App imports
+from todolist.models import Task, TaskCategory
+from todolist.views import TaskViewSet
+
+
+class TestBatchEndpoint(TestCase):
+    """Test suite for running several API calls in one request"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="batcher", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(user=self.user, title="Existing")
+        TaskCategory.objects.create(user=self.user, name="Work")
+
+    def batch(self, requests, **extra):
+        return self.client.post(
+            "/api/batch/", {"requests": requests, **extra}, format="json"
+        )
+
+    def test_page_load_in_one_request(self):
+        """Test that the page's initial calls are answered by one batch"""
+        self.client.force_authenticate(user=None)
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.batch(
+            [
+                {"method": "GET", "path": "/api/accounts/check-auth/"},
+                {"method": "GET", "path": "/api/tasks/my-tasks/"},
+                {"method": "GET", "path": "/api/categories/all/"},
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        auth, tasks, categories = response.data["responses"]
+        self.assertEqual(auth["status"], 200)
+        self.assertEqual(auth["body"]["username"], "batcher")
+        self.assertEqual(tasks["status"], 200)
+        self.assertEqual(tasks["body"][0]["title"], "Existing")
+        self.assertEqual(categories["status"], 200)
+        self.assertEqual(categories["body"]["results"][0]["name"], "Work")
+
+    def test_subrequests_reuse_batch_authentication(self):
+        """Test that sub-requests run as the batch user without new JWT checks"""
+        with patch(
+            "rest_framework_simplejwt.authentication.JWTAuthentication.authenticate"
+        ) as authenticate:
+            response = self.batch([{"method": "GET", "path": "/api/tasks/"}])
+        authenticate.assert_not_called()
+        self.assertEqual(response.data["responses"][0]["body"]["count"], 1)
+
+    def test_writes_run_in_order_with_their_own_status(self):
+        """Test that each sub-request reports its own status code"""
+        response = self.batch(
+            [
+                {"method": "POST", "path": "/api/tasks/", "body": {"title": "New"}},
+                {"method": "POST", "path": "/api/tasks/", "body": {"title": ""}},
+                {"method": "DELETE", "path": f"/api/tasks/{self.task.id}/"},
+                {"method": "GET", "path": "/api/tasks/?search=New"},
+            ]
+        )
+        statuses = [result["status"] for result in response.data["responses"]]
+        self.assertEqual(statuses, [201, 400, 204, 200])
+        self.assertEqual(response.data["responses"][3]["body"]["count"], 1)
+        self.assertFalse(Task.objects.filter(id=self.task.id).exists())
+
+    def test_idempotency_key_is_not_shared_with_subrequests(self):
+        """Test that a batch's Idempotency-Key does not apply to each sub-request"""
+        response = self.client.post(
+            "/api/batch/",
+            {
+                "requests": [
+                    {"method": "POST", "path": "/api/tasks/", "body": {"title": "A"}},
+                    {"method": "POST", "path": "/api/tasks/", "body": {"title": "B"}},
+                ]
+            },
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="batch-key",
+        )
+        statuses = [result["status"] for result in response.data["responses"]]
+        self.assertEqual(statuses, [201, 201])
+
+    def test_failing_subrequest_fails_alone(self):
+        """Test that a sub-view raising does not lose the other results"""
+        with patch.object(
+            TaskViewSet, "perform_create", side_effect=RuntimeError("boom")
+        ):
+            response = self.batch(
+                [
+                    {"method": "DELETE", "path": f"/api/tasks/{self.task.id}/"},
+                    {"method": "POST", "path": "/api/tasks/", "body": {"title": "X"}},
+                    {"method": "GET", "path": "/api/tasks/"},
+                ]
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        deleted, failed, listed = response.data["responses"]
+        self.assertEqual(deleted["status"], 204)
+        self.assertEqual(failed, {"status": 500, "body": {"detail": "Server error."}})
+        self.assertEqual(listed["body"]["count"], 0)
+
+    def test_unknown_path_is_not_found(self):
+        """Test that unresolvable paths fail on their own"""
+        response = self.batch(
+            [
+                {"method": "GET", "path": "/api/nowhere/"},
+                {"method": "GET", "path": "/api/tasks/"},
+            ]
+        )
+        statuses = [result["status"] for result in response.data["responses"]]
+        self.assertEqual(statuses, [404, 200])
+
+    def test_streams_and_nested_batches_are_refused(self):
+        """Test that endpoints that cannot be buffered are rejected"""
+        response = self.batch(
+            [
+                {"method": "GET", "path": "/api/tasks/events/"},
+                {"method": "POST", "path": "/api/batch/", "body": {"requests": []}},
+            ]
+        )
+        statuses = [result["status"] for result in response.data["responses"]]
+        self.assertEqual(statuses, [400, 400])
+
+    def test_only_api_paths(self):
+        """Test that sub-requests are limited to the API"""
+        response = self.batch([{"method": "GET", "path": "/admin/"}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_batch_size_is_capped(self):
+        """Test that batches above the configured size are rejected"""
+        response = self.batch([{"method": "GET", "path": "/api/tasks/"}] * 3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("requests", response.data)
+
+    def test_requires_authentication(self):
+        """Test that anonymous batches are rejected"""
+        self.client.force_authenticate(user=None)
+        response = self.batch([{"method": "GET", "path": "/api/tasks/"}])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TestParallelBatch(TransactionTestCase):
+    """Test suite for reads run on the thread pool (needs committed data)"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="parallel", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.titles = ["alpha", "bravo", "charlie"]
+        for title in self.titles:
+            Task.objects.create(user=self.user, title=title)
+
+    def test_parallel_reads_keep_request_order(self):
+        """Test that parallel reads come back in the order they were sent"""
+        requests = [
+            {"method": "GET", "path": f"/api/tasks/?search={title}"}
+            for title in self.titles
+        ]
+        response = self.client.post(
+            "/api/batch/", {"requests": requests, "parallel": True}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = [
+            result["body"]["results"][0]["title"]
+            for result in response.data["responses"]
+        ]
+        self.assertEqual(titles, self.titles)
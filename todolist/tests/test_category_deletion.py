@@ -0,0 +1,114 @@
+# Standard imports
+from io import StringIO
+from unittest.mock import patch
+
+# Django imports
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Task, TaskCategory, purge_category
+
+
+class TestCategoryDeletion(TestCase):
+    """Test suite for hiding categories and detaching their tasks in batches"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="deleter", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = TaskCategory.objects.create(user=self.user, name="Busy")
+        self.tasks = [
+            Task.objects.create(
+                user=self.user, title=f"Task {index}", category=self.category
+            )
+            for index in range(5)
+        ]
+
+    def delete_category(self):
+        with patch("todolist.views.run_in_background"):
+            return self.client.delete(f"/api/categories/{self.category.id}/")
+
+    def test_delete_hides_category_without_touching_tasks(self):
+        """Test that the request only marks the category as deleted"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.delete_category()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(
+            any('UPDATE "todolist_task"' in q["sql"] for q in queries.captured_queries)
+        )
+        self.assertEqual(Task.objects.filter(category=self.category).count(), 5)
+        response = self.client.get("/api/categories/")
+        self.assertEqual(response.data["results"], [])
+
+    def test_readers_never_see_deleted_category(self):
+        """Test that tasks of a category being deleted report no category"""
+        self.delete_category()
+        response = self.client.get(f"/api/tasks/{self.tasks[0].id}/")
+        self.assertIsNone(response.data["category"])
+        response = self.client.get("/api/tasks/")
+        self.assertTrue(all(t["category"] is None for t in response.data["results"]))
+
+    def test_cannot_assign_deleted_category(self):
+        """Test that a category being deleted cannot receive new tasks"""
+        self.delete_category()
+        response = self.client.post(
+            "/api/tasks/", {"title": "Late", "category": self.category.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("category", response.data)
+
+    def test_name_can_be_reused_while_deleting(self):
+        """Test that the name is free again as soon as deletion starts"""
+        self.delete_category()
+        response = self.client.post("/api/categories/", {"name": "Busy"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_deletion_status_reports_progress(self):
+        """Test the status endpoint before, during and after the purge"""
+        url = f"/api/categories/{self.category.id}/deletion-status/"
+        response = self.client.get(url)
+        self.assertEqual(response.data["status"], "active")
+        self.delete_category()
+        response = self.client.get(url)
+        self.assertEqual(response.data["status"], "deleting")
+        self.assertEqual(response.data["remaining_tasks"], 5)
+        purge_category(self.category.id)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_purge_detaches_tasks_in_batches(self):
+        """Test that the purge issues one bounded UPDATE per batch"""
+        self.category.mark_deleted()
+        with CaptureQueriesContext(connection) as queries:
+            cleared = purge_category(self.category.id, batch_size=2)
+        self.assertEqual(cleared, 5)
+        updates = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith('UPDATE "todolist_task"') and '"id" IN' in q["sql"]
+        ]
+        self.assertEqual(len(updates), 3)
+        self.assertFalse(Task.objects.filter(category_id=self.category.id).exists())
+        self.assertEqual(Task.objects.count(), 5)
+        self.assertFalse(TaskCategory.objects.filter(id=self.category.id).exists())
+
+    def test_purge_leaves_live_categories_alone(self):
+        """Test that purging a category that was not deleted keeps the row"""
+        purge_category(self.category.id)
+        self.assertTrue(TaskCategory.objects.filter(id=self.category.id).exists())
+
+    def test_purge_command_finishes_interrupted_deletions(self):
+        """Test that the command purges every category marked as deleted"""
+        self.category.mark_deleted()
+        out = StringIO()
+        call_command("purge_categories", "--batch-size", "2", stdout=out)
+        self.assertIn("detached 5 task(s)", out.getvalue())
+        self.assertFalse(TaskCategory.objects.filter(id=self.category.id).exists())
@@ -1,3 +1,6 @@
+# Standard imports
+from unittest.mock import patch
+
 # Django imports
 from django.test import TestCase
 from django.contrib.auth.models import User
@@ -7,7 +10,7 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 # App imports
-from todolist.models import TaskCategory
+from todolist.models import Task, TaskCategory, purge_category
 
 
 class TestTaskCategoryView(TestCase):
@@ -17,8 +20,9 @@ class TestTaskCategoryView(TestCase):
         self.user = User.objects.create_user(
             username="categoryuser", password="pass123"
         )
+        self.other = User.objects.create_user(username="otheruser", password="pass123")
         self.client = APIClient()
-        self.category = TaskCategory.objects.create(name="Work")
+        self.category = TaskCategory.objects.create(user=self.user, name="Work")
 
     def test_category_creation(self):
         """Test that created categories are associated with the authenticated user"""
@@ -28,22 +32,85 @@ class TestTaskCategoryView(TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         category = TaskCategory.objects.get(id=response.data["id"])
         self.assertEqual(category.name, "New Category")
+        self.assertEqual(category.user, self.user)
+
+    def test_category_names_are_unique_per_user(self):
+        """Test that a name can be reused by another user but not by its owner"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post("/api/categories/", {"name": "Work"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.other)
+        response = self.client.post("/api/categories/", {"name": "Work"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
     def test_custom_delete_category(self):
         """Test custom delete action for categories"""
         self.client.force_authenticate(user=self.user)
-        category = TaskCategory.objects.create(name="To Delete")
+        category = TaskCategory.objects.create(user=self.user, name="To Delete")
         url = f"/api/categories/{category.id}/delete/"
+        with patch("todolist.views.run_in_background") as run_in_background:
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        run_in_background.assert_called_once_with(
+            purge_category, category.id, batch_size=1000
+        )
+        category.refresh_from_db()
+        self.assertTrue(category.is_deleted)
+        response = self.client.get(f"/api/categories/{category.id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cannot_delete_other_users_category(self):
+        """Test that another user's category is not found"""
+        self.client.force_authenticate(user=self.other)
+        url = f"/api/categories/{self.category.id}/delete/"
         response = self.client.delete(url)
-        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertFalse(TaskCategory.objects.filter(id=category.id).exists())
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(TaskCategory.objects.filter(id=self.category.id).exists())
 
     def test_get_all_categories(self):
-        """Test fetching all categories"""
+        """Test fetching the user's categories"""
         self.client.force_authenticate(user=self.user)
-        TaskCategory.objects.create(name="Personal")
+        TaskCategory.objects.create(user=self.user, name="Personal")
+        TaskCategory.objects.create(user=self.other, name="Hidden")
         response = self.client.get("/api/categories/all/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        self.assertEqual(response.data[0]["name"], "Work")
-        self.assertEqual(response.data[1]["name"], "Personal")
+        names = [category["name"] for category in response.data["results"]]
+        self.assertEqual(names, ["Personal", "Work"])
+
+    def test_categories_are_cursor_paginated(self):
+        """Test that following the cursor walks every category exactly once"""
+        self.client.force_authenticate(user=self.user)
+        for index in range(4):
+            TaskCategory.objects.create(user=self.user, name=f"Category {index}")
+        names = []
+        url = "/api/categories/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            names += [category["name"] for category in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(len(names), 5)
+
+    def test_category_task_counts(self):
+        """Test that each category reports how many tasks it holds"""
+        self.client.force_authenticate(user=self.user)
+        empty = TaskCategory.objects.create(user=self.user, name="Empty")
+        for index in range(3):
+            Task.objects.create(
+                user=self.user, title=f"Task {index}", category=self.category
+            )
+        response = self.client.get("/api/categories/")
+        counts = {c["id"]: c["task_count"] for c in response.data["results"]}
+        self.assertEqual(counts, {self.category.id: 3, empty.id: 0})
+
+    def test_task_rejects_other_users_category(self):
+        """Test that tasks cannot be filed under another user's category"""
+        self.client.force_authenticate(user=self.other)
+        response = self.client.post(
+            "/api/tasks/", {"title": "Sneaky", "category": self.category.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("category", response.data)
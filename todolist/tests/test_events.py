@@ -0,0 +1,262 @@
+# Standard imports
+import asyncio
+import json
+import threading
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+# External imports
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+# App imports
+from todolist.events import (
+    EVENT_FIELDS,
+    BaseEventBroker,
+    LocalEventBroker,
+    get_event_broker,
+)
+from todolist.models import Task
+
+
+def subset(representation):
+    """The EVENT_FIELDS of a task's API representation"""
+    return {name: representation[name] for name in EVENT_FIELDS}
+
+
+class RecordingEventBroker(BaseEventBroker):
+    """Stand-in broker that keeps every published event"""
+
+    def __init__(self):
+        self.events = []
+
+    def publish(self, user_id, event):
+        self.events.append((user_id, event))
+
+
+@override_settings(
+    TODOLIST_EVENT_BROKER="todolist.tests.test_events.RecordingEventBroker"
+)
+class TestTaskEvents(TestCase):
+    """Test suite for the events published when tasks change"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="streamer", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(user=self.user, title="Watched")
+        self.broker = get_event_broker()
+        self.broker.events.clear()
+
+    def published(self):
+        return [event for _, event in self.broker.events]
+
+    def test_create_publishes_task(self):
+        """Test that a created task is published with the fields the list shows"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/tasks/", {"title": "Fresh"})
+        [event] = self.published()
+        self.assertEqual(event["type"], "created")
+        self.assertEqual(event["id"], response.data["id"])
+        self.assertEqual(
+            event["task"], {"id": response.data["id"], **subset(response.data)}
+        )
+        self.assertEqual(self.broker.events[0][0], self.user.id)
+
+    def test_toggle_publishes_compact_event(self):
+        """Test that toggling publishes only the completion fields"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/tasks/{self.task.id}/toggle-complete/")
+        [event] = self.published()
+        self.assertEqual(event["type"], "toggled")
+        self.assertTrue(event["completed"])
+        self.assertIsNotNone(event["completed_at"])
+        self.assertNotIn("task", event)
+
+    def test_update_publishes_changed_fields(self):
+        """Test that an update publishes only the fields it changed"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/tasks/{self.task.id}/", {"title": "Renamed"})
+        [event] = self.published()
+        self.assertEqual(
+            event,
+            {
+                "type": "updated",
+                "id": self.task.id,
+                "changes": {"title": "Renamed", "version": 2},
+            },
+        )
+
+    def test_move_publishes_position_and_version(self):
+        """Test that a reorder reaches other tabs and outdates their version"""
+        other = Task.objects.create(user=self.user, title="Neighbour")
+        self.broker.events.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/tasks/{self.task.id}/move/", {"before": other.id}
+            )
+        [event] = self.published()
+        self.assertEqual(
+            event["changes"],
+            {"position": response.data["position"], "version": 2},
+        )
+        stale = self.client.patch(
+            f"/api/tasks/{self.task.id}/", {"title": "Stale", "version": 1}
+        )
+        self.assertEqual(stale.status_code, 409)
+
+    def test_delete_publishes_id(self):
+        """Test that a deletion publishes the id of the removed task"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/tasks/{self.task.id}/")
+        self.assertEqual(self.published(), [{"type": "deleted", "id": self.task.id}])
+
+    def test_rolled_back_write_is_not_published(self):
+        """Test that events are only published for committed changes"""
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Task.objects.create(user=self.user, title="Doomed")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(self.published(), [])
+
+
+@override_settings(
+    TODOLIST_EVENT_BROKER="todolist.tests.test_events.RecordingEventBroker"
+)
+class TestAdminActionEvents(TestCase):
+    """Test suite for the events published by the admin bulk actions"""
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username="boss", password="pass123")
+        self.tasks = [
+            Task.objects.create(user=self.user, title=f"Bulk {index}")
+            for index in range(2)
+        ]
+        self.client.force_login(self.user)
+        self.broker = get_event_broker()
+        self.broker.events.clear()
+
+    def run_action(self, action, **extra):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("admin:todolist_task_changelist"),
+                {
+                    "action": action,
+                    "_selected_action": [task.pk for task in self.tasks],
+                    **extra,
+                },
+            )
+        return sorted((event for _, event in self.broker.events), key=lambda e: e["id"])
+
+    def test_completion_actions_publish_toggles(self):
+        """Test that bulk completion publishes a toggle per changed task"""
+        events = self.run_action("mark_completed")
+        self.assertEqual([event["id"] for event in events], [t.pk for t in self.tasks])
+        self.assertTrue(all(event["type"] == "toggled" for event in events))
+        self.assertTrue(all(event["completed"] for event in events))
+
+    def test_bulk_updates_publish_changes(self):
+        """Test that bulk updates publish the field they set"""
+        events = self.run_action("set_priority", priority="high")
+        self.assertEqual([event["type"] for event in events], ["updated", "updated"])
+        self.assertEqual(events[0]["changes"], {"priority": "high"})
+
+    def test_chunked_delete_publishes_ids(self):
+        """Test that the chunked delete announces every removed task"""
+        events = self.run_action("delete_in_chunks")
+        self.assertEqual(
+            events, [{"type": "deleted", "id": task.pk} for task in self.tasks]
+        )
+
+
+class TestLocalEventBroker(SimpleTestCase):
+    """Test suite for the in-process fan-out of events"""
+
+    async def test_events_reach_only_the_owner(self):
+        """Test that events published from another thread reach the user's streams"""
+        broker = LocalEventBroker()
+        mine = broker.subscribe(1)
+        also_mine = broker.subscribe(1)
+        theirs = broker.subscribe(2)
+
+        publisher = threading.Thread(
+            target=broker.publish, args=(1, {"type": "deleted", "id": 7})
+        )
+        publisher.start()
+        publisher.join()
+
+        self.assertEqual(await mine.get(1), {"type": "deleted", "id": 7})
+        self.assertEqual(await also_mine.get(1), {"type": "deleted", "id": 7})
+        self.assertIsNone(await theirs.get(0.01))
+
+    async def test_overflow_asks_for_resync(self):
+        """Test that a reader that falls behind gets a single resync event"""
+        broker = LocalEventBroker(queue_size=2)
+        subscription = broker.subscribe(1)
+        for index in range(5):
+            broker.publish(1, {"type": "deleted", "id": index})
+        await asyncio.sleep(0)
+        self.assertEqual(await subscription.get(1), {"type": "resync"})
+        self.assertIsNone(await subscription.get(0.01))
+
+    async def test_unsubscribe_stops_delivery(self):
+        """Test that closed streams are forgotten by the broker"""
+        broker = LocalEventBroker()
+        subscription = broker.subscribe(1)
+        broker.unsubscribe(subscription)
+        self.assertFalse(broker.has_subscribers(1))
+        self.assertEqual(broker.publish(1, {"type": "deleted", "id": 1}), 0)
+
+
+class TestTaskEventStream(TestCase):
+    """Test suite for the server-sent events endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="listener", password="pass123")
+
+    def test_stream_requires_asgi(self):
+        """Test that WSGI requests are refused instead of buffered forever"""
+        response = self.client.get("/api/tasks/events/")
+        self.assertEqual(response.status_code, 501)
+
+    async def test_invalid_token_is_rejected(self):
+        """Test that the stream requires a valid access token cookie"""
+        response = await self.async_client.get("/api/tasks/events/")
+        self.assertEqual(response.status_code, 401)
+        self.async_client.cookies["access_token"] = "nope"
+        response = await self.async_client.get("/api/tasks/events/")
+        self.assertEqual(response.status_code, 401)
+
+    async def test_token_in_url_is_ignored(self):
+        """Test that a token in the query string, which proxies log, is refused"""
+        token = AccessToken.for_user(self.user)
+        response = await self.async_client.get(f"/api/tasks/events/?token={token}")
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(TASK_EVENTS_HEARTBEAT_SECONDS=0.05, TASK_EVENTS_MAX_SECONDS=0.5)
+    async def test_stream_delivers_published_events(self):
+        """Test that events published for the user are written to the stream"""
+        self.async_client.cookies["access_token"] = str(AccessToken.for_user(self.user))
+        response = await self.async_client.get("/api/tasks/events/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b"retry: 3000\n\n")
+
+        get_event_broker().publish(self.user.id, {"type": "deleted", "id": 42})
+        chunk = (await anext(chunks)).decode()
+        self.assertTrue(chunk.startswith("event: deleted\n"))
+        data = chunk.split("data: ", 1)[1]
+        self.assertEqual(json.loads(data), {"type": "deleted", "id": 42})
+
+        # Idle streams send heartbeats, then end so the client reconnects
+        rest = [part async for part in chunks]
+        self.assertIn(b": keep-alive\n\n", rest)
+        self.assertFalse(get_event_broker().has_subscribers(self.user.id))
@@ -0,0 +1,112 @@
+# Standard imports
+from datetime import timedelta
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Task, TaskCategory
+
+
+class TestTaskFacets(TestCase):
+    """Test suite for the facet counts of the task filter sidebar"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="faceter", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        today = timezone.localdate()
+        self.work = TaskCategory.objects.create(user=self.user, name="Work")
+        self.home = TaskCategory.objects.create(user=self.user, name="Home")
+        with self.captureOnCommitCallbacks(execute=True):
+            for title, priority, category, due, completed in [
+                ("Report", "high", self.work, today - timedelta(days=1), False),
+                ("Invoice", "high", self.work, today + timedelta(days=2), False),
+                ("Slides", "low", self.work, today + timedelta(days=30), True),
+                ("Dishes", "medium", self.home, None, False),
+                ("Plants", "low", None, today - timedelta(days=3), True),
+            ]:
+                Task.objects.create(
+                    user=self.user,
+                    title=title,
+                    priority=priority,
+                    category=category,
+                    due_date=due,
+                    completed=completed,
+                )
+        other = User.objects.create_user(username="other", password="pass123")
+        Task.objects.create(user=other, title="Foreign", priority="high")
+
+    def facets(self, query=""):
+        response = self.client.get(f"/api/tasks/facets/{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_counts_every_facet(self):
+        """Test the counts per priority, category, status and due bucket"""
+        data = self.facets()
+        self.assertEqual(data["total"], 5)
+        self.assertEqual(data["priority"], {"low": 2, "medium": 1, "high": 2})
+        self.assertEqual(
+            data["category"],
+            [
+                {"id": self.home.id, "name": "Home", "count": 1},
+                {"id": self.work.id, "name": "Work", "count": 3},
+                {"id": None, "name": None, "count": 1},
+            ],
+        )
+        self.assertEqual(data["status"], {"completed": 2, "pending": 3})
+        self.assertEqual(
+            data["due"],
+            {"overdue": 1, "due_this_week": 1, "due_later": 1, "no_due_date": 1},
+        )
+
+    def test_counts_follow_filters_and_search(self):
+        """Test that facets describe only the tasks matching the request"""
+        data = self.facets("?priority=high")
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(data["status"], {"completed": 0, "pending": 2})
+
+        data = self.facets("?search=Dishes")
+        self.assertEqual(data["total"], 1)
+        self.assertEqual(data["category"][0]["name"], "Home")
+
+    def test_one_grouped_query(self):
+        """Test that all counts come from a single grouped query"""
+        with CaptureQueriesContext(connection) as queries:
+            self.facets()
+        grouped = [query for query in queries if "GROUP BY" in query["sql"]]
+        self.assertEqual(len(grouped), 1)
+        # The other query only looks up the names of the counted categories
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("JOIN", grouped[0]["sql"])
+
+    def test_cached_until_the_data_changes(self):
+        """Test that repeated reads hit the cache and writes retire it"""
+        self.facets()
+        with self.assertNumQueries(0):
+            self.facets()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/tasks/", {"title": "New", "priority": "low"})
+        self.assertEqual(self.facets()["priority"]["low"], 3)
+
+        task = Task.objects.get(title="Dishes")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/tasks/{task.id}/toggle-complete/")
+        self.assertEqual(self.facets()["status"]["completed"], 3)
+
+    def test_deleted_category_counts_as_uncategorized(self):
+        """Test that tasks of a category being deleted have no category"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.home.mark_deleted()
+        categories = self.facets()["category"]
+        self.assertEqual(categories[-1], {"id": None, "name": None, "count": 2})
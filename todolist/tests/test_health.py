@@ -0,0 +1,79 @@
+# Standard imports
+import time
+from unittest import mock
+
+# Django imports
+from django.test import TestCase, override_settings
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist import health
+
+
+class TestHealthProbes(TestCase):
+    """Test suite for the liveness and readiness probes"""
+
+    def setUp(self):
+        health.forget_readiness()
+        self.addCleanup(health.forget_readiness)
+        self.client = APIClient()
+
+    def test_healthz_does_no_io(self):
+        """Test that liveness answers without queries or a session"""
+        with self.assertNumQueries(0):
+            response = self.client.get("/healthz")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"ok")
+        self.assertNotIn("sessionid", response.cookies)
+        self.assertNotIn("Vary", response)
+
+    def test_readyz_reports_every_check(self):
+        """Test a ready instance with its database and cache checks"""
+        response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {"status": "ok", "checks": {"database:default": "ok", "cache": "ok"}},
+        )
+
+    def test_unapplied_migrations_are_not_ready(self):
+        """Test that a migration missing from the database fails readiness"""
+        nodes = {**health.migration_nodes(), ("todolist", "9999_future"): ()}
+        with mock.patch("todolist.health.migration_nodes", return_value=nodes):
+            response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(
+            response.json()["checks"]["database:default"], "1 unapplied migration"
+        )
+
+    @override_settings(TODOLIST_READYZ_TIMEOUT_SECONDS=0.05)
+    def test_slow_checks_time_out(self):
+        """Test that a hanging dependency fails readiness within the timeout"""
+        with mock.patch("todolist.health.check_cache", lambda: time.sleep(1)):
+            started = time.monotonic()
+            response = self.client.get("/readyz")
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()["checks"]["cache"], "timeout")
+
+    def test_result_is_reused_for_a_few_seconds(self):
+        """Test that probes in quick succession run the checks once"""
+        with mock.patch(
+            "todolist.health.run_checks", return_value={"cache": "ok"}
+        ) as run_checks:
+            for _ in range(5):
+                self.client.get("/readyz")
+        run_checks.assert_called_once()
+
+    def test_probes_are_not_throttled(self):
+        """Test that probes neither get throttled nor use the anon budget"""
+        for _ in range(15):
+            self.assertEqual(self.client.get("/healthz").status_code, 200)
+            self.assertEqual(self.client.get("/readyz").status_code, 200)
+        response = self.client.post(
+            "/api/accounts/login/", {"username": "nobody", "password": "nope"}
+        )
+        self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,271 @@
+# Standard imports
+import threading
+from datetime import timedelta
+from unittest.mock import patch
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist import idempotency
+from todolist.models import IdempotencyKey, Task
+from todolist.views import TaskViewSet
+
+
+class TestIdempotencyKeys(TestCase):
+    """Test suite for retried task writes sent with an Idempotency-Key"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="retrier", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(user=self.user, title="Flip me")
+
+    def create(self, key, title="Once"):
+        return self.client.post(
+            "/api/tasks/", {"title": title}, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def toggle(self, key):
+        return self.client.post(
+            f"/api/tasks/{self.task.id}/toggle-complete/", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_replayed_create_returns_stored_response(self):
+        """Test that a retried create returns the first response without a new task"""
+        first = self.create("create-1")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with patch.object(TaskViewSet, "get_serializer") as get_serializer:
+            second = self.create("create-1")
+        get_serializer.assert_not_called()
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Task.objects.filter(title="Once").count(), 1)
+
+    def test_replayed_toggle_flips_once(self):
+        """Test that a retried toggle does not undo the first one"""
+        first = self.toggle("toggle-1")
+        second = self.toggle("toggle-1")
+        self.assertEqual(second.json(), first.json())
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.completed)
+
+        # A new key is a new toggle
+        self.toggle("toggle-2")
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.completed)
+
+    def test_requests_without_key_are_not_stored(self):
+        """Test that the header is opt-in"""
+        self.client.post("/api/tasks/", {"title": "Plain"}, format="json")
+        self.client.post("/api/tasks/", {"title": "Plain"}, format="json")
+        self.assertEqual(Task.objects.filter(title="Plain").count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_key_reused_for_other_request_is_rejected(self):
+        """Test that a key cannot be replayed against a different body"""
+        self.create("shared")
+        response = self.create("shared", title="Other")
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertFalse(Task.objects.filter(title="Other").exists())
+
+    def test_failed_request_releases_key(self):
+        """Test that errors are not stored, so the client can retry"""
+        response = self.create("retry-me", title="")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        missing = self.client.post(
+            "/api/tasks/999999/toggle-complete/", HTTP_IDEMPOTENCY_KEY="gone"
+        )
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_keys_are_scoped_per_user(self):
+        """Test that two users may pick the same key"""
+        self.create("mine")
+        other = User.objects.create_user(username="other", password="pass123")
+        self.client.force_authenticate(user=other)
+        response = self.create("mine")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.filter(title="Once").count(), 2)
+
+    @override_settings(IDEMPOTENCY_KEY_TTL_SECONDS=60)
+    def test_expired_key_runs_again(self):
+        """Test that keys are only remembered for the configured TTL"""
+        self.create("old")
+        record = IdempotencyKey.objects.get(key="old")
+        self.assertAlmostEqual(
+            record.expires_at,
+            timezone.now() + timedelta(seconds=60),
+            delta=timedelta(seconds=5),
+        )
+        IdempotencyKey.objects.update(expires_at=timezone.now())
+        self.create("old")
+        self.assertEqual(Task.objects.filter(title="Once").count(), 2)
+
+    @override_settings(IDEMPOTENCY_KEY_LEASE_SECONDS=30)
+    def test_unfinished_claim_lapses_after_its_lease(self):
+        """Test that a claim whose worker died stops blocking the key"""
+        IdempotencyKey.objects.create(
+            user=self.user,
+            key="orphan",
+            fingerprint="x" * 64,
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        response = self.create("orphan")
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        IdempotencyKey.objects.update(claimed_at=timezone.now() - timedelta(seconds=31))
+        response = self.create("orphan")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.filter(title="Once").count(), 1)
+
+    @override_settings(IDEMPOTENCY_KEY_LEASE_SECONDS=30)
+    def test_duplicate_in_progress_is_told_when_to_retry(self):
+        """Test that a 409 for a running request says when its lease runs out"""
+        self.create("busy")
+        IdempotencyKey.objects.update(
+            status_code=None, claimed_at=timezone.now() - timedelta(seconds=10)
+        )
+        response = self.create("busy")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn(int(response["Retry-After"]), (20, 21))
+
+    def released_by_failing_winner(self, times):
+        """
+        Make the next ``times`` claims lose their INSERT to a row that is
+        gone by the time they read it, as when the winner's view fails
+        """
+        create = IdempotencyKey.objects.create
+        losses = iter(range(times))
+
+        def claim(**fields):
+            if next(losses, None) is not None:
+                raise IntegrityError("duplicate key value")
+            return create(**fields)
+
+        return patch.object(IdempotencyKey.objects, "create", side_effect=claim)
+
+    def test_key_released_before_the_duplicate_reads_it(self):
+        """Test that a duplicate claims a key its failed winner just released"""
+        with self.released_by_failing_winner(1):
+            response = self.create("released")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.filter(title="Once").count(), 1)
+
+    def test_key_changing_hands_is_in_progress(self):
+        """Test that a duplicate losing both claims is told to retry"""
+        with self.released_by_failing_winner(2):
+            response = self.create("churning")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(Task.objects.filter(title="Once").exists())
+
+    def test_oversized_key_is_rejected(self):
+        """Test that keys longer than the stored column are refused"""
+        response = self.create("k" * 256)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestConcurrentIdempotencyKeys(TransactionTestCase):
+    """Test suite for duplicates that arrive while the first is still running"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="racer", password="pass123")
+
+    def post(self, results, key="race"):
+        # Failed requests come back as 500s: the test client's exception hook
+        # is shared between threads and would blame the wrong one
+        client = APIClient(raise_request_exception=False)
+        client.force_authenticate(user=self.user)
+        try:
+            results.append(
+                client.post(
+                    "/api/tasks/",
+                    {"title": "Raced"},
+                    format="json",
+                    HTTP_IDEMPOTENCY_KEY=key,
+                )
+            )
+        finally:
+            connections.close_all()
+
+    def test_duplicate_during_first_request_is_refused(self):
+        """Test that a duplicate is answered 409 while the original runs"""
+        entered, release = threading.Event(), threading.Event()
+        perform_create = TaskViewSet.perform_create
+
+        def slow_perform_create(view, serializer):
+            entered.set()
+            release.wait(5)
+            perform_create(view, serializer)
+
+        first = []
+        with patch.object(TaskViewSet, "perform_create", slow_perform_create):
+            thread = threading.Thread(target=self.post, args=(first,))
+            thread.start()
+            self.assertTrue(entered.wait(5))
+
+            duplicate = []
+            self.post(duplicate)
+            release.set()
+            thread.join()
+
+        self.assertEqual(duplicate[0].status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(first[0].status_code, status.HTTP_201_CREATED)
+        retry = []
+        self.post(retry)
+        self.assertEqual(retry[0].json(), first[0].json())
+        self.assertEqual(Task.objects.filter(title="Raced").count(), 1)
+
+    def test_simultaneous_duplicates_create_one_task(self):
+        """Test that of racing duplicates exactly one runs, the rest get 409"""
+        barrier = threading.Barrier(4)
+        # SQLite refuses concurrent writers ("table is locked"): take the
+        # claims one at a time, the race for the key is the same
+        claiming = threading.Lock()
+        answered = threading.Semaphore(0)
+        results = []
+        claim_key = idempotency.claim_key
+        perform_create = TaskViewSet.perform_create
+
+        def serialized_claim_key(*args):
+            with claiming:
+                return claim_key(*args)
+
+        def perform_create_after_duplicates(view, serializer):
+            # Keep the winner running until every duplicate has its answer
+            for _ in range(3):
+                self.assertTrue(answered.acquire(timeout=5))
+            perform_create(view, serializer)
+
+        def post_together():
+            barrier.wait()
+            self.post(results)
+            answered.release()
+
+        with patch.object(idempotency, "claim_key", serialized_claim_key), patch.object(
+            TaskViewSet, "perform_create", perform_create_after_duplicates
+        ):
+            threads = [threading.Thread(target=post_together) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        statuses = sorted(response.status_code for response in results)
+        self.assertEqual(statuses, [201, 409, 409, 409])
+        created = next(response for response in results if response.status_code == 201)
+        self.assertEqual(
+            list(Task.objects.filter(title="Raced").values_list("id", flat=True)),
+            [created.json()["id"]],
+        )
@@ -0,0 +1,84 @@
+# Standard imports
+import json
+from io import StringIO
+
+# Django imports
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+# App imports
+from todolist.loadtest import Stats, percentile, report_warnings
+from todolist.models import Task
+
+
+class TestLoadTest(TestCase):
+    """Test suite for the built-in load generator"""
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command("loadtest", *args, stdout=out)
+        return out.getvalue()
+
+    def test_percentiles_use_nearest_rank(self):
+        """Test the percentiles reported for a known set of latencies"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 50))
+
+    def test_errors_are_counted_by_status(self):
+        """Test that failed requests are reported per status code"""
+        stats = Stats()
+        stats.add("GET /api/tasks/", 0.010, 200)
+        stats.add("GET /api/tasks/", 0.020, 429)
+        stats.add("GET /api/tasks/", 0.030, None)
+        [row, total] = stats.summary(elapsed=1.0)
+        self.assertEqual(row["errors"], 2)
+        self.assertEqual(row["error_statuses"], {"429": 1, "network": 1})
+        self.assertEqual(total["throughput"], 3.0)
+
+    def test_mostly_throttled_run_is_flagged(self):
+        """Test that the report warns when 429s are most of the errors"""
+        stats = Stats()
+        stats.add("GET /api/tasks/", 0.010, 200)
+        stats.add("GET /api/tasks/", 0.020, 429)
+        stats.add("GET /api/tasks/", 0.030, 429)
+        stats.add("GET /api/tasks/", 0.040, 500)
+        [warning] = report_warnings(stats.summary(elapsed=1.0))
+        self.assertIn("2 of 4 requests were throttled", warning)
+
+        stats.add("GET /api/tasks/", 0.050, 500)
+        stats.add("GET /api/tasks/", 0.060, 500)
+        self.assertEqual(report_warnings(stats.summary(elapsed=1.0)), [])
+
+    def test_in_process_run_reports_every_endpoint(self):
+        """Test a seeded in-process run logging in with a real JWT"""
+        report = json.loads(
+            self.run_command(
+                "--requests=40", "--concurrency=1", "--users=1", "--seed=7", "--json"
+            )
+        )
+        rows = {row["endpoint"]: row for row in report["endpoints"]}
+        self.assertEqual(rows["POST /api/accounts/login/"]["requests"], 1)
+        self.assertEqual(rows["Total"]["requests"], 41)
+        self.assertEqual(rows["Total"]["errors"], 0)
+        self.assertEqual(report["warnings"], [])
+        for endpoint in ("POST /api/tasks/", "GET /api/tasks/"):
+            self.assertGreater(rows[endpoint]["requests"], 0)
+            self.assertIsNotNone(rows[endpoint]["p99_ms"])
+        user = User.objects.get(username="loadtest-0")
+        self.assertTrue(Task.objects.filter(user=user).exists())
+
+    def test_table_output(self):
+        """Test that the default report is a table with a total row"""
+        output = self.run_command("--requests=5", "--concurrency=1", "--users=1")
+        self.assertIn("p95 ms", output)
+        self.assertIn("Total", output)
+
+    def test_unknown_operation_is_rejected(self):
+        """Test that the mix only accepts known operations"""
+        with self.assertRaises(CommandError):
+            self.run_command("--requests=5", "--mix=create=1,explode=2")
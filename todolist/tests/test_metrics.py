@@ -0,0 +1,149 @@
+# Standard imports
+import json
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Django imports
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist import metrics
+
+
+@override_settings(TODOLIST_METRICS_TOKEN="scrape-me")
+class TestMetrics(TestCase):
+    """Test suite for the Prometheus metrics endpoint"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings = override_settings(TODOLIST_METRICS_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+        self.user = User.objects.create_user(username="measured", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def scrape(self):
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-me")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode()
+
+    def value(self, text, sample):
+        for line in text.splitlines():
+            if line.startswith(sample + " "):
+                return float(line.rsplit(" ", 1)[1])
+        return None
+
+    def test_endpoint_is_protected(self):
+        """Test that metrics need the scraper token or a staff session"""
+        anonymous = APIClient()
+        self.assertEqual(anonymous.get("/metrics").status_code, 403)
+        response = anonymous.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 403)
+        staff = User.objects.create_user(
+            username="ops", password="pass123", is_staff=True
+        )
+        anonymous.force_login(staff)
+        self.assertEqual(anonymous.get("/metrics").status_code, 200)
+
+    def test_request_latency_and_queries_per_view(self):
+        """Test the latency histogram and query counters of a view"""
+        self.client.get("/api/tasks/")
+        text = self.scrape()
+        labels = 'view="task-list",method="GET",status="200"'
+        self.assertEqual(
+            self.value(
+                text, f"todolist_http_request_duration_seconds_count{{{labels}}}"
+            ),
+            1,
+        )
+        self.assertEqual(
+            self.value(
+                text,
+                f'todolist_http_request_duration_seconds_bucket{{{labels},le="+Inf"}}',
+            ),
+            1,
+        )
+        self.assertGreater(
+            self.value(text, 'todolist_db_queries_total{view="task-list"}'), 0
+        )
+        self.assertIn('todolist_db_query_seconds_total{view="task-list"}', text)
+
+    def test_cache_hits_and_misses(self):
+        """Test that per-user cache lookups are counted"""
+        self.client.get("/api/tasks/facets/")
+        self.client.get("/api/tasks/facets/")
+        text = self.scrape()
+        self.assertEqual(
+            self.value(text, 'todolist_cache_misses_total{cache="task-facets"}'), 1
+        )
+        self.assertEqual(
+            self.value(text, 'todolist_cache_hits_total{cache="task-facets"}'), 1
+        )
+
+    def test_login_failures_and_throttling(self):
+        """Test the failed login and throttle rejection counters"""
+        anonymous = APIClient()
+        for _ in range(11):
+            response = anonymous.post(
+                "/api/accounts/login/", {"username": "measured", "password": "nope"}
+            )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        text = self.scrape()
+        self.assertEqual(self.value(text, "todolist_login_failures_total"), 10)
+        self.assertEqual(
+            self.value(text, 'todolist_throttled_requests_total{view="user-login"}'), 1
+        )
+
+    def write_worker(self, pid, started, failures):
+        """Write a worker file holding ``failures`` failed logins"""
+        path = self.directory / f"metrics-{pid}-{started}.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "counters": [["todolist_login_failures_total", [], failures]],
+                    "histograms": [],
+                }
+            )
+        )
+        return path
+
+    def test_workers_are_added_up(self):
+        """Test that the values written by other worker processes are summed"""
+        # PID 1 never exits, so its file is read as a live worker's
+        live = self.write_worker(1, 0, 4)
+        metrics.inc("todolist_login_failures_total")
+        self.assertEqual(self.value(self.scrape(), "todolist_login_failures_total"), 5)
+        self.assertTrue(live.exists())
+
+    def test_exited_workers_are_archived(self):
+        """Test that exited workers' files are merged once, never lost or recounted"""
+        process = subprocess.Popen(["true"])
+        process.wait()
+        exited = self.write_worker(process.pid, 0, 4)
+        # An earlier process that had this process's pid
+        reused = self.write_worker(os.getpid(), 0, 2)
+        metrics.inc("todolist_login_failures_total")
+        for _ in range(2):
+            self.assertEqual(
+                self.value(self.scrape(), "todolist_login_failures_total"), 7
+            )
+        self.assertFalse(exited.exists())
+        self.assertFalse(reused.exists())
+        self.assertEqual(
+            sorted(path.name for path in self.directory.glob("*.json")),
+            ["archive.json", f"metrics-{os.getpid()}-{metrics._started}.json"],
+        )
@@ -0,0 +1,87 @@
+# Standard imports
+from datetime import date
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.filters import TaskOrderingFilter
+from todolist.models import Task
+
+
+class TestTaskOrdering(TestCase):
+    """Test suite for the whitelisted, index-backed task orderings"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="sorter", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        for title, priority, due, completed in [
+            ("Undated", "high", None, False),
+            ("Late", "low", date(2024, 3, 1), False),
+            ("Soon", "medium", date(2024, 1, 1), False),
+            ("Done", "high", date(2023, 12, 1), True),
+        ]:
+            Task.objects.create(
+                user=self.user,
+                title=title,
+                priority=priority,
+                due_date=due,
+                completed=completed,
+            )
+
+    def titles(self, ordering):
+        response = self.client.get(f"/api/tasks/?ordering={ordering}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task["title"] for task in response.data["results"]]
+
+    def test_priority_sorts_by_severity(self):
+        """Test that priority sorts low < medium < high, not alphabetically"""
+        self.assertEqual(self.titles("priority"), ["Late", "Soon", "Undated", "Done"])
+        self.assertEqual(self.titles("-priority"), ["Done", "Undated", "Soon", "Late"])
+
+    def test_priority_is_still_a_string(self):
+        """Test that the API reads and writes priority names"""
+        response = self.client.post("/api/tasks/", {"title": "New", "priority": "low"})
+        self.assertEqual(response.data["priority"], "low")
+        self.assertEqual(Task.objects.get(title="New").priority, "low")
+        self.assertEqual(Task.objects.filter(priority="high").count(), 2)
+        response = self.client.get("/api/tasks/?priority=medium")
+        self.assertEqual([task["title"] for task in response.data["results"]], ["Soon"])
+
+    def test_search_matches_priority_names(self):
+        """Test that search still matches the priority name"""
+        response = self.client.get("/api/tasks/?search=hig")
+        self.assertEqual(response.data["count"], 2)
+
+    def test_due_date_puts_undated_tasks_last(self):
+        """Test that tasks without a due date sort after the dated ones"""
+        self.assertEqual(self.titles("due_date"), ["Done", "Soon", "Late", "Undated"])
+
+    def test_completed_then_due_date(self):
+        """Test the pending-first ordering by due date"""
+        self.assertEqual(
+            self.titles("completed,due_date"), ["Soon", "Late", "Undated", "Done"]
+        )
+
+    def test_unknown_ordering_is_rejected(self):
+        """Test that orderings outside the whitelist get a 400"""
+        response = self.client.get("/api/tasks/?ordering=description")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ordering", response.data)
+
+    def test_orderings_are_read_from_an_index(self):
+        """Test that no allowed ordering needs a sort step"""
+        for ordering in TaskOrderingFilter.orderings.values():
+            queryset = Task.objects.filter(user=self.user).order_by(*ordering)
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+            self.assertNotIn("TEMP B-TREE", plan, ordering)
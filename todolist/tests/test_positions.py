@@ -0,0 +1,157 @@
+# Standard imports
+import random
+from io import StringIO
+from unittest.mock import patch
+
+# Django imports
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Task, rebalance_positions
+from todolist.positions import INTEGER_ZERO, key_between, keys_from_start
+
+
+class TestPositionKeys(SimpleTestCase):
+    """Test suite for fractional index keys"""
+
+    def test_first_key(self):
+        """Test the key of an empty list"""
+        self.assertEqual(key_between(None, None), INTEGER_ZERO)
+
+    def test_append_and_prepend_stay_short(self):
+        """Test that growing either end only changes the integer part"""
+        last = first = None
+        for _ in range(10000):
+            last = key_between(last, None)
+            first = key_between(None, first)
+        self.assertLessEqual(len(last), 4)
+        self.assertLessEqual(len(first), 4)
+        self.assertLess(first, INTEGER_ZERO)
+        self.assertGreater(last, INTEGER_ZERO)
+
+    def test_random_inserts_keep_order(self):
+        """Test that keys inserted anywhere sort between their neighbours"""
+        rng = random.Random(7)
+        keys = [key_between(None, None)]
+        for _ in range(2000):
+            index = rng.randint(0, len(keys))
+            lower = keys[index - 1] if index else None
+            upper = keys[index] if index < len(keys) else None
+            keys.insert(index, key_between(lower, upper))
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_out_of_order_neighbours(self):
+        """Test that reversed neighbours are rejected"""
+        with self.assertRaises(ValueError):
+            key_between("i2", "i1")
+
+    def test_keys_from_start(self):
+        """Test evenly spaced keys used by rebalancing"""
+        self.assertEqual(keys_from_start(3), ["i0", "i1", "i2"])
+
+
+class TestTaskMove(TestCase):
+    """Test suite for the move action of TaskViewSet"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="mover", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        # Created last, "C" sits first in the manual order: C, B, A
+        self.a = Task.objects.create(title="A", user=self.user)
+        self.b = Task.objects.create(title="B", user=self.user)
+        self.c = Task.objects.create(title="C", user=self.user)
+
+    def ordered_titles(self):
+        response = self.client.get("/api/tasks/?ordering=position")
+        return [task["title"] for task in response.data["results"]]
+
+    def test_new_tasks_go_first(self):
+        """Test that new tasks are placed at the top of the manual order"""
+        self.assertEqual(self.ordered_titles(), ["C", "B", "A"])
+
+    def test_position_pick_holds_the_user_lock(self):
+        """Test that a new task picks its position under the user's lock"""
+        seen = []
+
+        def lock_positions(user_id, connection):
+            seen.append((user_id, connection.in_atomic_block))
+
+        with patch("todolist.models.lock_positions", lock_positions):
+            Task.objects.create(title="D", user=self.user)
+        self.assertEqual(seen, [(self.user.id, True)])
+
+    def test_move_between_neighbours_updates_one_row(self):
+        """Test that a move rewrites only the moved task"""
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                f"/api/tasks/{self.c.id}/move/",
+                {"after": self.b.id, "before": self.a.id},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.ordered_titles(), ["B", "C", "A"])
+
+    def test_move_with_one_neighbour(self):
+        """Test moving to the ends with a single neighbour"""
+        self.client.post(f"/api/tasks/{self.c.id}/move/", {"after": self.a.id})
+        self.assertEqual(self.ordered_titles(), ["B", "A", "C"])
+        self.client.post(f"/api/tasks/{self.a.id}/move/", {"before": self.b.id})
+        self.assertEqual(self.ordered_titles(), ["A", "B", "C"])
+
+    def test_move_requires_neighbour(self):
+        """Test that a move without neighbours is rejected"""
+        response = self.client.post(f"/api/tasks/{self.c.id}/move/", {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_move_rejects_foreign_neighbour(self):
+        """Test that neighbours must belong to the user"""
+        other = User.objects.create_user(username="othermover", password="pass123")
+        foreign = Task.objects.create(title="Foreign", user=other)
+        response = self.client.post(
+            f"/api/tasks/{self.c.id}/move/", {"after": foreign.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_move_rejects_stale_neighbours(self):
+        """Test that neighbours given in the wrong order are rejected"""
+        response = self.client.post(
+            f"/api/tasks/{self.c.id}/move/", {"after": self.a.id, "before": self.b.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TASK_POSITION_REBALANCE_LENGTH=3)
+    def test_long_keys_schedule_rebalance(self):
+        """Test that overly long keys trigger a background rebalance"""
+        with patch("todolist.views.run_in_background") as run_in_background:
+            # Keep inserting into the gap right before "A" so its keys grow
+            mover, other = self.c, self.b
+            for _ in range(10):
+                self.client.post(
+                    f"/api/tasks/{mover.id}/move/",
+                    {"after": other.id, "before": self.a.id},
+                )
+                mover, other = other, mover
+        run_in_background.assert_called_with(rebalance_positions, self.user.id)
+
+    def test_rebalance_keeps_order(self):
+        """Test that rebalancing shortens keys without reordering"""
+        Task.objects.filter(pk=self.b.pk).update(position="i0" + "z" * 40)
+        before = self.ordered_titles()
+        rebalance_positions(self.user.id)
+        self.assertEqual(self.ordered_titles(), before)
+        positions = Task.objects.values_list("position", flat=True)
+        self.assertTrue(all(len(position) == 2 for position in positions))
+
+    def test_rebalance_command(self):
+        """Test that the command only renumbers users with long keys"""
+        Task.objects.filter(pk=self.b.pk).update(position="i0" + "z" * 40)
+        out = StringIO()
+        call_command("rebalance_positions", stdout=out)
+        self.assertIn(f"user {self.user.id}", out.getvalue())
@@ -0,0 +1,85 @@
+# Standard imports
+import tempfile
+from unittest import mock
+
+# Django imports
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Task
+from todolist.profiling import saved_profiles
+
+
+class TestRequestProfiling(TestCase):
+    """Test suite for the on-demand profiling of API requests"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(TODOLIST_PROFILE_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.staff = User.objects.create_user(
+            username="staff", password="pass123", is_staff=True
+        )
+        self.user = User.objects.create_user(username="user", password="pass123")
+        Task.objects.create(user=self.staff, title="Profile me")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.staff)
+
+    def test_staff_request_is_profiled(self):
+        """Test that the header stores a profile named in the response"""
+        response = self.client.get("/api/tasks/", HTTP_X_PROFILE="1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [profile] = saved_profiles()
+        self.assertEqual(response["X-Profile-Id"], profile["id"])
+        self.assertEqual(profile["endpoint"], "GET-TaskViewSet.list")
+
+    def test_other_users_are_not_profiled(self):
+        """Test that the flag is ignored for users who are not staff"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/tasks/", {"profile": "1"})
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(saved_profiles(), [])
+
+    def test_unflagged_requests_run_without_a_profiler(self):
+        """Test that requests not asking for a profile never create one"""
+        with mock.patch("todolist.profiling.cProfile.Profile") as profile:
+            self.client.get("/api/tasks/")
+        profile.assert_not_called()
+
+    @override_settings(TODOLIST_PROFILE_MAX_FILES=2)
+    def test_retention_keeps_the_newest_profiles(self):
+        """Test that the oldest profiles are deleted past the limit"""
+        ids = [
+            self.client.get("/api/tasks/", {"profile": "1"})["X-Profile-Id"]
+            for _ in range(3)
+        ]
+        self.assertEqual({item["id"] for item in saved_profiles()}, set(ids[1:]))
+
+    def test_admin_report_lists_top_functions(self):
+        """Test the staff-only admin page of the slowest functions"""
+        self.client.get("/api/tasks/", {"profile": "1"})
+        self.client.force_login(self.user)
+        response = self.client.get("/admin/profiles/")
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+
+        self.client.force_login(self.staff)
+        response = self.client.get("/admin/profiles/")
+        self.assertContains(response, "GET-TaskViewSet.list")
+        response = self.client.get(
+            "/admin/profiles/", {"endpoint": "GET-TaskViewSet.list"}
+        )
+        self.assertContains(response, "todolist/views.py")
+        response = self.client.get(
+            "/admin/profiles/", {"endpoint": "GET-TaskViewSet.list", "sort": "tottime"}
+        )
+        self.assertContains(response, "Own time")
+        response = self.client.get("/admin/profiles/", {"endpoint": "nope"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
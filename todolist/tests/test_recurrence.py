@@ -0,0 +1,224 @@
+# Standard imports
+from datetime import date
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Task, TaskRecurrence
+from todolist.recurrence import add_months, occurrence_dates
+
+
+class TestOccurrenceDates(TestCase):
+    """Test suite for the occurrence date generator"""
+
+    def test_daily_window(self):
+        """Test daily occurrences inside a window"""
+        rule = TaskRecurrence(frequency="daily", interval=2)
+        dates = list(
+            occurrence_dates(rule, date(2025, 1, 1), date(2025, 1, 4), date(2025, 1, 9))
+        )
+        self.assertEqual(dates, [date(2025, 1, 5), date(2025, 1, 7), date(2025, 1, 9)])
+
+    def test_weekly_excludes_anchor(self):
+        """Test that the anchor date is never generated as an occurrence"""
+        rule = TaskRecurrence(frequency="weekly", interval=1)
+        dates = list(
+            occurrence_dates(
+                rule, date(2025, 1, 1), date(2025, 1, 1), date(2025, 1, 15)
+            )
+        )
+        self.assertEqual(dates, [date(2025, 1, 8), date(2025, 1, 15)])
+
+    def test_monthly_clamps_day(self):
+        """Test that monthly occurrences stay at the end of short months"""
+        rule = TaskRecurrence(frequency="monthly", interval=1)
+        dates = list(
+            occurrence_dates(
+                rule, date(2025, 1, 31), date(2025, 2, 1), date(2025, 4, 30)
+            )
+        )
+        self.assertEqual(
+            dates, [date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)]
+        )
+        self.assertEqual(add_months(date(2024, 1, 31), 1), date(2024, 2, 29))
+
+    def test_ends_on(self):
+        """Test that the series stops at ends_on"""
+        rule = TaskRecurrence(frequency="daily", interval=1, ends_on=date(2025, 1, 3))
+        dates = list(
+            occurrence_dates(
+                rule, date(2025, 1, 1), date(2025, 1, 1), date(2025, 1, 31)
+            )
+        )
+        self.assertEqual(dates, [date(2025, 1, 2), date(2025, 1, 3)])
+
+    def test_distant_window_cost_is_window_sized(self):
+        """Test that a window far from the anchor only yields its own dates"""
+        rule = TaskRecurrence(frequency="daily", interval=1)
+        dates = list(
+            occurrence_dates(
+                rule, date(1900, 1, 1), date(2025, 3, 1), date(2025, 3, 31)
+            )
+        )
+        self.assertEqual(len(dates), 31)
+        self.assertEqual(dates[0], date(2025, 3, 1))
+
+
+class TestRecurringTaskAPI(TestCase):
+    """Test suite for recurring tasks in TaskViewSet"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="recurring", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.template = Task.objects.create(
+            title="Water plants", user=self.user, due_date=date(2025, 3, 1)
+        )
+        TaskRecurrence.objects.create(task=self.template, frequency="weekly")
+        self.url = (
+            "/api/tasks/?due_after=2025-03-01&due_before=2025-03-31&page_size=100"
+        )
+
+    def test_set_recurrence(self):
+        """Test setting and reading a recurrence rule"""
+        task = Task.objects.create(
+            title="Report", user=self.user, due_date=date(2025, 3, 3)
+        )
+        url = f"/api/tasks/{task.id}/recurrence/"
+        response = self.client.put(url, {"frequency": "monthly", "interval": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(url)
+        self.assertEqual(response.data["frequency"], "monthly")
+
+    def test_set_recurrence_requires_due_date(self):
+        """Test that a task without due date cannot recur"""
+        task = Task.objects.create(title="Someday", user=self.user)
+        response = self.client.put(
+            f"/api/tasks/{task.id}/recurrence/", {"frequency": "daily"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_window_includes_virtual_occurrences(self):
+        """Test that occurrences inside the window are listed without rows"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [task["id"] for task in response.data["results"]]
+        self.assertEqual(
+            ids,
+            [
+                self.template.id,
+                f"{self.template.id}:2025-03-08",
+                f"{self.template.id}:2025-03-15",
+                f"{self.template.id}:2025-03-22",
+                f"{self.template.id}:2025-03-29",
+            ],
+        )
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_list_window_honours_ordering(self):
+        """Test that occurrences are merged in the requested ordering"""
+        urgent = Task.objects.create(
+            title="Urgent", user=self.user, due_date=date(2025, 3, 20), priority="high"
+        )
+        later = Task.objects.create(
+            title="Later", user=self.user, due_date=date(2025, 3, 2), priority="low"
+        )
+        response = self.client.get(self.url + "&ordering=-priority")
+        ids = [task["id"] for task in response.data["results"]]
+        self.assertEqual(ids[0], urgent.id)
+        self.assertEqual(ids[1], self.template.id)
+        self.assertEqual(ids[-1], later.id)
+        self.assertEqual(len(ids), 7)
+
+    def test_list_window_pages_read_only_their_rows(self):
+        """Test that paging a window gives the full listing, page by page"""
+        for day in range(2, 31, 2):
+            Task.objects.create(
+                title=f"Day {day}", user=self.user, due_date=date(2025, 3, day)
+            )
+        expected = [task["id"] for task in self.client.get(self.url).data["results"]]
+        paged = []
+        for page in range(1, 8):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(f"{self.url}&page_size=3&page={page}")
+            paged += [task["id"] for task in response.data["results"]]
+            # Only the page's slice of stored tasks is read
+            reads = [
+                query["sql"]
+                for query in ctx.captured_queries
+                if query["sql"].startswith('SELECT "todolist_task"."id"')
+                and "INNER JOIN" not in query["sql"]
+            ]
+            self.assertEqual(len(reads), 1)
+            self.assertIn("LIMIT", reads[0])
+        self.assertEqual(paged, expected)
+        self.assertEqual(len(expected), 20)
+
+    def test_list_without_window_has_no_occurrences(self):
+        """Test that plain listings are unchanged"""
+        response = self.client.get("/api/tasks/")
+        self.assertEqual(response.data["count"], 1)
+
+    def test_list_query_count_independent_of_series_length(self):
+        """Test that a long-running series costs the same as a new one"""
+        self.template.due_date = date(2025, 2, 22)
+        self.template.save()
+        with CaptureQueriesContext(connection) as recent:
+            self.client.get(self.url)
+        self.template.due_date = date(1990, 1, 1)
+        self.template.save()
+        with CaptureQueriesContext(connection) as old:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertEqual(len(recent.captured_queries), len(old.captured_queries))
+
+    def test_toggle_materializes_occurrence(self):
+        """Test that completing an occurrence stores it as a task"""
+        url = f"/api/tasks/{self.template.id}:2025-03-08/toggle-complete/"
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        occurrence = Task.objects.get(occurrence_date=date(2025, 3, 8))
+        self.assertTrue(occurrence.completed)
+        self.assertEqual(occurrence.series, self.template.recurrence)
+
+        # The materialized row replaces the virtual occurrence in listings
+        response = self.client.get(self.url)
+        ids = [task["id"] for task in response.data["results"]]
+        self.assertIn(occurrence.id, ids)
+        self.assertNotIn(f"{self.template.id}:2025-03-08", ids)
+        self.assertEqual(len(ids), 5)
+
+    def test_edit_materializes_occurrence(self):
+        """Test that editing an occurrence stores it as a task"""
+        url = f"/api/tasks/{self.template.id}:2025-03-15/"
+        response = self.client.patch(url, {"title": "Water the cactus"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Task.objects.get(occurrence_date=date(2025, 3, 15)).title,
+            "Water the cactus",
+        )
+
+    def test_retrieve_virtual_occurrence(self):
+        """Test that reading an occurrence does not store it"""
+        response = self.client.get(f"/api/tasks/{self.template.id}:2025-03-22/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["due_date"], "2025-03-22")
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_invalid_occurrence_date(self):
+        """Test that dates outside the series are not found"""
+        response = self.client.get(f"/api/tasks/{self.template.id}:2025-03-09/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_completed_filter_skips_virtual_occurrences(self):
+        """Test that virtual occurrences are always pending"""
+        response = self.client.get(self.url + "&completed=true")
+        self.assertEqual(response.data["count"], 0)
@@ -0,0 +1,113 @@
+# Standard imports
+from datetime import date, timedelta
+from io import StringIO
+
+# Django imports
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+# App imports
+from todolist import notifications
+from todolist.models import Task, TaskReminder
+from todolist.notifications import LocmemNotificationBackend
+from todolist.reminders import reminder_candidates, send_due_reminders
+
+
+class FailingNotificationBackend(LocmemNotificationBackend):
+    """Backend that refuses every batch"""
+
+    def send_messages(self, notifications):
+        raise ConnectionError("Notification sink unavailable")
+
+
+@override_settings(
+    TODOLIST_NOTIFICATION_BACKEND="todolist.notifications.LocmemNotificationBackend"
+)
+class TestTaskReminders(TestCase):
+    """Test suite for the due-date reminder scheduler"""
+
+    def setUp(self):
+        notifications.outbox.clear()
+        self.today = date(2025, 3, 10)
+        self.user = User.objects.create_user(
+            username="reminderuser", password="pass123", email="user@example.com"
+        )
+        self.due_today = Task.objects.create(
+            title="Due today", user=self.user, due_date=self.today
+        )
+        self.due_tomorrow = Task.objects.create(
+            title="Due tomorrow", user=self.user, due_date=self.today + timedelta(days=1)
+        )
+        self.overdue = Task.objects.create(
+            title="Overdue", user=self.user, due_date=self.today - timedelta(days=2)
+        )
+        # Tasks that must never be reminded about
+        Task.objects.create(
+            title="Far future", user=self.user, due_date=self.today + timedelta(days=30)
+        )
+        Task.objects.create(
+            title="Long overdue", user=self.user, due_date=self.today - timedelta(days=60)
+        )
+        Task.objects.create(
+            title="Done", user=self.user, due_date=self.today, completed=True
+        )
+        Task.objects.create(title="Undated", user=self.user)
+
+    def test_candidates_are_bounded_pending_tasks(self):
+        """Test that only pending tasks inside the window are candidates"""
+        candidates = reminder_candidates(self.today)
+        kinds = {task.title: task.reminder_kind for task in candidates}
+        self.assertEqual(
+            kinds,
+            {
+                "Overdue": TaskReminder.OVERDUE,
+                "Due today": TaskReminder.DUE_SOON,
+                "Due tomorrow": TaskReminder.DUE_SOON,
+            },
+        )
+
+    def test_reminders_are_sent_in_batches(self):
+        """Test that every candidate is notified across several batches"""
+        sent = send_due_reminders(today=self.today, batch_size=2)
+        self.assertEqual(sent, 3)
+        self.assertEqual(len(notifications.outbox), 3)
+        self.assertEqual(notifications.outbox[0].task_id, self.overdue.id)
+        self.assertEqual(notifications.outbox[0].recipient, "user@example.com")
+        self.assertEqual(TaskReminder.objects.count(), 3)
+
+    def test_reminders_are_idempotent(self):
+        """Test that a second tick does not notify again"""
+        send_due_reminders(today=self.today)
+        self.assertEqual(send_due_reminders(today=self.today), 0)
+        self.assertEqual(len(notifications.outbox), 3)
+
+    def test_new_due_date_triggers_new_reminder(self):
+        """Test that moving the due date makes the task eligible again"""
+        send_due_reminders(today=self.today)
+        self.due_tomorrow.due_date = self.today
+        self.due_tomorrow.save()
+        self.assertEqual(send_due_reminders(today=self.today), 1)
+
+    def test_overdue_reminder_after_due_soon(self):
+        """Test that a reminded task is reminded again once it is overdue"""
+        send_due_reminders(today=self.today)
+        self.assertEqual(send_due_reminders(today=self.today + timedelta(days=1)), 1)
+        self.assertTrue(
+            TaskReminder.objects.filter(
+                task=self.due_today, kind=TaskReminder.OVERDUE
+            ).exists()
+        )
+
+    def test_failed_delivery_is_retried(self):
+        """Test that reminders are not recorded when delivery fails"""
+        with self.assertRaises(ConnectionError):
+            send_due_reminders(today=self.today, backend=FailingNotificationBackend())
+        self.assertEqual(TaskReminder.objects.count(), 0)
+        self.assertEqual(send_due_reminders(today=self.today), 3)
+
+    def test_send_reminders_command(self):
+        """Test that the management command runs a single tick"""
+        out = StringIO()
+        call_command("send_reminders", "--days-ahead", "400", stdout=out)
+        self.assertIn("reminder(s)", out.getvalue())
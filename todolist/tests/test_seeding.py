@@ -0,0 +1,132 @@
+# Standard imports
+from datetime import date
+from io import StringIO
+
+# Django imports
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Task, TaskCategory, UserShard
+from todolist.seeding import TASK_FIELDS, copy_formatter, seed_data
+from todolist.sharding import ID_BLOCK_SIZE
+
+UNTIL = date(2026, 6, 30)
+
+
+class TestSeedData(TestCase):
+    """Test suite for the synthetic data seeding command"""
+
+    databases = "__all__"
+
+    def seed(self, *args):
+        out = StringIO()
+        call_command("seed_data", *args, "--until=2026-06-30", stdout=out)
+        return out.getvalue()
+
+    def content(self, prefix):
+        """Seeded tasks by user index, without the ids that differ per run"""
+        return sorted(
+            (
+                task.user.username.removeprefix(prefix),
+                task.title,
+                task.description,
+                task.completed,
+                task.created_at,
+                task.completed_at,
+                task.due_date,
+                task.priority,
+                task.category.name if task.category else None,
+                task.position,
+            )
+            for task in Task.objects.filter(
+                user__username__startswith=prefix
+            ).select_related("user", "category")
+        )
+
+    def test_users_categories_and_tasks_are_created(self):
+        """Test the counts, the shared password and the generated values"""
+        output = self.seed("--users=4", "--tasks-per-user=50", "--batch-size=30")
+        self.assertIn("Created 4 user(s)", output)
+        self.assertIn("200 task(s)", output)
+        users = User.objects.filter(username__startswith="seed")
+        self.assertEqual(users.count(), 4)
+        self.assertTrue(all(user.check_password("seed-pass") for user in users))
+        self.assertEqual(len({user.password for user in users}), 1)
+
+        tasks = Task.objects.all()
+        self.assertEqual(tasks.count(), 200)
+        self.assertEqual(
+            set(tasks.values_list("priority", flat=True)), {"low", "medium", "high"}
+        )
+        self.assertTrue(tasks.filter(completed=True, completed_at__isnull=False))
+        self.assertFalse(tasks.filter(completed=False, completed_at__isnull=False))
+        self.assertTrue(tasks.filter(due_date__isnull=True))
+        self.assertTrue(tasks.filter(description=""))
+        self.assertTrue(tasks.exclude(description=""))
+        self.assertFalse(tasks.filter(created_at__date__gt=UNTIL))
+        for task in tasks.exclude(category=None).select_related("category"):
+            self.assertEqual(task.category.user_id, task.user_id)
+        self.assertTrue(
+            all(task.path == str(task.pk).zfill(10) for task in tasks.only("path"))
+        )
+
+    def test_same_seed_gives_same_data(self):
+        """Test that a seed reproduces the data and another seed does not"""
+        self.seed("--users=3", "--tasks-per-user=20", "--seed=7", "--prefix=a")
+        self.seed("--users=3", "--tasks-per-user=20", "--seed=7", "--prefix=b")
+        self.seed("--users=3", "--tasks-per-user=20", "--seed=8", "--prefix=c")
+        self.assertEqual(self.content("a"), self.content("b"))
+        self.assertNotEqual(self.content("a"), self.content("c"))
+
+    def test_seeded_tasks_work_with_the_api(self):
+        """Test the newest-first order and that new tasks get fresh ids"""
+        self.seed("--users=1", "--tasks-per-user=30")
+        user = User.objects.get(username="seed0")
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get("/api/tasks/", {"ordering": "position"})
+        created = [task["created_at"] for task in response.data["results"]]
+        self.assertEqual(created, sorted(created, reverse=True))
+
+        last_seeded = Task.objects.latest("id").id
+        response = client.post("/api/tasks/", {"title": "After seeding"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(response.data["id"], last_seeded)
+        first = Task.objects.filter(user=user).order_by("position").first()
+        self.assertEqual(first.pk, response.data["id"])
+
+    def test_existing_users_are_refused(self):
+        """Test that seeding twice with one prefix stops before writing"""
+        self.seed("--users=2", "--tasks-per-user=1")
+        with self.assertRaisesMessage(CommandError, "pick another prefix"):
+            self.seed("--users=2", "--tasks-per-user=1")
+        self.assertEqual(Task.objects.count(), 2)
+
+    @override_settings(TODOLIST_SHARDS=["shard_1", "shard_2"])
+    def test_users_are_seeded_on_their_shards(self):
+        """Test that each user's data lands on the shard of its directory entry"""
+        seed_data(6, 5, until=UNTIL)
+        for entry in UserShard.objects.all():
+            tasks = Task.objects.using(entry.alias).filter(user_id=entry.user_id)
+            self.assertEqual(tasks.count(), 5)
+            self.assertTrue(
+                TaskCategory.objects.using(entry.alias).filter(user_id=entry.user_id)
+            )
+            self.assertGreater(tasks.earliest("id").id, ID_BLOCK_SIZE)
+
+    def test_copy_format(self):
+        """Test the COPY text encoding used on PostgreSQL"""
+        fields = {name: Task._meta.get_field(name) for name in TASK_FIELDS}
+        self.assertEqual(copy_formatter(fields["completed"])(True), "t")
+        self.assertEqual(copy_formatter(fields["due_date"])(None), "\\N")
+        self.assertEqual(copy_formatter(fields["due_date"])(UNTIL), "2026-06-30")
+        self.assertEqual(copy_formatter(fields["category"])(None), "\\N")
+        self.assertEqual(
+            copy_formatter(fields["description"])("a\tb\\c\nd"), "a\\tb\\\\c\\nd"
+        )
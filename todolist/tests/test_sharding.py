@@ -0,0 +1,178 @@
+# Standard imports
+from io import StringIO
+from unittest import mock
+
+# Django imports
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Tag, Task, TaskActivity, TaskCategory, UserShard
+from todolist import sharding
+from todolist.sharding import ID_BLOCK_SIZE, directory_entry, hashed_shard
+
+SHARDS = ["shard_1", "shard_2"]
+
+
+@override_settings(TODOLIST_SHARDS=SHARDS)
+class TestSharding(TestCase):
+    """Test suite for task data spread over several databases by user"""
+
+    databases = "__all__"
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username="alice", password="pass123")
+        self.bob = User.objects.create_user(username="bob", password="pass123")
+        UserShard.objects.create(user=self.alice, alias="shard_1")
+        UserShard.objects.create(user=self.bob, alias="shard_2")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.alice)
+
+    def create_task(self, client=None, **data):
+        with self.captureOnCommitCallbacks(using="shard_1", execute=True):
+            response = (client or self.client).post(
+                "/api/tasks/", {"title": "Task", **data}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def test_placement_is_stable_and_spread(self):
+        """Test that new users are placed by a stable hash over every shard"""
+        self.assertEqual(hashed_shard(12345), hashed_shard(12345))
+        self.assertEqual(
+            {hashed_shard(user_id) for user_id in range(1, 100)}, set(SHARDS)
+        )
+        carol = User.objects.create_user(username="carol", password="pass123")
+        self.assertEqual(directory_entry(carol.id).alias, hashed_shard(carol.id))
+
+    def test_writes_land_on_the_users_shard(self):
+        """Test that API writes go to the owner's shard with its id block"""
+        task = self.create_task(title="Sharded")
+        self.assertTrue(Task.objects.using("shard_1").filter(pk=task["id"]).exists())
+        self.assertFalse(Task.objects.using("default").exists())
+        self.assertFalse(Task.objects.using("shard_2").exists())
+        self.assertGreaterEqual(task["id"], ID_BLOCK_SIZE)
+        self.assertEqual(
+            TaskActivity.objects.using("shard_1").get(task_id=task["id"]).action,
+            "created",
+        )
+
+    def test_users_only_reach_their_own_data(self):
+        """Test that each user reads from their shard and nowhere else"""
+        mine = self.create_task(title="Alice's")
+        bob = APIClient()
+        bob.force_authenticate(user=self.bob)
+        with self.captureOnCommitCallbacks(using="shard_2", execute=True):
+            bob.post("/api/tasks/", {"title": "Bob's"}, format="json")
+        response = self.client.get("/api/tasks/")
+        titles = [task["title"] for task in response.data["results"]]
+        self.assertEqual(titles, ["Alice's"])
+        response = bob.get(f"/api/tasks/{mine['id']}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_toggle_runs_on_the_shard(self):
+        """Test that the single-statement toggle updates the sharded row"""
+        task = self.create_task()
+        response = self.client.post(f"/api/tasks/{task['id']}/toggle-complete/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(Task.objects.using("shard_1").get(pk=task["id"]).completed)
+
+    def test_move_keeps_ids_and_data(self):
+        """Test that moving a user copies every row as is and clears the source"""
+        category = self.client.post(
+            "/api/categories/", {"name": "Home"}, format="json"
+        ).data
+        parent = self.create_task(category=category["id"], tags=["urgent"])
+        child = self.create_task(title="Child", parent=parent["id"])
+        created_at = Task.objects.using("shard_1").get(pk=parent["id"]).created_at
+
+        out = StringIO()
+        call_command(
+            "move_user_shard", self.alice.id, "shard_2", "--grace-seconds=0", stdout=out
+        )
+        self.assertIn("from shard_1 to shard_2", out.getvalue())
+
+        for model in (Task, TaskCategory, Tag, TaskActivity):
+            self.assertFalse(model.objects.using("shard_1").exists(), model)
+        moved = Task.objects.using("shard_2").get(pk=parent["id"])
+        self.assertEqual(moved.created_at, created_at)
+        self.assertEqual(moved.category_id, category["id"])
+        self.assertEqual(UserShard.objects.get(user=self.alice).alias, "shard_2")
+
+        response = self.client.get(f"/api/tasks/{child['id']}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["parent"], parent["id"])
+        response = self.client.get(f"/api/tasks/{parent['id']}/")
+        self.assertEqual(response.data["tags"], ["urgent"])
+
+    def test_moved_ids_never_collide_with_new_ones(self):
+        """Test that SQLite counters cannot be pushed into another shard's block"""
+        bobs = Task(user=self.bob, title="Bob's")
+        bobs.save()
+        with self.assertRaisesMessage(CommandError, "id block of 'shard_1'"):
+            call_command("move_user_shard", self.bob.id, "shard_1", "--grace-seconds=0")
+        self.assertTrue(Task.objects.using("shard_2").filter(pk=bobs.pk).exists())
+        self.assertEqual(UserShard.objects.get(user=self.bob).alias, "shard_2")
+
+        # Ids from an earlier block stay below the target's own counter
+        self.create_task()
+        call_command(
+            "move_user_shard",
+            self.alice.id,
+            "shard_2",
+            "--grace-seconds=0",
+            stdout=StringIO(),
+        )
+        carol = User.objects.create_user(username="carol", password="pass123")
+        UserShard.objects.create(user=carol, alias="shard_1")
+        tasks = [
+            Task(user=self.alice, title="On shard_2"),
+            Task(user=carol, title="On shard_1"),
+        ]
+        for task in tasks:
+            task.save()
+        self.assertEqual([task._state.db for task in tasks], ["shard_2", "shard_1"])
+        self.assertNotEqual(tasks[0].pk, tasks[1].pk)
+
+    def test_move_is_undone_when_source_rows_change(self):
+        """Test that a write reaching the old shard mid-move is never lost"""
+        task = self.create_task()
+        copy_rows = sharding.copy_rows
+
+        def copy_then_write(queryset, source, target, batch_size):
+            copied = copy_rows(queryset, source, target, batch_size)
+            if queryset.model is Task:
+                # e.g. a background rebalance finishing after the copy
+                Task.objects.using(source).filter(pk=task["id"]).update(position="z")
+            return copied
+
+        with mock.patch("todolist.sharding.copy_rows", copy_then_write):
+            with self.assertRaisesMessage(CommandError, "nothing was moved"):
+                call_command(
+                    "move_user_shard", self.alice.id, "shard_2", "--grace-seconds=0"
+                )
+        self.assertEqual(Task.objects.using("shard_1").get(pk=task["id"]).position, "z")
+        self.assertFalse(Task.objects.using("shard_2").exists())
+        entry = UserShard.objects.get(user=self.alice)
+        self.assertEqual((entry.alias, entry.moving), ("shard_1", False))
+
+    def test_writes_are_refused_while_moving(self):
+        """Test that a user being moved can read but not write"""
+        task = self.create_task()
+        UserShard.objects.filter(user=self.alice).update(moving=True)
+        response = self.client.get(f"/api/tasks/{task['id']}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post("/api/tasks/", {"title": "New"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_deleting_a_user_deletes_their_shard_data(self):
+        """Test that user deletion reaches the rows outside the default database"""
+        self.create_task()
+        self.alice.delete()
+        self.assertFalse(Task.objects.using("shard_1").exists())
+        self.assertFalse(TaskActivity.objects.using("shard_1").exists())
@@ -0,0 +1,117 @@
+# Standard imports
+from datetime import date
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Task, TaskCategory
+
+
+class TestSparseFieldsets(TestCase):
+    """Test suite for ?fields= and ?exclude= on task endpoints"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="sparse", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        category = TaskCategory.objects.create(user=self.user, name="Work")
+        self.task = Task.objects.create(
+            user=self.user,
+            title="Trim me",
+            description="A long description " * 50,
+            category=category,
+        )
+
+    def task_select(self, url):
+        """Fetch ``url`` and return its response and the SQL loading tasks"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        [sql] = [
+            q["sql"]
+            for q in queries.captured_queries
+            if q["sql"].startswith('SELECT "todolist_task"."id"')
+        ]
+        return response, sql
+
+    def test_fields_trims_output(self):
+        """Test that only the requested fields are returned"""
+        response = self.client.get("/api/tasks/?fields=id,title,completed")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"],
+            [{"id": self.task.id, "title": "Trim me", "completed": False}],
+        )
+
+    def test_exclude_drops_fields(self):
+        """Test that excluded fields are left out of list and detail views"""
+        response = self.client.get("/api/tasks/?exclude=description,tags")
+        task = response.data["results"][0]
+        self.assertNotIn("description", task)
+        self.assertNotIn("tags", task)
+        self.assertEqual(task["category"], "Work")
+        response = self.client.get(f"/api/tasks/{self.task.id}/?exclude=description")
+        self.assertNotIn("description", response.data)
+        self.assertIn("created_at", response.data)
+
+    def test_sql_column_list_shrinks(self):
+        """Test that trimmed requests select fewer columns and skip joins"""
+        _, full_sql = self.task_select("/api/tasks/")
+        _, sparse_sql = self.task_select("/api/tasks/?fields=id,title,completed")
+        full_columns = full_sql.split(" FROM ")[0].count(",") + 1
+        sparse_columns = sparse_sql.split(" FROM ")[0].count(",") + 1
+        self.assertEqual(sparse_columns, 3)
+        self.assertLess(sparse_columns, full_columns)
+        self.assertIn('"todolist_task"."description"', full_sql)
+        self.assertNotIn('"todolist_task"."description"', sparse_sql)
+        self.assertIn("todolist_taskcategory", full_sql)
+        self.assertNotIn("JOIN", sparse_sql)
+
+    def test_sparse_list_needs_no_extra_queries(self):
+        """Test that trimmed fields are never lazily loaded afterwards"""
+        for index in range(5):
+            Task.objects.create(user=self.user, title=f"Task {index}")
+        with self.assertNumQueries(2):
+            self.client.get("/api/tasks/?fields=id,title,category,completion_percent")
+
+    def test_sparse_due_window_needs_no_extra_queries(self):
+        """Test that merging occurrences never lazily loads due dates"""
+        for day in range(1, 11):
+            Task.objects.create(
+                user=self.user, title=f"Due {day}", due_date=date(2026, 1, day)
+            )
+        # Occurrence templates, the count and the page
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                "/api/tasks/",
+                {
+                    "due_after": "2026-01-01",
+                    "due_before": "2026-01-31",
+                    "fields": "id,title",
+                },
+            )
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_full_list_needs_no_extra_queries(self):
+        """Test that the default column list covers every serialized field"""
+        for index in range(5):
+            Task.objects.create(user=self.user, title=f"Task {index}")
+        with self.assertNumQueries(3):
+            self.client.get("/api/tasks/")
+
+    def test_writes_ignore_fields(self):
+        """Test that ?fields= never drops input from a write"""
+        response = self.client.post(
+            "/api/tasks/?fields=id", {"title": "Kept", "description": "Also kept"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["title"], "Kept")
+        task = Task.objects.get(id=response.data["id"])
+        self.assertEqual(task.description, "Also kept")
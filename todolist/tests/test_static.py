@@ -0,0 +1,56 @@
+# Standard imports
+import gzip
+import shutil
+import tempfile
+from pathlib import Path
+
+# Django imports
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+# External imports
+import brotli
+
+
+class TestStaticPipeline(SimpleTestCase):
+    """Test suite for fingerprinted, precompressed static files"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        settings = override_settings(
+            STATIC_ROOT=cls.static_root,
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {
+                    "BACKEND": "todolist.storage.CompressedManifestStaticFilesStorage"
+                },
+            },
+        )
+        settings.enable()
+        cls.addClassCleanup(settings.disable)
+        call_command("collectstatic", "--noinput", verbosity=0)
+
+    def test_assets_get_compressed_siblings(self):
+        """Test that fingerprinted assets get identical .gz and .br siblings"""
+        [script] = (self.static_root / "todolist/js/tasks").glob("list.*.js")
+        content = script.read_bytes()
+        gz = Path(f"{script}.gz").read_bytes()
+        br = Path(f"{script}.br").read_bytes()
+        self.assertEqual(gzip.decompress(gz), content)
+        self.assertEqual(brotli.decompress(br), content)
+        self.assertLess(len(gz), len(content))
+
+    def test_unhashed_names_are_not_compressed(self):
+        """Test that only the fingerprinted copies are compressed"""
+        self.assertFalse((self.static_root / "todolist/js/tasks/list.js.gz").exists())
+
+    def test_templates_reference_hashed_names(self):
+        """Test that pages link the fingerprinted assets"""
+        response = self.client.get("/tasks/")
+        [script] = (self.static_root / "todolist/js/tasks").glob("list.*.js")
+        self.assertContains(response, f"/static/todolist/js/tasks/{script.name}")
+        self.assertNotContains(response, "/static/todolist/js/tasks/list.js")
+        self.assertContains(response, "/static/todolist/css/base.")
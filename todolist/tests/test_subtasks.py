@@ -0,0 +1,158 @@
+# Django imports
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Task
+
+
+class TestSubtasks(TestCase):
+    """Test suite for the materialized-path task hierarchy"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="treeuser", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.root = Task.objects.create(title="Root", user=self.user)
+        self.child = Task.objects.create(
+            title="Child", user=self.user, parent=self.root
+        )
+        self.grandchild = Task.objects.create(
+            title="Grandchild", user=self.user, parent=self.child
+        )
+        self.sibling = Task.objects.create(
+            title="Sibling", user=self.user, parent=self.root
+        )
+
+    def refresh(self):
+        for task in (self.root, self.child, self.grandchild, self.sibling):
+            task.refresh_from_db()
+
+    def test_paths_and_counts(self):
+        """Test that paths nest and ancestors count their descendants"""
+        self.refresh()
+        self.assertTrue(self.grandchild.path.startswith(self.child.path))
+        self.assertEqual(self.grandchild.ancestor_ids, [self.root.id, self.child.id])
+        self.assertEqual(self.grandchild.depth, 2)
+        self.assertEqual(self.root.descendant_count, 3)
+        self.assertEqual(self.child.descendant_count, 1)
+
+    def test_create_subtask_via_api(self):
+        """Test creating a subtask through the API"""
+        response = self.client.post(
+            "/api/tasks/", {"title": "Leaf", "parent": self.grandchild.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.refresh()
+        self.assertEqual(self.root.descendant_count, 4)
+        self.assertEqual(self.grandchild.descendant_count, 1)
+
+    def test_parent_must_belong_to_user(self):
+        """Test that tasks cannot be nested under other users' tasks"""
+        other = User.objects.create_user(username="othertree", password="pass123")
+        foreign = Task.objects.create(title="Foreign", user=other)
+        response = self.client.post(
+            "/api/tasks/", {"title": "Leaf", "parent": foreign.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("parent", response.data)
+
+    def test_cannot_move_under_own_subtree(self):
+        """Test that cycles are rejected"""
+        response = self.client.patch(
+            f"/api/tasks/{self.root.id}/", {"parent": self.grandchild.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_subtree_endpoint_single_query(self):
+        """Test that the subtree is returned nested from one subtree query"""
+        # One query resolves the task, one loads its whole subtree and one
+        # prefetches the tags of every node
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/tasks/{self.root.id}/subtree/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], self.root.id)
+        children = response.data["subtasks"]
+        self.assertEqual([c["title"] for c in children], ["Child", "Sibling"])
+        self.assertEqual(children[0]["subtasks"][0]["title"], "Grandchild")
+
+    def test_subtree_with_sparse_fields(self):
+        """Test that the subtree nests even when ?fields= drops id or parent"""
+        url = f"/api/tasks/{self.root.id}/subtree/"
+        response = self.client.get(url, {"fields": "id,title"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"id", "title", "subtasks"})
+        self.assertEqual(
+            response.data["subtasks"][0]["subtasks"][0]["title"], "Grandchild"
+        )
+
+        response = self.client.get(url, {"exclude": "id"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("id", response.data)
+        children = response.data["subtasks"]
+        self.assertEqual([c["title"] for c in children], ["Child", "Sibling"])
+
+    def test_toggle_updates_ancestor_counts(self):
+        """Test that toggling a subtask keeps ancestor completion up to date"""
+        url = f"/api/tasks/{self.grandchild.id}/toggle-complete/"
+        self.client.post(url)
+        self.refresh()
+        self.assertEqual(self.root.completed_descendant_count, 1)
+        self.assertEqual(self.root.completion_percent, 33)
+        self.assertEqual(self.child.completion_percent, 100)
+
+        self.client.post(url)
+        self.refresh()
+        self.assertEqual(self.root.completed_descendant_count, 0)
+        self.assertEqual(self.child.completion_percent, 0)
+
+    def test_delete_subtree_updates_counts(self):
+        """Test that deleting a subtask removes its subtree from the counts"""
+        self.client.post(f"/api/tasks/{self.grandchild.id}/toggle-complete/")
+        self.child.refresh_from_db()
+        response = self.client.delete(f"/api/tasks/{self.child.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.root.refresh_from_db()
+        self.assertEqual(self.root.descendant_count, 1)
+        self.assertEqual(self.root.completed_descendant_count, 0)
+        self.assertFalse(Task.objects.filter(id=self.grandchild.id).exists())
+
+    def test_move_subtree(self):
+        """Test that reparenting rewrites descendant paths and counts"""
+        response = self.client.patch(
+            f"/api/tasks/{self.child.id}/", {"parent": self.sibling.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.refresh()
+        self.assertEqual(
+            self.grandchild.ancestor_ids, [self.root.id, self.sibling.id, self.child.id]
+        )
+        self.assertEqual(self.sibling.descendant_count, 2)
+        self.assertEqual(self.root.descendant_count, 3)
+        subtree = self.sibling.subtree().values_list("id", flat=True)
+        self.assertEqual(
+            set(subtree), {self.sibling.id, self.child.id, self.grandchild.id}
+        )
+
+    def test_save_keeps_concurrent_counter_and_position_updates(self):
+        """Test that saving a stale instance leaves the maintained columns alone"""
+        stale = Task.objects.get(pk=self.root.pk)
+        Task.objects.create(title="Late child", user=self.user, parent=self.root)
+        Task.objects.filter(pk=self.root.pk).update(position="zz")
+        stale.title = "Renamed"
+        stale.save()
+        self.root.refresh_from_db()
+        self.assertEqual(self.root.title, "Renamed")
+        self.assertEqual(self.root.descendant_count, 4)
+        self.assertEqual(self.root.position, "zz")
+
+    def test_filter_roots(self):
+        """Test filtering top-level tasks"""
+        response = self.client.get("/api/tasks/?is_root=true")
+        self.assertEqual(response.data["count"], 1)
+        response = self.client.get(f"/api/tasks/?parent={self.root.id}")
+        self.assertEqual(response.data["count"], 2)
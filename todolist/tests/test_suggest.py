@@ -0,0 +1,146 @@
+# Standard imports
+import os
+import statistics
+import time
+from unittest import skipUnless
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Task, TaskCategory
+from todolist.suggest import matching
+
+
+class TestTaskSuggest(TestCase):
+    """Test suite for the typeahead suggestions"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="typist", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        for title in ["Pay rent", "Paint fence", "Call Paul", "Buy paper"]:
+            Task.objects.create(user=self.user, title=title)
+        TaskCategory.objects.create(user=self.user, name="Paperwork")
+        TaskCategory.objects.create(user=self.user, name="Home")
+        gone = TaskCategory.objects.create(user=self.user, name="Parties")
+        gone.mark_deleted()
+        other = User.objects.create_user(username="other", password="pass123")
+        Task.objects.create(user=other, title="Pay taxes")
+
+    def suggest(self, query):
+        response = self.client.get("/api/tasks/suggest/", {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_matches_title_and_category_prefixes(self):
+        """Test that titles and live categories match case-insensitively"""
+        data = self.suggest("PA")
+        self.assertEqual(
+            [task["title"] for task in data["tasks"]], ["Paint fence", "Pay rent"]
+        )
+        self.assertEqual([c["name"] for c in data["categories"]], ["Paperwork"])
+
+    def test_empty_query(self):
+        """Test that a blank query suggests nothing without touching the database"""
+        with CaptureQueriesContext(connection) as queries:
+            data = self.suggest("  ")
+        self.assertEqual(data, {"tasks": [], "categories": []})
+        self.assertEqual(len(queries), 0)
+
+    def test_limit_is_capped(self):
+        """Test that the limit is clamped and validated"""
+        response = self.client.get("/api/tasks/suggest/", {"q": "p", "limit": 1})
+        self.assertEqual(len(response.data["tasks"]), 1)
+        response = self.client.get("/api/tasks/suggest/", {"q": "p", "limit": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_results_are_cached_until_a_write(self):
+        """Test that repeated keystrokes hit the cache and writes refresh it"""
+        self.suggest("pa")
+        with CaptureQueriesContext(connection) as queries:
+            self.suggest("pa")
+        self.assertEqual(len(queries), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(user=self.user, title="Park car")
+        titles = [task["title"] for task in self.suggest("pa")["tasks"]]
+        self.assertIn("Park car", titles)
+
+    def test_non_ascii_titles_match_any_case(self):
+        """Test that titles are lowercased like the query, accents included"""
+        Task.objects.create(user=self.user, title="Élan vital")
+        Task.objects.create(user=self.user, title="ÖL wechseln")
+        self.assertEqual(
+            [task["title"] for task in self.suggest("ÉL")["tasks"]], ["Élan vital"]
+        )
+        self.assertEqual(
+            [task["title"] for task in self.suggest("öl")["tasks"]], ["ÖL wechseln"]
+        )
+
+    def test_builtin_lower_is_left_alone(self):
+        """Test that only the app's own function folds non-ASCII on SQLite"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT lower('É'), unicode_lower('É')")
+            self.assertEqual(cursor.fetchone(), ("É", "é"))
+
+    def test_prefix_range_reads_the_index(self):
+        """Test that the SQLite fallback is a range scan without a sort"""
+        queryset = matching(Task.objects.filter(user=self.user), "title", "pa")[:8]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn("task_user_title_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+@skipUnless(os.environ.get("TODOLIST_LOAD_TESTS"), "set TODOLIST_LOAD_TESTS=1 to run")
+class TestTaskSuggestLoad(TestCase):
+    """
+    Load test: uncached suggestions over a large task list stay in budget.
+    Timing depends on the machine, so it only runs when asked for.
+    """
+
+    TASKS = 20000
+    REQUESTS = 300
+    BUDGET_MS = 20
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="loaded", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf"]
+        Task.objects.bulk_create(
+            Task(
+                user=self.user,
+                title=f"{words[index % 7]} {words[index // 7 % 7]} {index}",
+                path=f"{index:010d}",
+                position=f"{index:010d}",
+            )
+            for index in range(self.TASKS)
+        )
+        self.queries = [
+            f"{word[:length]}" for word in words for length in range(1, 6)
+        ] + [f"{word} {other[:2]}" for word in words for other in words]
+
+    def test_p95_latency_within_budget(self):
+        """Test the p95 latency of distinct (uncached) typeahead requests"""
+        timings = []
+        for index in range(self.REQUESTS):
+            query = self.queries[index % len(self.queries)]
+            started = time.perf_counter()
+            response = self.client.get(
+                "/api/tasks/suggest/", {"q": query, "limit": 1 + index % 10}
+            )
+            timings.append((time.perf_counter() - started) * 1000)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.data["tasks"])
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        self.assertLess(p95, self.BUDGET_MS, f"p95={p95:.1f}ms")
@@ -0,0 +1,98 @@
+# Django imports
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Tag, Task
+
+
+class TestTaskTags(TestCase):
+    """Test suite for per-user task tags"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="taguser", password="pass123")
+        self.other_user = User.objects.create_user(username="othertag", password="x")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.home = Tag.objects.create(user=self.user, name="home")
+        self.urgent = Tag.objects.create(user=self.user, name="urgent")
+        self.both = Task.objects.create(title="Both", user=self.user)
+        self.both.tags.set([self.home, self.urgent])
+        self.home_only = Task.objects.create(title="Home only", user=self.user)
+        self.home_only.tags.set([self.home])
+        Task.objects.create(title="Untagged", user=self.user)
+
+    def test_create_task_with_tags(self):
+        """Test that unknown tag names are created for the user"""
+        response = self.client.post(
+            "/api/tasks/",
+            {"title": "Tagged", "tags": ["home", "errands"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(sorted(response.data["tags"]), ["errands", "home"])
+        self.assertTrue(Tag.objects.filter(user=self.user, name="errands").exists())
+
+    def test_update_replaces_tags(self):
+        """Test that updating tags replaces the previous set"""
+        response = self.client.patch(
+            f"/api/tasks/{self.both.id}/", {"tags": ["work"]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["tags"], ["work"])
+
+    def test_tag_namespaces_are_per_user(self):
+        """Test that users can own tags with the same name"""
+        Tag.objects.create(user=self.other_user, name="home")
+        other_task = Task.objects.create(title="Other", user=self.other_user)
+        other_task.tags.set(Tag.objects.filter(user=self.other_user))
+        response = self.client.get("/api/tasks/?tag=home")
+        self.assertEqual(response.data["count"], 2)
+
+    def test_filter_any_tag(self):
+        """Test filtering tasks carrying any of the given tags"""
+        response = self.client.get("/api/tasks/?tag=urgent,missing")
+        self.assertEqual([t["title"] for t in response.data["results"]], ["Both"])
+
+    def test_filter_all_tags(self):
+        """Test filtering tasks carrying every given tag"""
+        response = self.client.get("/api/tasks/?tag_all=home,urgent")
+        self.assertEqual([t["title"] for t in response.data["results"]], ["Both"])
+
+    def test_tag_filter_uses_exists(self):
+        """Test that tag filters compile to EXISTS instead of joins"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get("/api/tasks/?tag=home")
+        sql = [q["sql"] for q in ctx.captured_queries if "todolist_tasktag" in q["sql"]]
+        self.assertTrue(any("EXISTS" in query for query in sql))
+
+    def test_list_prefetches_tags_once_per_page(self):
+        """Test that the tag query count does not grow with the page"""
+        for i in range(20):
+            task = Task.objects.create(title=f"Extra {i}", user=self.user)
+            task.tags.set([self.home])
+        counts = []
+        for page_size in (2, 20):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(f"/api/tasks/?page_size={page_size}")
+            self.assertEqual(len(response.data["results"]), page_size)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_tag_crud_is_user_scoped(self):
+        """Test that the tag endpoint only lists and creates own tags"""
+        Tag.objects.create(user=self.other_user, name="private")
+        response = self.client.get("/api/tags/")
+        self.assertEqual(
+            [t["name"] for t in response.data["results"]], ["home", "urgent"]
+        )
+        response = self.client.post("/api/tags/", {"name": "home"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post("/api/tags/", {"name": "private"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
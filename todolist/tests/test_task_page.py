@@ -0,0 +1,73 @@
+# Standard imports
+import json
+
+# Django imports
+from django.contrib.auth.models import User
+from django.template import engines
+from django.test import TestCase
+
+# External imports
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+# App imports
+from todolist.models import Task, TaskCategory
+
+
+class TestTaskListPage(TestCase):
+    """Test suite for the server-rendered first page of the task list"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="reader", password="pass123")
+        category = TaskCategory.objects.create(user=self.user, name="Home")
+        for index in range(12):
+            Task.objects.create(
+                user=self.user, title=f"Task {index}", category=category
+            )
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.user))
+
+    def embedded_tasks(self, response):
+        html = response.content.decode()
+        start = html.index('<script id="initial-tasks" type="application/json">')
+        start = html.index(">", start) + 1
+        end = html.index("</script>", start)
+        return json.loads(html[start:end])
+
+    def test_first_page_matches_api(self):
+        """Test that the embedded tasks are what the API returns for page one"""
+        response = self.client.get("/tasks/")
+        self.assertEqual(response.status_code, 200)
+
+        api = APIClient()
+        api.force_authenticate(user=self.user)
+        expected = json.loads(api.get("/api/tasks/").content)
+        self.assertEqual(self.embedded_tasks(response), expected)
+        self.assertEqual(len(expected["results"]), 10)
+        self.assertIn("/api/tasks/?page=2", expected["next"])
+
+    def test_only_own_tasks_are_embedded(self):
+        """Test that the cookie's user decides which tasks are rendered"""
+        other = User.objects.create_user(username="other", password="pass123")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(other))
+        response = self.client.get("/tasks/")
+        self.assertEqual(self.embedded_tasks(response)["count"], 0)
+
+    def test_page_without_valid_cookie_embeds_null(self):
+        """Test that anonymous visitors get a page the client fills in itself"""
+        self.client.cookies["access_token"] = "expired"
+        response = self.client.get("/tasks/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(self.embedded_tasks(response))
+
+        del self.client.cookies["access_token"]
+        self.assertIsNone(self.embedded_tasks(self.client.get("/tasks/")))
+
+    def test_first_page_query_count(self):
+        """Test that rendering the page costs a fixed number of queries"""
+        with self.assertNumQueries(4):
+            self.client.get("/tasks/")
+
+    def test_templates_use_cached_loader(self):
+        """Test that page templates are compiled once per process"""
+        loader = engines["django"].engine.template_loaders[0]
+        self.assertEqual(type(loader).__module__, "django.template.loaders.cached")
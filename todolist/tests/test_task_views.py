@@ -194,7 +194,7 @@ class TestTaskAPITests(APITestCase):
 
     def test_task_creation_with_category_and_due_date(self):
         """Test task creation with category, priority, and due date"""
-        category = TaskCategory.objects.create(name="Work")
+        category = TaskCategory.objects.create(user=self.user, name="Work")
         data = {
             "title": "New Task",
             "description": "With category and due date",
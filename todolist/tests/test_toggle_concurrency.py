@@ -0,0 +1,165 @@
+# Standard imports
+import threading
+from unittest.mock import patch
+
+# Django imports
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+# External imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# App imports
+from todolist.models import Task, toggle_task
+from todolist.serializers import TaskSerializer
+
+
+class TestAtomicToggle(TestCase):
+    """Test suite for toggling completion with a single UPDATE"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="toggler", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(user=self.user, title="Flip")
+
+    def test_toggle_is_one_statement(self):
+        """Test that the toggle reads nothing before writing the row"""
+        with CaptureQueriesContext(connection) as queries:
+            completed, completed_at, version = toggle_task(self.task.id, self.user.id)
+        statements = [
+            query["sql"]
+            for query in queries.captured_queries
+            if not query["sql"].startswith(("SAVEPOINT", "RELEASE"))
+        ]
+        self.assertEqual(len(statements), 1)
+        self.assertIn("RETURNING", statements[0])
+        self.assertTrue(completed)
+        self.assertIsNotNone(completed_at)
+        self.assertEqual(version, 2)
+
+    def test_fallback_without_returning(self):
+        """Test that databases without UPDATE ... RETURNING get the same result"""
+        with patch("todolist.models.supports_update_returning", return_value=False):
+            first = toggle_task(self.task.id, self.user.id)
+            second = toggle_task(self.task.id, self.user.id)
+        self.assertEqual((first[0], first[2]), (True, 2))
+        self.assertEqual(second, (False, None, 3))
+
+    def test_toggle_response_and_counters(self):
+        """Test the endpoint response and the parent's completed counter"""
+        child = Task.objects.create(user=self.user, title="Child", parent=self.task)
+        response = self.client.post(f"/api/tasks/{child.id}/toggle-complete/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["completed"])
+        self.assertEqual(response.data["version"], 2)
+        child.refresh_from_db()
+        self.task.refresh_from_db()
+        self.assertIsNotNone(child.completed_at)
+        self.assertEqual(self.task.completed_descendant_count, 1)
+
+        self.client.post(f"/api/tasks/{child.id}/toggle-complete/")
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.completed_descendant_count, 0)
+
+    def test_other_users_task_is_not_found(self):
+        """Test that the UPDATE is scoped to the requesting user"""
+        other = User.objects.create_user(username="other", password="pass123")
+        self.client.force_authenticate(user=other)
+        response = self.client.post(f"/api/tasks/{self.task.id}/toggle-complete/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.completed)
+
+
+class TestOptimisticUpdates(TestCase):
+    """Test suite for refusing updates based on a stale version"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="editor", password="pass123")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(user=self.user, title="Draft")
+        self.url = f"/api/tasks/{self.task.id}/"
+
+    def test_current_version_is_accepted(self):
+        """Test that an update of the version read bumps it"""
+        response = self.client.patch(self.url, {"title": "Final", "version": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["version"], 2)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.title, self.task.version), ("Final", 2))
+
+    def test_stale_version_is_refused(self):
+        """Test that a write based on an old version gets 409"""
+        toggle_task(self.task.id, self.user.id)
+        response = self.client.patch(self.url, {"title": "Lost", "version": 1})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Draft")
+        self.assertTrue(self.task.completed)
+
+    def test_write_during_request_is_not_overwritten(self):
+        """Test that a change between reading and saving the task is detected"""
+
+        def concurrent_write(serializer, value):
+            Task.objects.filter(pk=self.task.pk).update(
+                completed=True, version=F("version") + 1
+            )
+            return value
+
+        with patch.object(
+            TaskSerializer, "validate_title", concurrent_write, create=True
+        ):
+            response = self.client.patch(self.url, {"title": "Late"})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.task.refresh_from_db()
+        self.assertTrue(self.task.completed)
+
+
+class TestConcurrentToggles(TransactionTestCase):
+    """Test suite for toggles sent at the same time from several threads"""
+
+    THREADS = 8
+    TOGGLES = 10
+
+    def test_no_toggle_is_lost(self):
+        """Test that every applied toggle is reflected in the final row"""
+        user = User.objects.create_user(username="racer", password="pass123")
+        task = Task.objects.create(user=user, title="Contended")
+        barrier = threading.Barrier(self.THREADS)
+        applied = []
+
+        def toggle_many():
+            # Failed requests come back as 500s: the test client's exception
+            # hook is shared between threads and would blame the wrong one
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(user=user)
+            barrier.wait()
+            try:
+                for _ in range(self.TOGGLES):
+                    response = client.post(f"/api/tasks/{task.id}/toggle-complete/")
+                    # Other statuses are SQLite refusing the write ("table is
+                    # locked"): that transaction rolled back and changed nothing
+                    if response.status_code == status.HTTP_200_OK:
+                        applied.append(response.data["version"])
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=toggle_many) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        task.refresh_from_db()
+        self.assertGreater(len(applied), 0)
+        # Each applied toggle saw a distinct version and none was overwritten
+        self.assertEqual(sorted(applied), list(range(2, 2 + len(applied))))
+        self.assertEqual(task.version, 1 + len(applied))
+        self.assertEqual(task.completed, len(applied) % 2 == 1)
+        self.assertEqual(task.completed_at is not None, task.completed)
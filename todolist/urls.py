@@ -4,15 +4,21 @@ from django.urls import path, include
 # External imports
 from rest_framework.routers import DefaultRouter
 from .views import (
+    BatchView,
+    TagViewSet,
     TaskViewSet,
     TaskCategoryViewSet,
+    task_events,
 )
 
 router = DefaultRouter()
 router.register(r"tasks", TaskViewSet, basename="task")
 router.register(r"categories", TaskCategoryViewSet, basename="category")
+router.register(r"tags", TagViewSet, basename="tag")
 
 urlpatterns = [
     # API Endpoints
+    path("batch/", BatchView.as_view(), name="batch"),
+    path("tasks/events/", task_events, name="task-events"),
     path("", include(router.urls)),
 ]
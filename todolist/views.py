@@ -1,22 +1,79 @@
 # Stantard imports
+import hmac
 import logging
+import time
+from datetime import timedelta
 
 # External imports
+from asgiref.sync import sync_to_async
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.views import APIView
 from rest_framework import viewsets, permissions, status, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.exceptions import APIException, AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
 from rest_framework.filters import SearchFilter
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.throttling import UserRateThrottle
 
 # Django imports
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.forms import NullBooleanField
+from django.http import (
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views.generic import TemplateView
 
 # App imports
-from .models import Task, TaskCategory
-from .serializers import TaskSerializer, TaskCategorySerializer
-from .filters import TaskFilter
+from . import metrics as app_metrics
+from .background import run_in_background
+from .batch import build_subrequest, run_batch
+from .caching import bump_data_version, cached_for_user
+from .events import get_event_broker, stream_events, task_updated
+from .models import (
+    Tag,
+    Task,
+    TaskCategory,
+    TaskRecurrence,
+    PRIORITY_CHOICES,
+    toggle_task,
+    purge_category,
+    rebalance_positions,
+)
+from .positions import key_between
+from .profiling import ProfiledViewMixin
+from .sharding import ShardedViewMixin, current_db
+from .serializers import (
+    BatchSerializer,
+    TagSerializer,
+    TaskSerializer,
+    TaskActivitySerializer,
+    TaskCategorySerializer,
+    TaskRecurrenceSerializer,
+)
+from .filters import TaskFilter, TaskOrderingFilter
+from .idempotency import idempotent
+from .recurrence import (
+    TasksWithOccurrences,
+    is_occurrence,
+    materialize_occurrence,
+    virtual_occurrences,
+)
+from .suggest import suggest
 
 
 # Logger configuration
@@ -29,7 +86,33 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class CategoryCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "name"
+
+
+class ActivityCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-timestamp", "-id")
+
+
+class VersionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The task was changed by another request. Reload and retry."
+    default_code = "version_conflict"
+
+
+class SuggestRateThrottle(UserRateThrottle):
+    """Typeahead sends a request per keystroke, so it gets its own budget"""
+
+    scope = "suggest"
+
+
+class TaskViewSet(ShardedViewMixin, ProfiledViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing user tasks.
     Provides CRUD operations and custom actions.
@@ -39,7 +122,7 @@ class TaskViewSet(viewsets.ModelViewSet):
     pagination_class = StandardResultsSetPagination
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, SearchFilter, TaskOrderingFilter]
     filterset_class = TaskFilter
     search_fields = [
         "title",
@@ -52,17 +135,149 @@ class TaskViewSet(viewsets.ModelViewSet):
         "completed_at",
     ]
 
+    # Filters that describe a template task rather than its occurrences
+    OCCURRENCE_IGNORED_FILTERS = [
+        "due_date",
+        "due_after",
+        "due_before",
+        "completed",
+        "completed_at",
+        "created_at",
+    ]
+
+    # Actions that only serialize tasks, so their columns can be trimmed
+    SPARSE_ACTIONS = ("list", "my_tasks", "retrieve")
+
     def get_queryset(self):
-        """Optimized queryset with select_related"""
-        tasks = Task.objects.filter(user=self.request.user).select_related(
-            "user", "category"
+        """
+        Optimized queryset with select_related and one tag query per page.
+        Reads load only the columns and joins behind the requested fields.
+        """
+        tasks = Task.objects.filter(user=self.request.user)
+        if self.action not in self.SPARSE_ACTIONS:
+            tasks = tasks.select_related("category")
+        else:
+            fields = TaskSerializer.selected_fields(self.request)
+            columns = TaskSerializer.columns_for(fields)
+            if self.get_due_window():
+                # Merging occurrences sorts on them, whatever the fields
+                columns += TaskOrderingFilter.sort_columns(self.get_window_ordering())
+            tasks = tasks.only(*columns)
+            if "category" in fields:
+                tasks = tasks.select_related("category")
+            if "tags" in fields and self.action != "retrieve":
+                tasks = tasks.prefetch_related(self.tags_prefetch())
+        # Logged lazily: evaluating the queryset here would load every task
+        logger.info(f"TASKS_FETCHED: User={self.request.user.id}")
+        return tasks
+
+    @staticmethod
+    def tags_prefetch():
+        """Prefetch loading only what the serializer shows of each tag"""
+        return Prefetch("tags", queryset=Tag.objects.only("id", "name"))
+
+    def get_object(self):
+        """
+        Resolve "<template id>:<date>" lookups to occurrences of a recurring
+        task. Reads return the virtual occurrence; writes materialize it.
+        """
+        lookup = str(self.kwargs.get(self.lookup_url_kwarg or self.lookup_field))
+        if ":" not in lookup:
+            return super().get_object()
+
+        template_id, _, day = lookup.partition(":")
+        day = parse_date(day) if template_id.isdigit() else None
+        if day is None:
+            raise Http404
+        # Occurrences copy their template, so load it whole
+        template = get_object_or_404(
+            self.get_queryset().defer(None).select_related("category", "recurrence"),
+            pk=template_id,
+            recurrence__isnull=False,
         )
-        logger.info(
-            f"TASKS_FETCHED: Count={tasks.count()} | User={self.request.user.id} | "
-            f"Priorities={[task.priority for task in tasks]} | "
-            f"Due Dates={[task.due_date for task in tasks]}"
+        if not is_occurrence(template.recurrence, template.due_date, day):
+            raise Http404
+        self.check_object_permissions(self.request, template)
+
+        if self.action == "retrieve":
+            return virtual_occurrences([template], day, day)[0]
+        if self.action in ("update", "partial_update", "toggle_complete"):
+            return materialize_occurrence(template, day)
+        raise serializers.ValidationError(
+            {"detail": "Not available for occurrences of a recurring task"}
         )
-        return tasks
+
+    def get_due_window(self):
+        """Return the requested (due_after, due_before) window, if complete"""
+        start = parse_date(self.request.query_params.get("due_after") or "")
+        end = parse_date(self.request.query_params.get("due_before") or "")
+        if start and end and start <= end:
+            return start, end
+        return None
+
+    def get_virtual_occurrences(self, start, end):
+        """
+        Generate unsaved occurrences of the user's recurring tasks inside the
+        window, honouring the filters that apply to the template task.
+        """
+        params = self.request.query_params.copy()
+        completed = NullBooleanField().to_python(params.get("completed"))
+        if completed:
+            # Occurrences that are not stored yet are always pending
+            return []
+        for key in self.OCCURRENCE_IGNORED_FILTERS:
+            params.pop(key, None)
+
+        templates = (
+            Task.objects.filter(
+                user=self.request.user,
+                recurrence__isnull=False,
+                due_date__lte=end,
+            )
+            .filter(
+                Q(recurrence__ends_on__isnull=True) | Q(recurrence__ends_on__gte=start)
+            )
+            .select_related("category", "recurrence")
+            .prefetch_related(self.tags_prefetch())
+        )
+        templates = TaskFilter(params, queryset=templates, request=self.request).qs
+        templates = SearchFilter().filter_queryset(self.request, templates, self)
+        return virtual_occurrences(templates, start, end)
+
+    def get_window_ordering(self):
+        """Ordering of a due date window: the requested one, else by due date"""
+        value = TaskOrderingFilter().requested_ordering(self.request) or "due_date"
+        return TaskOrderingFilter.orderings[value]
+
+    def with_occurrences(self, queryset):
+        """
+        Merge the virtual occurrences of the requested due date window into
+        ``queryset``, in the requested ordering. Paginating the result loads
+        only the page's stored tasks. Without a window the queryset is
+        returned untouched.
+        """
+        window = self.get_due_window()
+        if not window:
+            return queryset
+        terms = self.get_window_ordering()
+        return TasksWithOccurrences(
+            queryset.order_by(*terms),
+            self.get_virtual_occurrences(*window),
+            TaskOrderingFilter.sort_key(terms),
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        List tasks, including occurrences of recurring tasks when a
+        due_after/due_before window is requested.
+        """
+        queryset = self.with_occurrences(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
 
     def get_serializer_context(self):
         """
@@ -70,23 +285,34 @@ class TaskViewSet(viewsets.ModelViewSet):
         """
         return {"request": self.request}
 
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Create a task; retries with the same Idempotency-Key create it once"""
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """Deny task creation for unauthenticated users"""
-        # Save task with authenticated user
-        category = None
-        if self.request.data.get("category"):
-            category = TaskCategory.objects.get(id=self.request.data.get("category"))
-        serializer.save(
-            user=self.request.user,
-            category=category,
-            priority=self.request.data.get("priority"),
-            due_date=self.request.data.get("due_date"),
-        )
+        # Save task with authenticated user; category, priority and due date
+        # come from the validated data, so their serializer defaults apply
+        serializer.save(user=self.request.user)
 
     def perform_update(self, serializer):
-        """Update task and log changes"""
-        # Save updated task
-        task = serializer.save()
+        """
+        Update task and log changes. The write only goes through if the
+        task is still at the version the client sent (or, without one, the
+        version read by this request); otherwise it is refused with 409.
+        """
+        task = serializer.instance
+        expected = serializer.validated_data.pop("version", task.version)
+        with transaction.atomic(using=current_db()):
+            claimed = Task.objects.filter(pk=task.pk, version=expected).update(
+                version=F("version") + 1
+            )
+            if not claimed:
+                logger.warning(f"TASK UPDATE CONFLICT: ID={task.id} | V={expected}")
+                raise VersionConflict()
+            # Save updated task
+            task = serializer.save(version=expected + 1)
         logger.info(
             f"TASK UPDATED: ID={task.id} | "
             f"Title='{task.title}' | Completed={task.completed} | "
@@ -102,6 +328,133 @@ class TaskViewSet(viewsets.ModelViewSet):
         # Delete task
         instance.delete()
 
+    @action(detail=False, methods=["get"], url_path="facets")
+    def facets(self, request):
+        """
+        Counts per priority, category, status and due date bucket for the
+        tasks matching the current filters and search. Results are cached
+        under the user's data version, so any write refreshes them.
+        Endpoint: /api/tasks/facets/
+        """
+        today = timezone.localdate()
+        params = {**dict(request.query_params.lists()), "today": today.isoformat()}
+        data = cached_for_user(
+            request.user.id, "task-facets", params, lambda: self.count_facets(today)
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="suggest",
+        throttle_classes=[SuggestRateThrottle],
+    )
+    def suggest(self, request):
+        """
+        Typeahead: task titles and category names matching ``q``, best
+        matches first, at most ``limit`` of each. Results are cached per
+        user for TASK_SUGGEST_CACHE_SECONDS and retired by any write.
+        Endpoint: /api/tasks/suggest/?q=
+        """
+        started = time.perf_counter()
+        query = request.query_params.get("q", "")[:100]
+        max_limit = getattr(settings, "TASK_SUGGEST_MAX_LIMIT", 20)
+        try:
+            limit = int(request.query_params.get("limit", 8))
+        except ValueError:
+            raise serializers.ValidationError({"limit": ["Must be an integer."]})
+        limit = max(1, min(limit, max_limit))
+
+        user_id = request.user.id
+        data = cached_for_user(
+            user_id,
+            "task-suggest",
+            {"q": query.strip().lower(), "limit": limit},
+            lambda: suggest(user_id, query, limit),
+            timeout=getattr(settings, "TASK_SUGGEST_CACHE_SECONDS", 30),
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms > getattr(settings, "TASK_SUGGEST_BUDGET_MS", 20):
+            logger.warning(
+                f"TASK SUGGEST SLOW: User={user_id} | Query='{query}' | "
+                f"Time={elapsed_ms:.1f}ms"
+            )
+        return Response(data, status=status.HTTP_200_OK)
+
+    def count_facets(self, today):
+        """
+        All counts from one query: rows are grouped by category and every
+        other facet is a conditional COUNT, summed over the category rows.
+        The query reads only the task_facets_idx covering index; category
+        names are looked up afterwards instead of joined into every row.
+        Due date buckets: overdue (pending, due before today), due this week
+        (today and the next six days), due later and no due date.
+        """
+        week_end = today + timedelta(days=6)
+        counts = {
+            f"priority_{value}": Q(priority=value) for value, _ in PRIORITY_CHOICES
+        }
+        counts.update(
+            completed=Q(completed=True),
+            overdue=Q(completed=False, due_date__lt=today),
+            due_this_week=Q(due_date__gte=today, due_date__lte=week_end),
+            due_later=Q(due_date__gt=week_end),
+            no_due_date=Q(due_date__isnull=True),
+        )
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .order_by()
+            .values("category_id")
+            .annotate(
+                facet_total=Count("id"),
+                # Prefixed so the aliases never shadow columns such as "completed"
+                **{
+                    f"facet_{name}": Count("id", filter=condition)
+                    for name, condition in counts.items()
+                },
+            )
+        )
+
+        totals = dict.fromkeys(["total", *counts], 0)
+        for row in rows:
+            for name in totals:
+                totals[name] += row[f"facet_{name}"]
+        # Tasks of a category being deleted count as uncategorized
+        names = dict(
+            TaskCategory.objects.filter(
+                pk__in=[row["category_id"] for row in rows], deleted_at__isnull=True
+            ).values_list("id", "name")
+        )
+        categories = {}
+        for row in rows:
+            key = row["category_id"] if row["category_id"] in names else None
+            entry = categories.setdefault(
+                key, {"id": key, "name": names.get(key), "count": 0}
+            )
+            entry["count"] += row["facet_total"]
+
+        logger.info(
+            f"TASK FACETS: User={self.request.user.id} | Total={totals['total']}"
+        )
+        return {
+            "total": totals["total"],
+            "priority": {
+                value: totals[f"priority_{value}"] for value, _ in PRIORITY_CHOICES
+            },
+            "category": sorted(
+                categories.values(),
+                key=lambda entry: (entry["id"] is None, entry["name"] or ""),
+            ),
+            "status": {
+                "completed": totals["completed"],
+                "pending": totals["total"] - totals["completed"],
+            },
+            "due": {
+                name: totals[name]
+                for name in ("overdue", "due_this_week", "due_later", "no_due_date")
+            },
+        }
+
     @action(detail=False, methods=["get"], url_path="my-tasks")
     def my_tasks(self, request):
         """
@@ -109,7 +462,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         Endpoint: /api/tasks/my-tasks/
         """
         # Get authenticated user's tasks
-        queryset = Task.objects.filter(user=request.user)
+        queryset = self.get_queryset()
 
         logger.info(f"MY_TASKS: Count={queryset.count()} | User={request.user.id}")
 
@@ -118,6 +471,9 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         logger.info(f"MY_TASKS_FILTERED: Count={queryset.count()}")
 
+        # Add occurrences of recurring tasks inside the requested window
+        queryset = self.with_occurrences(queryset)
+
         # Serialize and return response
         serializer = self.get_serializer(queryset, many=True)
 
@@ -125,71 +481,273 @@ class TaskViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=True, methods=["post"], url_path="toggle-complete")
+    @idempotent
     def toggle_complete(self, request, pk=None):
         """
         Toggle task completion status.
         Endpoint: /api/tasks/{id}/toggle-complete/
         """
-        # Get task and toggle completion status
-        task = self.get_object()
-        previous_state = task.completed
-        task.completed = not task.completed
-
-        # Update completed_at if task is marked as completed
-        if task.completed:
-            task.completed_at = timezone.now()
+        # Occurrences of recurring tasks are stored before they are toggled
+        lookup = str(pk)
+        if ":" in lookup:
+            task_id = self.get_object().pk
+        elif lookup.isdigit():
+            task_id = int(lookup)
         else:
-            task.completed_at = None
+            raise Http404
 
-        # Save task with updated completion status
-        task.save(update_fields=["completed", "completed_at"])
+        # Flip the completion status in a single UPDATE
+        toggled = toggle_task(task_id, request.user.id)
+        if toggled is None:
+            raise Http404
+        completed, completed_at, version = toggled
 
         logger.info(
-            f"TOGGLE COMPLETE: Task ID={task.id} | "
-            f"From {previous_state} to {task.completed} | "
-            f"Completed At={task.completed_at}"
+            f"TOGGLE COMPLETE: Task ID={task_id} | "
+            f"From {not completed} to {completed} | "
+            f"Completed At={completed_at}"
         )
 
         return Response(
             {
                 "status": "success",
-                "completed": task.completed,
-                "message": f"Task marked as {'completed' if task.completed else 'pending'}",
+                "completed": completed,
+                "completed_at": completed_at
+                and completed_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "version": version,
+                "message": f"Task marked as {'completed' if completed else 'pending'}",
             },
             status=status.HTTP_200_OK,
         )
 
+    @action(detail=True, methods=["post"], url_path="move")
+    def move(self, request, pk=None):
+        """
+        Move a task between two neighbours of the manual order, rewriting only
+        its own position (and version). Either neighbour may be omitted to move
+        the task right after "after" or right before "before".
+        Endpoint: /api/tasks/{id}/move/
+        """
+        task = self.get_object()
+        try:
+            after_id, before_id = (
+                None if request.data.get(key) in (None, "") else int(request.data[key])
+                for key in ("after", "before")
+            )
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({"detail": "Neighbours must be task ids"})
+        if after_id is None and before_id is None:
+            raise serializers.ValidationError(
+                {"detail": "Provide the 'after' and/or 'before' neighbour"}
+            )
+        if task.id in (after_id, before_id):
+            raise serializers.ValidationError(
+                {"detail": "A task cannot be its own neighbour"}
+            )
+
+        # Resolve given neighbours, then the adjacent key of a missing one
+        tasks = Task.objects.filter(user=request.user).exclude(pk=task.pk)
+        given = dict(
+            tasks.filter(pk__in=[after_id, before_id]).values_list("pk", "position")
+        )
+        if any(i is not None and i not in given for i in (after_id, before_id)):
+            raise Http404
+        lower, upper = given.get(after_id), given.get(before_id)
+        ordered = tasks.values_list("position", flat=True)
+        if before_id is None:
+            upper = ordered.filter(position__gt=lower).order_by("position").first()
+        elif after_id is None:
+            lower = ordered.filter(position__lt=upper).order_by("-position").first()
+
+        try:
+            position = key_between(lower, upper)
+        except ValueError:
+            raise serializers.ValidationError(
+                {"detail": "Neighbours are out of order, reload and try again"}
+            )
+        # A move is a write like any other: it needs the version read by this
+        # request, and clients holding that version get a 409 afterwards
+        version = task.version + 1
+        moved = Task.objects.filter(pk=task.pk, version=task.version).update(
+            position=position, version=version
+        )
+        if not moved:
+            logger.warning(f"TASK MOVE CONFLICT: ID={task.id} | V={task.version}")
+            raise VersionConflict()
+        task_updated(task.user_id, task.id, {"position": position, "version": version})
+        bump_data_version(task.user_id)
+        logger.info(f"TASK MOVED: ID={task.id} | Position={position} | V={version}")
+
+        if len(position) > settings.TASK_POSITION_REBALANCE_LENGTH:
+            run_in_background(rebalance_positions, task.user_id)
+        return Response({"id": task.id, "position": position, "version": version})
+
+    @action(detail=True, methods=["get"], url_path="subtree")
+    def subtree(self, request, pk=None):
+        """
+        Return a task with all its subtasks nested, loaded in one query.
+        Endpoint: /api/tasks/{id}/subtree/
+        """
+        task = self.get_object()
+        nodes = list(
+            task.subtree()
+            .select_related("category")
+            .prefetch_related(self.tags_prefetch())
+            .order_by("path")
+        )
+        data = self.get_serializer(nodes, many=True).data
+
+        # Rows are ordered by path, so every parent precedes its children.
+        # The tree is built from the instances: ?fields= may drop id and parent
+        by_id = {}
+        for node, item in zip(nodes, data):
+            item["subtasks"] = []
+            by_id[node.pk] = item
+            if node.pk != task.pk and node.parent_id in by_id:
+                by_id[node.parent_id]["subtasks"].append(item)
+
+        logger.info(f"SUBTREE: Task ID={task.id} | Size={len(nodes)}")
+        return Response(by_id[task.id])
+
+    @action(detail=True, methods=["get"], url_path="history")
+    def history(self, request, pk=None):
+        """
+        The task's recorded changes, newest first, a cursor page at a time
+        (served by the (task, timestamp) index).
+        Endpoint: /api/tasks/{id}/history/
+        """
+        task = self.get_object()
+        paginator = ActivityCursorPagination()
+        page = paginator.paginate_queryset(task.activity.all(), request, view=self)
+        # Actors are users, kept in the default database: no join across shards
+        actors = User.objects.in_bulk({entry.actor_id for entry in page} - {None})
+        for entry in page:
+            entry.actor = actors.get(entry.actor_id)
+        return paginator.get_paginated_response(
+            TaskActivitySerializer(page, many=True).data
+        )
+
+    @action(detail=True, methods=["get", "put", "delete"], url_path="recurrence")
+    def recurrence(self, request, pk=None):
+        """
+        Read, set or remove the recurrence rule of a task.
+        Endpoint: /api/tasks/{id}/recurrence/
+        """
+        task = self.get_object()
+        rule = TaskRecurrence.objects.filter(task=task).first()
+
+        if request.method == "GET":
+            if rule is None:
+                raise Http404
+            return Response(TaskRecurrenceSerializer(rule).data)
+
+        if request.method == "DELETE":
+            if rule is not None:
+                rule.delete()
+                logger.info(f"RECURRENCE REMOVED: Task ID={task.id}")
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        if task.due_date is None:
+            raise serializers.ValidationError(
+                {"due_date": "A recurring task needs a due date to start from"}
+            )
+        serializer = TaskRecurrenceSerializer(rule, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(task=task)
+        logger.info(
+            f"RECURRENCE SET: Task ID={task.id} | "
+            f"Frequency={serializer.data['frequency']} | "
+            f"Interval={serializer.data['interval']}"
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
-class TaskCategoryViewSet(viewsets.ModelViewSet):
+class TagViewSet(ShardedViewMixin, ProfiledViewMixin, viewsets.ModelViewSet):
+    """
+    ViewSet to manage the authenticated user's tags.
+    """
+
+    serializer_class = TagSerializer
+    pagination_class = StandardResultsSetPagination
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        """Return only the authenticated user's tags"""
+        return Tag.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        """Associate the tag with the authenticated user"""
+        serializer.save(user=self.request.user)
+
+
+class TaskCategoryViewSet(ShardedViewMixin, ProfiledViewMixin, viewsets.ModelViewSet):
     """
     ViewSet to manage Task Categories.
     Provides CRUD operations for categories associated with the authenticated user.
     """
 
     serializer_class = TaskCategorySerializer
+    pagination_class = CategoryCursorPagination
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         """
-        Return categories filtered by the authenticated user.
+        Return the authenticated user's categories with their task counts.
+        The count is a correlated subquery, so it is only evaluated for the
+        rows of the requested page. Categories being deleted are hidden from
+        every action but the deletion status.
         """
-        return TaskCategory.objects.all()
+        task_count = (
+            Task.objects.filter(category=OuterRef("pk"))
+            .order_by()
+            .values("category")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        categories = TaskCategory.objects.filter(user=self.request.user)
+        if self.action != "deletion_status":
+            categories = categories.filter(deleted_at__isnull=True)
+        return categories.annotate(
+            task_count=Coalesce(Subquery(task_count, output_field=IntegerField()), 0)
+        )
 
     def perform_create(self, serializer):
         """
         Associate the category with the authenticated user on creation.
         """
-        serializer.save()
+        serializer.save(user=self.request.user)
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Hide the category at once and detach its tasks in the background,
+        so deleting a popular category never locks all of its tasks at once.
+        """
+        category = self.get_object()
+        category.mark_deleted()
+        run_in_background(
+            purge_category,
+            category.id,
+            batch_size=getattr(settings, "CATEGORY_PURGE_BATCH_SIZE", 1000),
+        )
+        return Response(
+            {
+                "message": "Category deletion started",
+                "id": category.id,
+                "status_url": reverse(
+                    "category-deletion-status", args=[category.id], request=request
+                ),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
     @action(detail=False, methods=["get"], url_path="all")
     def get_all_categories(self, request):
         """
-        Endpoint to fetch all categories (without user filtering).
+        Endpoint to fetch the user's categories, one cursor page at a time.
+        Kept for existing clients; it behaves like the list endpoint.
         Endpoint: /api/categories/all/
         """
-        categories = TaskCategory.objects.all()
-        serializer = self.get_serializer(categories, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.list(request)
 
     @action(detail=True, methods=["delete"], url_path="delete")
     def custom_delete(self, request, pk=None):
@@ -197,9 +755,155 @@ class TaskCategoryViewSet(viewsets.ModelViewSet):
         Custom delete action for a specific category.
         Endpoint: /api/categories/{id}/delete/
         """
+        return self.destroy(request, pk=pk)
+
+    @action(detail=True, methods=["get"], url_path="deletion-status")
+    def deletion_status(self, request, pk=None):
+        """
+        Progress of a category deletion: the number of tasks still to be
+        detached. Once they are all detached the category is gone and this
+        endpoint answers 404.
+        Endpoint: /api/categories/{id}/deletion-status/
+        """
         category = self.get_object()
-        category.delete()
         return Response(
-            {"message": "Category deleted successfully"},
-            status=status.HTTP_204_NO_CONTENT,
+            {
+                "id": category.id,
+                "status": "deleting" if category.is_deleted else "active",
+                "remaining_tasks": category.task_count,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class BatchView(APIView):
+    """
+    Run several API calls in one request. Each sub-request goes through the
+    URL resolver and its view with the batch's authenticated user, so JWT
+    decoding and the middleware stack run once per batch. Sub-requests are
+    still throttled and permission-checked by their own views.
+    Endpoint: POST /api/batch/
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    # Batches cannot nest
+    batchable = False
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["requests"]
+        results = run_batch(
+            request,
+            items,
+            parallel=serializer.validated_data["parallel"],
+            max_workers=getattr(settings, "BATCH_MAX_WORKERS", 4),
         )
+        logger.info(
+            f"BATCH: User={request.user.id} | Requests={len(items)} | "
+            f"Statuses={[result['status'] for result in results]}"
+        )
+        return Response({"responses": results}, status=status.HTTP_200_OK)
+
+
+def authenticate_access_token(raw_token):
+    """Resolve a JWT access token to its user, or None when it is not valid"""
+    authentication = JWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def access_cookie_user(request):
+    """User of the HttpOnly access token cookie set at login, or None"""
+    cookie_name = getattr(settings, "ACCESS_TOKEN_COOKIE_NAME", "access_token")
+    raw_token = request.COOKIES.get(cookie_name)
+    return authenticate_access_token(raw_token) if raw_token else None
+
+
+async def task_events(request):
+    """
+    Server-sent events stream of the authenticated user's task changes.
+    EventSource cannot send headers, so the user is identified by the
+    HttpOnly access token cookie set at login (a token in the URL would end
+    up in access logs). Must be served under ASGI.
+    Endpoint: /api/tasks/events/
+    """
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would buffer the endless body instead of streaming it
+        return JsonResponse(
+            {"detail": "The event stream is only served under ASGI"}, status=501
+        )
+    user = await sync_to_async(access_cookie_user)(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Given token not valid for any token type"}, status=401
+        )
+
+    broker = get_event_broker()
+    subscription = broker.subscribe(user.id)
+    logger.info(f"EVENT STREAM OPENED: User={user.id}")
+    response = StreamingHttpResponse(
+        stream_events(
+            broker,
+            subscription,
+            heartbeat=getattr(settings, "TASK_EVENTS_HEARTBEAT_SECONDS", 15),
+            max_duration=getattr(settings, "TASK_EVENTS_MAX_SECONDS", 300),
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Tell nginx not to buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def metrics(request):
+    """
+    Prometheus metrics of every worker. Readable with the scraper's bearer
+    token (TODOLIST_METRICS_TOKEN) or by a staff user's session.
+    Endpoint: /metrics
+    """
+    token = getattr(settings, "TODOLIST_METRICS_TOKEN", "")
+    header = request.headers.get("Authorization", "")
+    allowed = (token and hmac.compare_digest(header, f"Bearer {token}")) or (
+        request.user.is_authenticated and request.user.is_staff
+    )
+    if not allowed:
+        return HttpResponse("Forbidden\n", status=403, content_type="text/plain")
+    return HttpResponse(
+        app_metrics.render(*app_metrics.collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+class TaskListPageView(TemplateView):
+    """
+    Task list page with the first page of tasks embedded as JSON, so the
+    browser renders it without waiting for an API round trip. The user is
+    identified by the HttpOnly access token cookie set at login; without a
+    valid cookie the page falls back to fetching the list itself.
+    """
+
+    template_name = "tasks/list.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["initial_tasks"] = self.first_page()
+        return context
+
+    def first_page(self):
+        """The ``/api/tasks/`` response body for the cookie's user, or None"""
+        user = access_cookie_user(self.request)
+        if user is None:
+            return None
+        # Same view, serializer and pagination as the API, minus the HTTP hop;
+        # the sub-request's path keeps the ``next`` link pointing at the API
+        subrequest = build_subrequest(self.request, "GET", reverse("task-list"))
+        subrequest._force_auth_user = user
+        response = TaskViewSet.as_view({"get": "list"})(subrequest)
+        if response.status_code != status.HTTP_200_OK:
+            return None
+        logger.info(f"TASK LIST PAGE RENDERED: User={user.id}")
+        return response.data